@@ -0,0 +1,63 @@
+"""composite query indexes
+
+Revision ID: 3c5e9a1f7b20
+Revises: 808cfcabd2a4
+Create Date: 2026-10-17 09:12:41.118302
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3c5e9a1f7b20'
+down_revision = '808cfcabd2a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # composite indexes replace the single-column owner/application ones,
+    # which are all left prefixes of the new indexes
+    op.create_index('ix_companies_owner_id_id', 'companies', ['owner_id', 'id'], unique=False)
+    op.drop_index(op.f('ix_companies_owner_id'), table_name='companies')
+
+    op.create_index('ix_applications_owner_id_id', 'applications', ['owner_id', 'id'], unique=False)
+    op.create_index(
+        'ix_applications_owner_id_applied_at', 'applications', ['owner_id', 'applied_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_applications_owner_id_status', 'applications', ['owner_id', 'status', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_applications_owner_id_status_applied_at',
+        'applications',
+        ['owner_id', 'status', 'applied_at', 'id'],
+        unique=False,
+    )
+    op.drop_index(op.f('ix_applications_owner_id'), table_name='applications')
+
+    op.create_index(
+        'ix_followups_application_id_owner_id', 'followups', ['application_id', 'owner_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_followups_owner_id_created_at', 'followups', ['owner_id', 'created_at', 'id'], unique=False
+    )
+    op.drop_index(op.f('ix_followups_application_id'), table_name='followups')
+    op.drop_index(op.f('ix_followups_owner_id'), table_name='followups')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_followups_owner_id'), 'followups', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_followups_application_id'), 'followups', ['application_id'], unique=False)
+    op.drop_index('ix_followups_owner_id_created_at', table_name='followups')
+    op.drop_index('ix_followups_application_id_owner_id', table_name='followups')
+
+    op.create_index(op.f('ix_applications_owner_id'), 'applications', ['owner_id'], unique=False)
+    op.drop_index('ix_applications_owner_id_status_applied_at', table_name='applications')
+    op.drop_index('ix_applications_owner_id_status', table_name='applications')
+    op.drop_index('ix_applications_owner_id_applied_at', table_name='applications')
+    op.drop_index('ix_applications_owner_id_id', table_name='applications')
+
+    op.create_index(op.f('ix_companies_owner_id'), 'companies', ['owner_id'], unique=False)
+    op.drop_index('ix_companies_owner_id_id', table_name='companies')
@@ -0,0 +1,52 @@
+"""dashboard counters
+
+Revision ID: 5a7d2e8c4f13
+Revises: 3c5e9a1f7b20
+Create Date: 2026-10-17 11:02:17.540913
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5a7d2e8c4f13'
+down_revision = '3c5e9a1f7b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('dashboard_counters',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('applied_count', sa.Integer(), nullable=False),
+    sa.Column('interview_count', sa.Integer(), nullable=False),
+    sa.Column('offer_count', sa.Integer(), nullable=False),
+    sa.Column('rejected_count', sa.Integer(), nullable=False),
+    sa.Column('followup_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    # backfill existing users; `python -m app.db.counters repair` does the
+    # same from the application side
+    op.execute(
+        """
+        INSERT INTO dashboard_counters (
+            owner_id, applied_count, interview_count, offer_count, rejected_count,
+            followup_count
+        )
+        SELECT u.id,
+            (SELECT count(*) FROM applications a WHERE a.owner_id = u.id AND a.status = 'applied'),
+            (SELECT count(*) FROM applications a WHERE a.owner_id = u.id AND a.status = 'interview'),
+            (SELECT count(*) FROM applications a WHERE a.owner_id = u.id AND a.status = 'offer'),
+            (SELECT count(*) FROM applications a WHERE a.owner_id = u.id AND a.status = 'rejected'),
+            (SELECT count(*) FROM followups f WHERE f.owner_id = u.id)
+        FROM users u
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_counters')
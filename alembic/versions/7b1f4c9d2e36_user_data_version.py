@@ -0,0 +1,27 @@
+"""user data version
+
+Revision ID: 7b1f4c9d2e36
+Revises: 5a7d2e8c4f13
+Create Date: 2026-10-17 15:40:12.318204
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7b1f4c9d2e36'
+down_revision = '5a7d2e8c4f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('data_version')
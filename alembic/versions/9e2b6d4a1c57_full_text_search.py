@@ -0,0 +1,63 @@
+"""full text search
+
+Revision ID: 9e2b6d4a1c57
+Revises: 7b1f4c9d2e36
+Create Date: 2026-10-17 17:20:41.902615
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9e2b6d4a1c57'
+down_revision = '7b1f4c9d2e36'
+branch_labels = None
+depends_on = None
+
+# table -> searched column; see app/db/fts.py
+SEARCHED = {'applications': 'position', 'companies': 'name', 'followups': 'note'}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, column in SEARCHED.items():
+        if dialect == 'postgresql':
+            op.execute(
+                f"CREATE INDEX ix_{table}_{column}_search ON {table} "
+                f"USING gin (to_tsvector('english', {column}))"
+            )
+        elif dialect == 'sqlite':
+            fts = f'{table}_fts'
+            op.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({column}, owner_id, "
+                f"content='{table}', content_rowid='id', tokenize='porter unicode61')"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {column}, owner_id) VALUES (new.id, new.{column}, new.owner_id); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column}, owner_id) "
+                f"VALUES ('delete', old.id, old.{column}, old.owner_id); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {column}, owner_id ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column}, owner_id) "
+                f"VALUES ('delete', old.id, old.{column}, old.owner_id); "
+                f"INSERT INTO {fts}(rowid, {column}, owner_id) VALUES (new.id, new.{column}, new.owner_id); END"
+            )
+            # index the existing rows
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, column in SEARCHED.items():
+        if dialect == 'postgresql':
+            op.execute(f"DROP INDEX ix_{table}_{column}_search")
+        elif dialect == 'sqlite':
+            for trigger in ('insert', 'delete', 'update'):
+                op.execute(f"DROP TRIGGER {table}_fts_{trigger}")
+            op.execute(f"DROP TABLE {table}_fts")
@@ -0,0 +1,74 @@
+"""cascade deletes
+
+Revision ID: b4d8a2f6e913
+Revises: 9e2b6d4a1c57
+Create Date: 2026-10-17 18:05:27.540381
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b4d8a2f6e913'
+down_revision = '9e2b6d4a1c57'
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table)
+FOREIGN_KEYS = [
+    ('applications', 'company_id', 'companies'),
+    ('followups', 'application_id', 'applications'),
+]
+# SQLite's constraints from the initial migration are unnamed; batch mode
+# names the reflected ones with this convention so they can be dropped
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+# searched column of each table; see 9e2b6d4a1c57
+SEARCHED = {'applications': 'position', 'followups': 'note'}
+
+
+def _fts_triggers(table: str) -> None:
+    # rebuilding a SQLite table drops its triggers; put the FTS ones back
+    column = SEARCHED[table]
+    fts = f'{table}_fts'
+    op.execute(
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}, owner_id) VALUES (new.id, new.{column}, new.owner_id); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}, owner_id) "
+        f"VALUES ('delete', old.id, old.{column}, old.owner_id); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {column}, owner_id ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}, owner_id) "
+        f"VALUES ('delete', old.id, old.{column}, old.owner_id); "
+        f"INSERT INTO {fts}(rowid, {column}, owner_id) VALUES (new.id, new.{column}, new.owner_id); END"
+    )
+
+
+def _replace_foreign_keys(ondelete: str | None) -> None:
+    # PostgreSQL's default names match the naming convention above
+    if op.get_bind().dialect.name == 'sqlite':
+        for table, column, referenced in FOREIGN_KEYS:
+            with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+                batch_op.drop_constraint(f'{table}_{column}_fkey', type_='foreignkey')
+                batch_op.create_foreign_key(
+                    f'{table}_{column}_fkey', referenced, [column], ['id'], ondelete=ondelete
+                )
+            _fts_triggers(table)
+        return
+    for table, column, referenced in FOREIGN_KEYS:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+        op.create_foreign_key(
+            f'{table}_{column}_fkey', table, referenced, [column], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(None)
@@ -0,0 +1,51 @@
+"""followup reminders
+
+Revision ID: d7e3c1a9f245
+Revises: b4d8a2f6e913
+Create Date: 2026-10-17 19:02:44.907126
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd7e3c1a9f245'
+down_revision = 'b4d8a2f6e913'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('due_at', 'reminded_at', 'claimed_until')
+PENDING_REMINDER = 'due_at IS NOT NULL AND reminded_at IS NULL'
+
+
+def upgrade() -> None:
+    # plain ADD COLUMN: no table rebuild, so the FTS triggers stay in place
+    for name in COLUMNS:
+        op.add_column('followups', sa.Column(name, sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_followups_owner_id_due_at',
+        'followups',
+        ['owner_id', 'due_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('due_at IS NOT NULL'),
+        sqlite_where=sa.text('due_at IS NOT NULL'),
+    )
+    op.create_index(
+        'ix_followups_pending_due_at',
+        'followups',
+        ['due_at'],
+        unique=False,
+        postgresql_where=sa.text(PENDING_REMINDER),
+        sqlite_where=sa.text(PENDING_REMINDER),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_followups_pending_due_at', table_name='followups')
+    op.drop_index('ix_followups_owner_id_due_at', table_name='followups')
+    # SQLite 3.35+ drops unindexed columns in place, keeping the triggers
+    for name in reversed(COLUMNS):
+        op.drop_column('followups', name)
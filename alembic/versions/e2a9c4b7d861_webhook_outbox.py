@@ -0,0 +1,67 @@
+"""webhook outbox
+
+Revision ID: e2a9c4b7d861
+Revises: d7e3c1a9f245
+Create Date: 2026-10-17 20:11:05.318442
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e2a9c4b7d861'
+down_revision = 'd7e3c1a9f245'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'webhook_endpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=2048), nullable=False),
+        sa.Column('secret', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('failures', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('retry_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_webhook_endpoints_owner_id', 'webhook_endpoints', ['owner_id', 'id'], unique=False)
+    op.create_table(
+        'webhook_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('claimed_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('dead_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('endpoint_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['endpoint_id'], ['webhook_endpoints.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        # ids of delivered (deleted) events are never reused
+        sqlite_autoincrement=True,
+    )
+    op.create_index('ix_webhook_outbox_endpoint_id', 'webhook_outbox', ['endpoint_id', 'id'], unique=False)
+    op.create_index(
+        'ix_webhook_outbox_pending',
+        'webhook_outbox',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('dead_at IS NULL'),
+        sqlite_where=sa.text('dead_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhook_outbox_pending', table_name='webhook_outbox')
+    op.drop_index('ix_webhook_outbox_endpoint_id', table_name='webhook_outbox')
+    op.drop_table('webhook_outbox')
+    op.drop_index('ix_webhook_endpoints_owner_id', table_name='webhook_endpoints')
+    op.drop_table('webhook_endpoints')
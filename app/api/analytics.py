@@ -0,0 +1,225 @@
+"""Time series behind ``GET /applications/analytics``.
+
+Both series are aggregated in the database, one row per bucket:
+
+* the funnel groups the user's applications by the bucket of ``applied_at``
+  over a range read from the ``(owner_id, applied_at)`` index, and a window
+  over the grouped rows adds the conversion rates since ``start``;
+* follow-up activity groups by the bucket of ``created_at`` over the
+  ``(owner_id, created_at)`` index.
+
+Buckets are ``date_trunc`` on PostgreSQL and SQLite date modifiers
+otherwise; both start weeks on Monday. Empty buckets are filled in here.
+
+Results are cached per user by :data:`analytics_cache` under the user's data
+version (``app/db/data_version.py``). Every write bumps the version, so the
+next request misses and drops the user's older entries, in every worker.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from prometheus_client import Counter
+from pydantic import TypeAdapter
+from sqlalchemy import Date, Float, cast, func, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.models.application import Application
+from app.models.followup import FollowUp
+from app.schemas.analytics import AnalyticsBucket, ApplicationAnalytics, Bucket
+
+CACHE_HITS = Counter("analytics_cache_hits_total", "Analytics cache hits")
+CACHE_MISSES = Counter("analytics_cache_misses_total", "Analytics cache misses")
+
+# statuses counted as having reached the interview stage
+INTERVIEWED = ("interview", "offer")
+# distinct queries kept per user; the oldest is dropped first
+MAX_ENTRIES_PER_USER = 16
+
+_encoder = TypeAdapter(ApplicationAnalytics)
+
+
+def period_start(day: date, bucket: Bucket) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_period(period: date, bucket: Bucket) -> date:
+    """Start of the bucket after the one starting on ``period``; may raise ``OverflowError``."""
+    if bucket == "month":
+        return (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return period + timedelta(days=7 if bucket == "week" else 1)
+
+
+def bucket_count(start: date, end: date, bucket: Bucket) -> int:
+    """Number of buckets overlapping ``start``..``end``, without listing them."""
+    if bucket == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    if bucket == "week":
+        return (period_start(end, bucket) - period_start(start, bucket)).days // 7 + 1
+    return (end - start).days + 1
+
+
+def periods(start: date, end: date, bucket: Bucket) -> list[date]:
+    """Start of every bucket overlapping ``start``..``end``, oldest first."""
+    current = period_start(start, bucket)
+    result = [current]
+    # never steps past the last bucket, which may be the last representable one
+    for _ in range(bucket_count(start, end, bucket) - 1):
+        current = next_period(current, bucket)
+        result.append(current)
+    return result
+
+
+def bucket_start(dialect: str, column, bucket: Bucket) -> ColumnElement:
+    """First day of ``column``'s bucket, as a ``DATE``."""
+    if dialect == "postgresql":
+        return cast(func.date_trunc(bucket, column), Date)
+    modifiers = {"day": (), "week": ("weekday 0", "-6 days"), "month": ("start of month",)}[bucket]
+    return type_coerce(func.date(column, *modifiers), Date)
+
+
+def _rate(part, whole) -> ColumnElement:
+    # double precision so the rate survives the round trip through a cursor
+    return cast(part, Float(53)) / func.nullif(whole, 0)
+
+
+def funnel_query(dialect: str, owner_id: int, start: date, end: date, bucket: Bucket):
+    rows = (
+        select(bucket_start(dialect, Application.applied_at, bucket).label("period"), Application.status)
+        .where(
+            Application.owner_id == owner_id,
+            Application.applied_at >= start,
+            Application.applied_at <= end,
+        )
+        .subquery("applied")
+    )
+    counts = (
+        select(
+            rows.c.period,
+            func.count().label("applied"),
+            func.count().filter(rows.c.status.in_(INTERVIEWED)).label("interviews"),
+            func.count().filter(rows.c.status == "offer").label("offers"),
+        )
+        .group_by(rows.c.period)
+        .subquery("counts")
+    )
+
+    def to_date(column):
+        return func.sum(column).over(order_by=counts.c.period)
+
+    return select(
+        counts.c.period,
+        counts.c.applied,
+        counts.c.interviews,
+        counts.c.offers,
+        _rate(counts.c.interviews, counts.c.applied).label("interview_rate"),
+        _rate(counts.c.offers, counts.c.applied).label("offer_rate"),
+        _rate(to_date(counts.c.interviews), to_date(counts.c.applied)).label("interview_rate_to_date"),
+        _rate(to_date(counts.c.offers), to_date(counts.c.applied)).label("offer_rate_to_date"),
+    ).order_by(counts.c.period)
+
+
+def activity_query(dialect: str, owner_id: int, start: date, end: date, bucket: Bucket):
+    rows = (
+        select(bucket_start(dialect, FollowUp.created_at, bucket).label("period"))
+        .where(
+            FollowUp.owner_id == owner_id,
+            FollowUp.created_at >= datetime.combine(start, time.min),
+            FollowUp.created_at < datetime.combine(end + timedelta(days=1), time.min),
+        )
+        .subquery("created")
+    )
+    return select(rows.c.period, func.count().label("followups")).group_by(rows.c.period)
+
+
+async def build(db: AsyncSession, owner_id: int, start: date, end: date, bucket: Bucket) -> bytes:
+    """The encoded :class:`ApplicationAnalytics` of ``owner_id``."""
+    dialect = db.get_bind().dialect.name
+    funnel = {row.period: row for row in await db.execute(funnel_query(dialect, owner_id, start, end, bucket))}
+    activity = dict((await db.execute(activity_query(dialect, owner_id, start, end, bucket))).all())
+
+    buckets = []
+    # carried over empty buckets, which have no row of their own
+    interview_rate_to_date = offer_rate_to_date = None
+    for period in periods(start, end, bucket):
+        row = funnel.get(period)
+        if row is not None:
+            interview_rate_to_date = row.interview_rate_to_date
+            offer_rate_to_date = row.offer_rate_to_date
+        buckets.append(
+            AnalyticsBucket(
+                start=period,
+                applied=row.applied if row else 0,
+                interviews=row.interviews if row else 0,
+                offers=row.offers if row else 0,
+                interview_rate=row.interview_rate if row else None,
+                offer_rate=row.offer_rate if row else None,
+                interview_rate_to_date=interview_rate_to_date,
+                offer_rate_to_date=offer_rate_to_date,
+                followups=activity.get(period, 0),
+            )
+        )
+    return _encoder.dump_json(ApplicationAnalytics(bucket=bucket, start=start, end=end, buckets=buckets))
+
+
+class AnalyticsCache:
+    """Encoded results per user, valid for one data version of that user.
+
+    Holds at most ``max_users`` users (least recently used dropped first) and
+    :data:`MAX_ENTRIES_PER_USER` queries each.
+    """
+
+    def __init__(self, max_users: int) -> None:
+        self.max_users = max_users
+        # owner_id -> (version, {query key: body})
+        self._users: OrderedDict[int, tuple[str, OrderedDict[Any, bytes]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner_id: int, version: str, key: Any) -> bytes | None:
+        with self._lock:
+            entry = self._users.get(owner_id)
+            body = None
+            if entry is not None and entry[0] == version:
+                body = entry[1].get(key)
+                self._users.move_to_end(owner_id)
+                if body is not None:
+                    entry[1].move_to_end(key)
+        (CACHE_MISSES if body is None else CACHE_HITS).inc()
+        return body
+
+    def put(self, owner_id: int, version: str, key: Any, body: bytes) -> None:
+        if self.max_users <= 0:
+            return
+        with self._lock:
+            entry = self._users.get(owner_id)
+            if entry is None or entry[0] != version:
+                # written since; whatever was cached for the user is stale
+                entry = (version, OrderedDict())
+                self._users[owner_id] = entry
+            self._users.move_to_end(owner_id)
+            entries = entry[1]
+            entries[key] = body
+            entries.move_to_end(key)
+            while len(entries) > MAX_ENTRIES_PER_USER:
+                entries.popitem(last=False)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+analytics_cache = AnalyticsCache(settings.ANALYTICS_CACHE_MAX_USERS)
@@ -0,0 +1,67 @@
+"""Strong ETags and ``If-None-Match`` handling for per-user collections.
+
+Clients poll the list and dashboard endpoints every few seconds and almost
+always get the same answer back. :func:`user_etag` derives the ETag from the
+user's data version (``app/db/data_version.py``) before the handler runs its
+query; when the client already holds that ETag it answers ``304 Not
+Modified`` straight away.
+
+The version is read before the data, so a write that lands in between can
+only make the body newer than its ETag, which costs the client one extra
+full response later but never hides a change. Both come from the same
+session (the replica's, when one serves the request), so a lagging replica
+never pairs old rows with a newer ETag.
+"""
+from __future__ import annotations
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_current_user, get_read_db
+from app.core.principal_cache import Principal
+from app.db import data_version
+
+# per-user data: never from a shared cache, always revalidated
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 prescribes for ``If-None-Match``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def check_not_modified(request: Request, etag: str) -> None:
+    """End the request with 304 when the client already holds ``etag``."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        # the default handler sends 304 without a body
+        raise HTTPException(status_code=304, headers=etag_headers(etag))
+
+
+async def user_data_version(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+) -> int:
+    return await data_version.current(db, user.id)
+
+
+async def user_etag(
+    request: Request,
+    user: Principal = Depends(get_current_user),
+    version: int = Depends(user_data_version),
+) -> str:
+    """ETag of the current user's data; a matching ``If-None-Match`` ends the request with 304."""
+    etag = make_etag(user.id, version)
+    check_not_modified(request, etag)
+    return etag
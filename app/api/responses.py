@@ -0,0 +1,97 @@
+"""JSON responses that skip per-object validation.
+
+With a ``response_model`` FastAPI validates every returned ORM object into
+the output schema before encoding it. For list endpoints that is most of the
+CPU time of a 100-row page, on top of building the ORM objects themselves.
+:class:`RowSerializer` instead selects just the schema's columns as Core rows
+and encodes them with one precompiled ``TypeAdapter`` over a ``TypedDict``
+derived from the schema, so the JSON is produced in a single pass by
+pydantic-core. Handlers return the bytes in a :class:`JSONBytesResponse`;
+their ``response_model`` is then only used for the OpenAPI schema.
+
+Nested schemas become nested ``TypedDict``s, and fields with a default are
+``NotRequired``, so related data assembled as plain dicts (see ``include``
+on ``GET /applications/``) is encoded the same way and only the keys that
+are present are written.
+"""
+from __future__ import annotations
+
+import functools
+import types
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Literal, NotRequired, Union, get_args, get_origin
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import InstrumentedAttribute
+from typing_extensions import TypedDict  # pydantic needs this one before Python 3.12
+
+try:  # optional: pip install ".[fast]"
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class JSONBytesResponse(JSONResponse):
+    """``JSONResponse`` that sends already encoded ``bytes`` as they are.
+
+    This is the app's default response class, so anything else (plain dicts,
+    ``response_model`` output) is still encoded here, with orjson if it is
+    installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content)
+        return super().render(content)
+
+
+def _row_annotation(annotation: Any) -> Any:
+    """``annotation`` with every pydantic model replaced by its row type."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _row_type(annotation)
+    origin = get_origin(annotation)
+    if origin is None or origin is Literal:
+        return annotation
+    args = tuple(_row_annotation(arg) for arg in get_args(annotation))
+    if origin is Union or origin is types.UnionType:
+        return Union[args]  # noqa: UP007 - built from a tuple
+    return origin[args]
+
+
+@functools.cache
+def _row_type(model: type[BaseModel]) -> type:
+    annotations = {}
+    for name, field in model.model_fields.items():
+        annotation = _row_annotation(field.annotation)
+        annotations[name] = annotation if field.is_required() else NotRequired[annotation]
+    return TypedDict(f"{model.__name__}Row", annotations)
+
+
+class RowSerializer:
+    """Encode Core rows with the fields of ``model`` straight to JSON bytes.
+
+    Select :meth:`columns` of the mapped class so each row has the schema's
+    fields in order; :meth:`dump_json` then encodes a list of them exactly
+    as ``list[model]`` would be. :meth:`dump_dicts` takes dicts instead, for
+    rows that carry nested data.
+    """
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self.fields = tuple(model.model_fields)
+        self._adapter = TypeAdapter(list[_row_type(model)])
+
+    def columns(self, entity: type) -> list[InstrumentedAttribute]:
+        return [getattr(entity, name) for name in self.fields]
+
+    def dump_json(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        fields = self.fields
+        return self._adapter.dump_json([dict(zip(fields, row, strict=True)) for row in rows])
+
+    def dump_dicts(self, items: Sequence[Mapping[str, Any]]) -> bytes:
+        return self._adapter.dump_json(items)
+
+    def response(self, rows: Iterable[Sequence[Any]], headers: dict[str, str] | None = None) -> JSONBytesResponse:
+        return JSONBytesResponse(self.dump_json(rows), headers=headers)
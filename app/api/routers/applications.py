@@ -1,79 +1,258 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import get_args
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db
+from app.api import analytics
+from app.api.analytics import analytics_cache
+from app.api.etag import check_not_modified, etag_headers, make_etag, user_data_version, user_etag
+from app.api.export import ExportFormat, stream_export
+from app.api.pagination import decode_cursor, encode_cursor, keyset_after, keyset_order
+from app.api.responses import JSONBytesResponse, RowSerializer
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.principal_cache import Principal
+from app.db import counters, data_version, outbox
+from app.db.bulk import insert_returning
+from app.models.dashboard_counters import DashboardCounters
 from app.models.application import Application
 from app.models.followup import FollowUp
 from sqlalchemy import func
 from app.models.company import Company
-from app.models.user import User
-from app.schemas.application import ApplicationCreate, ApplicationOut, Status
+from app.schemas.analytics import ApplicationAnalytics, Bucket
+from app.schemas.application import ApplicationCreate, ApplicationDetailOut, ApplicationOut, Include, Status
+from app.schemas.company import CompanyOut
+from app.schemas.followup import FollowUpOut
+from app.schemas.bulk import BULK_MAX_ITEMS, BulkItemError, BulkResult
 
 router = APIRouter()
 
+application_rows = RowSerializer(ApplicationOut)
+application_detail_rows = RowSerializer(ApplicationDetailOut)
+# only used for their column lists
+_company_fields = RowSerializer(CompanyOut)
+_followup_fields = RowSerializer(FollowUpOut)
+
 from app.schemas.dashboard import DashboardSummary
 
+# default range of GET /analytics, and how many buckets one request may span
+ANALYTICS_DEFAULT_DAYS = 365
+ANALYTICS_MAX_BUCKETS = 1000
+
+
+def parse_include(include: str | None) -> set[str]:
+    names = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = names - set(get_args(Include))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"unknown include: {', '.join(sorted(unknown))}")
+    return names
+
+
+async def with_includes(db: AsyncSession, owner_id: int, rows, include: set[str]) -> list[dict]:
+    """Page ``rows`` as dicts with the ``include``d relations attached.
+
+    Each relation is one ``IN`` query over the whole page (what
+    ``selectinload`` would issue), so the statement count depends on
+    ``include`` but not on the page size.
+    """
+    items = [dict(zip(application_rows.fields, row, strict=True)) for row in rows]
+    if not items:
+        return items
 
-@router.get("/", response_model=list[ApplicationOut])
-def list_applications(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    if "company" in include:
+        company_ids = {item["company_id"] for item in items}
+        companies = await db.execute(
+            select(*_company_fields.columns(Company)).where(Company.id.in_(company_ids))
+        )
+        by_id = {row.id: row._asdict() for row in companies}
+        for item in items:
+            item["company"] = by_id.get(item["company_id"])
+
+    if include & {"followups", "latest_followup"}:
+        app_ids = [item["id"] for item in items]
+        columns = _followup_fields.columns(FollowUp)
+        newest_first = (FollowUp.created_at.desc(), FollowUp.id.desc())
+        scope = (FollowUp.application_id.in_(app_ids), FollowUp.owner_id == owner_id)
+        if "followups" in include:
+            query = select(*columns).where(*scope).order_by(FollowUp.application_id, *newest_first)
+        else:
+            # only each application's newest follow-up
+            ranked = (
+                select(
+                    *columns,
+                    func.row_number()
+                    .over(partition_by=FollowUp.application_id, order_by=newest_first)
+                    .label("n"),
+                )
+                .where(*scope)
+                .subquery()
+            )
+            query = select(*_followup_fields.columns(ranked.c)).where(ranked.c.n == 1)
+        followups: dict[int, list[dict]] = {}
+        for row in await db.execute(query):
+            followups.setdefault(row.application_id, []).append(row._asdict())
+        for item in items:
+            notes = followups.get(item["id"], [])
+            if "followups" in include:
+                item["followups"] = notes
+            if "latest_followup" in include:
+                item["latest_followup"] = notes[0] if notes else None
+    return items
+
+
+@router.get("/", response_model=list[ApplicationDetailOut])
+async def list_applications(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
     status: Status | None = None,
     company_id: int | None = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = None,
     order_by: str = Query("applied_at", pattern="^(applied_at|status|id)$"),
     desc: bool = False,
+    include: str | None = Query(None, description="comma-separated: company, followups, latest_followup"),
+    etag: str = Depends(user_etag),
 ):
-    query = db.query(Application).filter(Application.owner_id == user.id)
+    # ``cursor`` is the keyset alternative to ``offset``: it comes from the
+    # ``X-Next-Cursor`` header of the previous page. ``offset`` is kept for
+    # existing clients but the two cannot be combined.
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="cursor and offset are mutually exclusive")
+    includes = parse_include(include)
+
+    query = select(*application_rows.columns(Application)).where(Application.owner_id == user.id)
     if status:
-        query = query.filter(Application.status == status)
+        query = query.where(Application.status == status)
     if company_id:
-        query = query.filter(Application.company_id == company_id)
+        query = query.where(Application.company_id == company_id)
 
     col = getattr(Application, order_by)
-    if desc:
-        col = col.desc()
-    query = query.order_by(col)
+    if cursor:
+        value, last_id = decode_cursor(cursor, order_by, desc)
+        query = query.where(keyset_after(col, Application.id, value, last_id, desc))
+    query = query.order_by(*keyset_order(col, Application.id, desc))
 
-    return query.offset(offset).limit(limit).all()
+    # plain rows encoded in one pass; response_model only documents the shape
+    rows = (await db.execute(query.offset(offset).limit(limit))).all()
+    headers = etag_headers(etag)
+    if len(rows) == limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(order_by, desc, getattr(last, order_by), last.id)
+    if includes:
+        items = await with_includes(db, user.id, rows, includes)
+        return JSONBytesResponse(application_detail_rows.dump_dicts(items), headers=headers)
+    return application_rows.response(rows, headers)
+
+
+@router.get("/export")
+async def export_applications(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+    format: ExportFormat = "ndjson",
+    status: Status | None = None,
+    include_company: bool = False,
+):
+    columns = [
+        Application.id,
+        Application.position,
+        Application.status,
+        Application.applied_at,
+        Application.company_id,
+    ]
+    if include_company:
+        columns.append(Company.name.label("company_name"))
+    query = select(*columns).where(Application.owner_id == user.id)
+    if include_company:
+        query = query.join(Company, Company.id == Application.company_id)
+    if status:
+        query = query.where(Application.status == status)
+    # (owner_id, id) index order, so rows stream without a sort
+    return await stream_export(db, query.order_by(Application.id), format, "applications")
 
 
 @router.get("/dashboard/summary", response_model=DashboardSummary)
-def dashboard_summary(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+async def dashboard_summary(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+    etag: str = Depends(user_etag),
 ) -> DashboardSummary:
-    # count applications by status
-    rows = (
-        db.query(Application.status, func.count(Application.id))
-        .filter(Application.owner_id == user.id)
-        .group_by(Application.status)
-        .all()
-    )
-    counts = {status: count for status, count in rows}
+    response.headers.update(etag_headers(etag))
+    row = await db.get(DashboardCounters, user.id)
+    if row is not None:
+        counts = counters.counts_by_status(row)
+        if not row.followup_count:
+            return DashboardSummary(counts_by_status=counts, recent_followups=[])
+    else:
+        # no counters row (should only happen before a repair); count live
+        rows = await db.execute(
+            select(Application.status, func.count(Application.id))
+            .where(Application.owner_id == user.id)
+            .group_by(Application.status)
+        )
+        counts = {status: count for status, count in rows}
 
+    # follow-ups carry their own owner_id (always the application's owner),
+    # so this reads the (owner_id, created_at) index instead of joining and
+    # sorting every follow-up of the user
     recent = (
-        db.query(FollowUp)
-        .join(Application, FollowUp.application_id == Application.id)
-        .filter(Application.owner_id == user.id)
-        .order_by(FollowUp.created_at.desc())
-        .limit(5)
-        .all()
-    )
+        await db.scalars(
+            select(FollowUp)
+            .where(FollowUp.owner_id == user.id)
+            .order_by(FollowUp.created_at.desc(), FollowUp.id.desc())
+            .limit(5)
+        )
+    ).all()
     return DashboardSummary(counts_by_status=counts, recent_followups=recent)
 
 
+@router.get("/analytics", response_model=ApplicationAnalytics)
+async def application_analytics(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+    bucket: Bucket = "week",
+    start: date | None = None,
+    end: date | None = None,
+    version: int = Depends(user_data_version),
+):
+    """Applications sent, interview/offer conversion and follow-up activity
+    per ``bucket`` from ``start`` to ``end`` (the last year by default)."""
+    end = end or date.today()
+    if start is None:
+        start = date.fromordinal(max(1, end.toordinal() - ANALYTICS_DEFAULT_DAYS))
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    if analytics.bucket_count(start, end, bucket) > ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(status_code=422, detail=f"range spans more than {ANALYTICS_MAX_BUCKETS} buckets")
+    try:
+        # the queries read up to the start of the next bucket
+        analytics.next_period(analytics.period_start(end, bucket), bucket)
+    except OverflowError:
+        raise HTTPException(status_code=422, detail="end is too close to the last representable date") from None
+
+    # the default range moves with the calendar, so the ETag names the
+    # resolved range as well as the data version
+    etag = make_etag(user.id, version, start, end)
+    check_not_modified(request, etag)
+    key = (bucket, start, end)
+    body = analytics_cache.get(user.id, str(version), key)
+    if body is None:
+        body = await analytics.build(db, user.id, start, end, bucket)
+        analytics_cache.put(user.id, str(version), key, body)
+    return JSONBytesResponse(body, headers=etag_headers(etag))
+
+
 @router.post("/", response_model=ApplicationOut, status_code=201)
-def create_application(
+async def create_application(
     payload: ApplicationCreate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
 ):
-    company = (
-        db.query(Company)
-        .filter(Company.id == payload.company_id, Company.owner_id == user.id)
-        .first()
+    company = await db.scalar(
+        select(Company).where(Company.id == payload.company_id, Company.owner_id == user.id)
     )
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
@@ -86,11 +265,66 @@ def create_application(
         owner_id=user.id,
     )
     db.add(app_)
-    db.commit()
-    db.refresh(app_)
+    await counters.status_changed(db, user.id, None, app_.status)
+    await data_version.bump(db, user.id)
+    # the event needs the id
+    await db.flush()
+    await outbox.enqueue(db, user.id, "application.created", [outbox.application_data(app_)])
+    await db.commit()
+    await db.refresh(app_)
     return app_
 
 
+@router.post("/bulk", response_model=BulkResult[ApplicationOut])
+async def bulk_create_applications(
+    payload: list[ApplicationCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    # one ownership query for every referenced company instead of one per item
+    company_ids = {item.company_id for item in payload}
+    owned = set(
+        (
+            await db.scalars(
+                select(Company.id).where(Company.id.in_(company_ids), Company.owner_id == user.id)
+            )
+        ).all()
+    )
+    errors: list[BulkItemError] = []
+    rows = []
+    for index, item in enumerate(payload):
+        if item.company_id not in owned:
+            errors.append(BulkItemError(index=index, detail="Company not found"))
+            continue
+        rows.append(
+            {
+                "company_id": item.company_id,
+                "position": item.position,
+                "status": item.status,
+                "applied_at": item.applied_at,
+                "owner_id": user.id,
+            }
+        )
+
+    created = []
+    if rows:
+        created = await insert_returning(
+            db,
+            Application,
+            rows,
+            Application.id,
+            Application.position,
+            Application.status,
+            Application.applied_at,
+            Application.company_id,
+        )
+        await counters.applications_added(db, user.id, (row["status"] for row in rows))
+        await data_version.bump(db, user.id)
+        await outbox.enqueue(db, user.id, "application.created", [outbox.application_data(row) for row in created])
+        await db.commit()
+    return {"created": created, "errors": errors}
+
+
 # --- partial update support -------------------------------------------------
 from datetime import date
 from pydantic import field_validator, BaseModel
@@ -111,16 +345,14 @@ class ApplicationPatch(BaseModel):
 
 
 @router.patch("/{application_id}", response_model=ApplicationOut)
-def update_application(
+async def update_application(
     application_id: int,
     payload: ApplicationPatch,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
 ):
-    app_obj = (
-        db.query(Application)
-        .filter(Application.id == application_id, Application.owner_id == user.id)
-        .first()
+    app_obj = await db.scalar(
+        select(Application).where(Application.id == application_id, Application.owner_id == user.id)
     )
     if not app_obj:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -130,27 +362,47 @@ def update_application(
         # nothing to update – treat as bad request so caller doesn't think
         # something changed silently
         raise HTTPException(status_code=422, detail="no fields provided for update")
+    old_status = app_obj.status
+    before = {attr: getattr(app_obj, attr) for attr in data}
     for attr, val in data.items():
         setattr(app_obj, attr, val)
     db.add(app_obj)
-    db.commit()
-    db.refresh(app_obj)
+    await counters.status_changed(db, user.id, old_status, app_obj.status)
+    await data_version.bump(db, user.id)
+    # [old, new] for each field that actually changed
+    changes = {attr: [before[attr], val] for attr, val in data.items() if before[attr] != val}
+    if changes:
+        event = outbox.application_data(app_obj) | {"changes": changes}
+        await outbox.enqueue(db, user.id, "application.updated", [event])
+    await db.commit()
+    await db.refresh(app_obj)
     return app_obj
 
 
 @router.delete("/{application_id}", status_code=204)
-def delete_application(
+async def delete_application(
     application_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
 ):
-    app_obj = (
-        db.query(Application)
-        .filter(Application.id == application_id, Application.owner_id == user.id)
-        .first()
+    # counted before the DELETE, whose ON DELETE CASCADE removes them
+    followup_count = await db.scalar(
+        select(func.count(FollowUp.id)).where(
+            FollowUp.application_id == application_id, FollowUp.owner_id == user.id
+        )
     )
-    if not app_obj:
+    deleted = (
+        await db.execute(
+            delete(Application)
+            .where(Application.id == application_id, Application.owner_id == user.id)
+            .returning(*application_rows.columns(Application))
+        )
+    ).first()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Application not found")
-    db.delete(app_obj)
-    db.commit()
+    await counters.status_changed(db, user.id, deleted.status, None)
+    await counters.followups_removed(db, user.id, followup_count)
+    await data_version.bump(db, user.id)
+    await outbox.enqueue(db, user.id, "application.deleted", [outbox.application_data(deleted)])
+    await db.commit()
     return None
@@ -2,68 +2,81 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db
-from app.core.security import create_access_token, hash_password, needs_rehash, verify_password
+from app.core.password_pool import PasswordPoolBusy, hash_password_async, verify_password_async
+from app.core.rate_limit import build_login_limiter
+from app.core.security import create_access_token, needs_rehash
+from app.models.dashboard_counters import DashboardCounters
 from app.models.user import User
 from app.schemas.auth import RegisterIn, TokenOut
 
 router = APIRouter()
 
-# in-memory crude rate limiting for login attempts. keyed by username (email)
-# and stored in a sliding one‑minute window. This is deliberately *per-email*
-# rather than per-IP; an attacker can evade the limit by supplying a new email
-# each attempt (hence the guard is "basic demo-ready" only).  A production
-# service would layer IP checks or use a shared cache like redis and/or a
-# library such as fastapi-limiter.
+# crude login throttling keyed by username (email) over a sliding window.
+# This is deliberately *per-email* rather than per-IP; an attacker can evade
+# the limit by supplying a new email each attempt (hence the guard is "basic
+# demo-ready" only). A production service would layer IP checks on top.
 #
 # behaviour summary:
-# * limit = _MAX_ATTEMPTS per _WINDOW_MINUTES
-# * window is sliding: only attempts within the last minute count
+# * limit = LOGIN_MAX_ATTEMPTS per LOGIN_WINDOW_SECONDS
+# * window is sliding (approximated by a weighted two-window counter, see
+#   app/core/rate_limit.py), with fixed memory per key
 # * if the email changes, a separate counter is used
 # * successful logins still consume the quota (prevents timing attacks)
-_login_attempts: dict[str, list] = {}
-_MAX_ATTEMPTS = 5
-_WINDOW_MINUTES = 1
+# * LOGIN_RATE_LIMIT_BACKEND=sqlite shares counters between uvicorn workers
+login_limiter = build_login_limiter()
 
 
+def _hash_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
 
 @router.post("/register", status_code=201)
-def register(payload: RegisterIn, db: Session = Depends(get_db)) -> dict:
-    existing = db.query(User).filter(User.email == payload.email).first()
+async def register(payload: RegisterIn, db: AsyncSession = Depends(get_db)) -> dict:
+    existing = await db.scalar(select(User).where(User.email == payload.email))
     if existing:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
 
-    user = User(email=payload.email, hashed_password=hash_password(payload.password), is_active=True)
+    try:
+        hashed = await hash_password_async(payload.password)
+    except PasswordPoolBusy as e:
+        raise _hash_pool_busy() from e
+    user = User(email=payload.email, hashed_password=hashed, is_active=True)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.flush()
+    db.add(DashboardCounters(owner_id=user.id))
+    await db.commit()
+    await db.refresh(user)
     return {"id": user.id, "email": user.email}
 
 
 @router.post("/login", response_model=TokenOut)
-def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)) -> TokenOut:
-    # basic username-based throttle; window in minutes
-    from datetime import datetime, timedelta, UTC
-
-    now = datetime.now(UTC)
-    attempts = _login_attempts.get(form.username, [])
-    window = timedelta(minutes=_WINDOW_MINUTES)
-    attempts = [t for t in attempts if now - t < window]
-    if len(attempts) >= _MAX_ATTEMPTS:
+async def login(form: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)) -> TokenOut:
+    # basic username-based throttle
+    if not await login_limiter.hit_async(form.username):
         raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many login attempts, try again later")
-    attempts.append(now)
-    _login_attempts[form.username] = attempts
-    user = db.query(User).filter(User.email == form.username).first()
-    if not user or not verify_password(form.password, user.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Bad credentials")
+    user = await db.scalar(select(User).where(User.email == form.username))
+    # end the read transaction so the pooled connection isn't held while the
+    # hash is verified; the rehash below starts a fresh one if it needs to
+    await db.commit()
+    try:
+        if not user or not await verify_password_async(form.password, user.hashed_password):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Bad credentials")
 
-    # Si el hash es bcrypt (o params antiguos), lo actualizas a argon2 sin drama
-    if needs_rehash(user.hashed_password):
-        user.hashed_password = hash_password(form.password)
-        db.add(user)
-        db.commit()
+        # Si el hash es bcrypt (o params antiguos), lo actualizas a argon2 sin drama
+        if needs_rehash(user.hashed_password):
+            user.hashed_password = await hash_password_async(form.password)
+            db.add(user)
+            await db.commit()
+    except PasswordPoolBusy as e:
+        raise _hash_pool_busy() from e
 
     token = create_access_token(user.email)
     return TokenOut(access_token=token)
\ No newline at end of file
@@ -1,40 +1,110 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db
+from app.api.etag import etag_headers, user_etag
+from app.api.responses import RowSerializer
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.principal_cache import Principal
+from app.db import counters, data_version, outbox
+from app.db.bulk import insert_returning
+from app.models.application import Application
 from app.models.company import Company
-from app.models.user import User
+from app.schemas.bulk import BULK_MAX_ITEMS, BulkItemError, BulkResult
 from app.schemas.company import CompanyCreate, CompanyOut
 
 router = APIRouter()
 
+company_rows = RowSerializer(CompanyOut)
+
 
 @router.get("/", response_model=list[CompanyOut])
-def list_companies(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return (
-        db.query(Company)
-        .filter(Company.owner_id == user.id)
+async def list_companies(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+    etag: str = Depends(user_etag),
+):
+    rows = await db.execute(
+        select(*company_rows.columns(Company))
+        .where(Company.owner_id == user.id)
         .order_by(Company.id.desc())
-        .all()
     )
+    return company_rows.response(rows, etag_headers(etag))
 
 
 @router.post("/", response_model=CompanyOut, status_code=201)
-def create_company(payload: CompanyCreate, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+async def create_company(payload: CompanyCreate, db: AsyncSession = Depends(get_db), user: Principal = Depends(get_current_user)):
     company = Company(name=payload.name, website=payload.website, owner_id=user.id)
     db.add(company)
-    db.commit()
-    db.refresh(company)
+    await data_version.bump(db, user.id)
+    await db.commit()
+    await db.refresh(company)
     return company
 
 
+@router.post("/bulk", response_model=BulkResult[CompanyOut])
+async def bulk_create_companies(
+    payload: list[CompanyCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    # names are unique across all users: look the whole batch up at once and
+    # report clashes (with existing rows or earlier items) per item
+    names = {item.name for item in payload}
+    taken = set((await db.scalars(select(Company.name).where(Company.name.in_(names)))).all())
+    errors: list[BulkItemError] = []
+    rows = []
+    for index, item in enumerate(payload):
+        if item.name in taken:
+            errors.append(BulkItemError(index=index, detail="Company name already exists"))
+            continue
+        taken.add(item.name)
+        rows.append({"name": item.name, "website": item.website, "owner_id": user.id})
+
+    created = []
+    if rows:
+        created = await insert_returning(db, Company, rows, Company.id, Company.name, Company.website)
+        await data_version.bump(db, user.id)
+        await db.commit()
+    return {"created": created, "errors": errors}
+
+
 @router.delete("/{company_id}", status_code=204)
-def delete_company(company_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    company = db.query(Company).filter(Company.id == company_id, Company.owner_id == user.id).first()
-    if not company:
+async def delete_company(company_id: int, db: AsyncSession = Depends(get_db), user: Principal = Depends(get_current_user)):
+    endpoints = await outbox.endpoint_ids(db, user.id)
+    application_ids: list[int] = []
+    if endpoints:
+        # the cascade removes these without telling us; one index read of
+        # their ids, only when there is an endpoint to tell
+        application_ids = list(
+            (
+                await db.scalars(
+                    select(Application.id)
+                    .where(Application.owner_id == user.id, Application.company_id == company_id)
+                    .order_by(Application.id)
+                )
+            ).all()
+        )
+    # one statement: ON DELETE CASCADE removes the company's applications and
+    # their follow-ups inside the database instead of row by row in the ORM
+    deleted = (
+        await db.execute(
+            delete(Company)
+            .where(Company.id == company_id, Company.owner_id == user.id)
+            .returning(*company_rows.columns(Company))
+        )
+    ).first()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Company not found")
-    db.delete(company)
-    db.commit()
+    # the cascade can remove any number of applications and follow-ups;
+    # company deletes are rare, so rebuild the user's counters outright
+    await counters.repair_owner(db, user.id)
+    await data_version.bump(db, user.id)
+    # one event for the company rather than one per application
+    data = {name: getattr(deleted, name) for name in CompanyOut.model_fields}
+    data["application_ids"] = application_ids
+    await outbox.enqueue(db, user.id, "company.deleted", [data], endpoints)
+    await db.commit()
     return None
@@ -1,57 +1,130 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import UTC, datetime, timedelta
 
-from app.core.deps import get_current_user, get_db
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.export import ExportFormat, stream_export
+from app.api.responses import RowSerializer
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.principal_cache import Principal
+from app.db import counters, data_version
+from app.db.bulk import insert_returning
 from app.models.application import Application
+from app.models.company import Company
 from app.models.followup import FollowUp
-from app.models.user import User
+from app.schemas.bulk import BULK_MAX_ITEMS, BulkItemError, BulkResult
 from app.schemas.followup import FollowUpCreate, FollowUpOut
 
 router = APIRouter()
 
+followup_rows = RowSerializer(FollowUpOut)
+
+# how far back GET /due looks without an explicit ``after``
+DUE_DEFAULT_DAYS = 7
+
 
 @router.get("/", response_model=list[FollowUpOut])
-def list_followups(
+async def list_followups(
     application_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
 ):
     # verify that the application belongs to the current user
-    app_obj = (
-        db.query(Application)
-        .filter(Application.id == application_id, Application.owner_id == user.id)
-        .first()
+    app_id = await db.scalar(
+        select(Application.id).where(Application.id == application_id, Application.owner_id == user.id)
     )
-    if not app_obj:
+    if app_id is None:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    return (
-        db.query(FollowUp)
-        .filter(
+    rows = await db.execute(
+        select(*followup_rows.columns(FollowUp))
+        .where(
             FollowUp.application_id == application_id,
             FollowUp.owner_id == user.id,
         )
         .order_by(FollowUp.id.desc())
-        .all()
     )
+    return followup_rows.response(rows)
+
+
+@router.get("/due", response_model=list[FollowUpOut])
+async def due_followups(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+    after: datetime | None = None,
+    before: datetime | None = None,
+    limit: int = Query(50, ge=1, le=100),
+):
+    """Reminders due between ``after`` and ``before`` (the last week up to
+    now by default), soonest first. ``reminded_at`` shows whether the
+    scheduler has fired one yet."""
+    try:
+        before = _utc(before) if before else datetime.now(UTC)
+        after = _utc(after) if after else None
+    except OverflowError:
+        raise HTTPException(status_code=422, detail="after and before must be representable in UTC") from None
+    if after is None:
+        # the default window can't start before the first representable moment
+        earliest = datetime.min.replace(tzinfo=UTC)
+        after = before - min(timedelta(days=DUE_DEFAULT_DAYS), before - earliest)
+    # reads the partial (owner_id, due_at, id) index in order
+    rows = await db.execute(
+        select(*followup_rows.columns(FollowUp))
+        .where(
+            FollowUp.owner_id == user.id,
+            FollowUp.due_at.is_not(None),
+            FollowUp.due_at > after,
+            FollowUp.due_at <= before,
+        )
+        .order_by(FollowUp.due_at, FollowUp.id)
+        .limit(limit)
+    )
+    return followup_rows.response(rows)
+
+
+def _utc(value: datetime) -> datetime:
+    # due_at is stored in UTC (see FollowUpCreate)
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+@router.get("/export")
+async def export_followups(
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+    format: ExportFormat = "ndjson",
+    application_id: int | None = None,
+    include_company: bool = False,
+):
+    columns = [FollowUp.id, FollowUp.application_id, FollowUp.note, FollowUp.created_at]
+    if include_company:
+        columns.append(Company.name.label("company_name"))
+    query = select(*columns).where(FollowUp.owner_id == user.id)
+    if include_company:
+        query = query.join(Application, Application.id == FollowUp.application_id).join(
+            Company, Company.id == Application.company_id
+        )
+    if application_id is not None:
+        query = query.where(FollowUp.application_id == application_id)
+    # (owner_id, created_at, id) index order, so rows stream without a sort
+    query = query.order_by(FollowUp.created_at, FollowUp.id)
+    return await stream_export(db, query, format, "followups")
 
 
 @router.post("/", response_model=FollowUpOut, status_code=201)
-def create_followup(
+async def create_followup(
     payload: FollowUpCreate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
 ):
     # ensure the user owns the application
-    app_obj = (
-        db.query(Application)
-        .filter(
+    app_obj = await db.scalar(
+        select(Application).where(
             Application.id == payload.application_id,
             Application.owner_id == user.id,
         )
-        .first()
     )
     if not app_obj:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -60,26 +133,81 @@ def create_followup(
         note=payload.note,
         application_id=payload.application_id,
         owner_id=user.id,
+        due_at=payload.due_at,
     )
     db.add(fu)
-    db.commit()
-    db.refresh(fu)
+    await counters.followup_added(db, user.id)
+    await data_version.bump(db, user.id)
+    await db.commit()
+    await db.refresh(fu)
     return fu
 
 
+@router.post("/bulk", response_model=BulkResult[FollowUpOut])
+async def bulk_create_followups(
+    payload: list[FollowUpCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+):
+    # ensure the user owns every referenced application, in one query
+    application_ids = {item.application_id for item in payload}
+    owned = set(
+        (
+            await db.scalars(
+                select(Application.id).where(
+                    Application.id.in_(application_ids), Application.owner_id == user.id
+                )
+            )
+        ).all()
+    )
+    errors: list[BulkItemError] = []
+    rows = []
+    for index, item in enumerate(payload):
+        if item.application_id not in owned:
+            errors.append(BulkItemError(index=index, detail="Application not found"))
+            continue
+        rows.append(
+            {
+                "note": item.note,
+                "application_id": item.application_id,
+                "owner_id": user.id,
+                "due_at": item.due_at,
+            }
+        )
+
+    created = []
+    if rows:
+        created = await insert_returning(
+            db,
+            FollowUp,
+            rows,
+            FollowUp.id,
+            FollowUp.note,
+            FollowUp.created_at,
+            FollowUp.application_id,
+            FollowUp.due_at,
+            FollowUp.reminded_at,
+        )
+        await counters.followup_added(db, user.id, len(created))
+        await data_version.bump(db, user.id)
+        await db.commit()
+    return {"created": created, "errors": errors}
+
+
 @router.delete("/{followup_id}", status_code=204)
-def delete_followup(
+async def delete_followup(
     followup_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_current_user),
 ):
-    fu_obj = (
-        db.query(FollowUp)
-        .filter(FollowUp.id == followup_id, FollowUp.owner_id == user.id)
-        .first()
+    fu_obj = await db.scalar(
+        select(FollowUp).where(FollowUp.id == followup_id, FollowUp.owner_id == user.id)
     )
     if not fu_obj:
         raise HTTPException(status_code=404, detail="Follow-up not found")
-    db.delete(fu_obj)
-    db.commit()
+    await db.delete(fu_obj)
+    await db.flush()
+    await counters.followups_removed(db, user.id, 1)
+    await data_version.bump(db, user.id)
+    await db.commit()
     return None
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import (
+    Float,
+    Integer,
+    cast,
+    column,
+    func,
+    literal_column,
+    null,
+    select,
+    table,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import decode_cursor, encode_cursor
+from app.api.responses import RowSerializer
+from app.core.deps import get_current_user, get_read_db
+from app.core.principal_cache import Principal
+from app.db.fts import fts_match, tsquery, tsvector
+from app.models.application import Application
+from app.models.company import Company
+from app.models.followup import FollowUp
+from app.schemas.search import SearchHit
+
+router = APIRouter()
+
+search_rows = RowSerializer(SearchHit)
+
+# words the query is reduced to; the rest (punctuation, operators) is ignored
+_TERM = re.compile(r"\w+")
+MAX_TERMS = 8
+
+
+# kind, model, searched column, application_id of a hit
+_SOURCES = (
+    ("application", Application, "position", Application.id),
+    ("company", Company, "name", cast(null(), Integer)),
+    ("followup", FollowUp, "note", FollowUp.application_id),
+)
+
+
+def _hits(dialect: str, owner_id: int, terms: list[str]):
+    """One SELECT per searchable column, each ranked so that higher is better."""
+    selects = []
+    for kind, model, field, application_id in _SOURCES:
+        text_col = getattr(model, field)
+        if dialect == "postgresql":
+            vector, query = tsvector(text_col), tsquery(terms)
+            # double precision so the rank survives the round trip through a cursor
+            rank = cast(func.ts_rank(vector, query), Float(53))
+            match = vector.op("@@")(query)
+        else:
+            fts_name = f"{model.__tablename__}_fts"
+            fts = literal_column(fts_name)
+            # bm25 is lower for better matches; the owner_id column is not scored
+            rank = -func.bm25(fts, 1.0, 0.0)
+            match = fts.op("MATCH")(fts_match(field, owner_id, terms))
+        stmt = select(
+            literal_column(f"'{kind}'").label("kind"),
+            model.id.label("id"),
+            text_col.label("text"),
+            application_id.label("application_id"),
+            rank.label("rank"),
+        ).where(match, model.owner_id == owner_id)
+        if dialect != "postgresql":
+            fts_table = table(fts_name, column("rowid"))
+            stmt = stmt.select_from(model).join(fts_table, fts_table.c.rowid == model.id)
+        selects.append(stmt)
+    return union_all(*selects).subquery("hits")
+
+
+def _decode_after(cursor: str) -> tuple[float, str, int]:
+    value, last_id = decode_cursor(cursor, "rank", True)
+    if not (isinstance(value, list) and len(value) == 2 and isinstance(value[0], int | float)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return float(value[0]), str(value[1]), last_id
+
+
+@router.get("/", response_model=list[SearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    """Applications, companies and follow-ups of the current user containing
+    every word of ``q``, best match first.
+
+    Pages are chained with the ``X-Next-Cursor`` header like the list
+    endpoints. Ranks depend on the whole index, so a write between two pages
+    can reorder the remaining hits.
+    """
+    terms = [t.lower() for t in _TERM.findall(q)][:MAX_TERMS]
+    if not terms:
+        return search_rows.response([])
+
+    hits = _hits(db.get_bind().dialect.name, user.id, terms)
+    query = select(*search_rows.columns(hits.c))
+    if cursor:
+        rank, kind, last_id = _decode_after(cursor)
+        query = query.where(tuple_(hits.c.rank, hits.c.kind, hits.c.id) < tuple_(rank, kind, last_id))
+    query = query.order_by(hits.c.rank.desc(), hits.c.kind.desc(), hits.c.id.desc()).limit(limit)
+
+    rows = (await db.execute(query)).all()
+    headers = {}
+    if len(rows) == limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor("rank", True, [last.rank, last.kind], last.id)
+    return search_rows.response(rows, headers)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.responses import RowSerializer
+from app.core.config import settings
+from app.core.deps import get_current_user, get_db, get_read_db
+from app.core.principal_cache import Principal
+from app.core.webhook_targets import ForbiddenTarget, resolve
+from app.models.webhook import OutboxEvent, WebhookEndpoint
+from app.schemas.webhook import (
+    DeadLetterOut,
+    RedeliverResult,
+    WebhookCreate,
+    WebhookCreated,
+    WebhookOut,
+)
+
+router = APIRouter()
+
+webhook_rows = RowSerializer(WebhookOut)
+dead_letter_rows = RowSerializer(DeadLetterOut)
+
+
+async def owned_endpoint(db: AsyncSession, endpoint_id: int, owner_id: int) -> WebhookEndpoint:
+    endpoint = await db.scalar(
+        select(WebhookEndpoint).where(WebhookEndpoint.id == endpoint_id, WebhookEndpoint.owner_id == owner_id)
+    )
+    if endpoint is None:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return endpoint
+
+
+@router.get("/", response_model=list[WebhookOut])
+async def list_webhooks(db: AsyncSession = Depends(get_read_db), user: Principal = Depends(get_current_user)):
+    rows = await db.execute(
+        select(*webhook_rows.columns(WebhookEndpoint))
+        .where(WebhookEndpoint.owner_id == user.id)
+        .order_by(WebhookEndpoint.id)
+    )
+    return webhook_rows.response(rows)
+
+
+@router.post("/", response_model=WebhookCreated, status_code=201)
+async def create_webhook(payload: WebhookCreate, db: AsyncSession = Depends(get_db), user: Principal = Depends(get_current_user)):
+    # every write fans out to each endpoint; keep that bounded
+    count = await db.scalar(select(func.count(WebhookEndpoint.id)).where(WebhookEndpoint.owner_id == user.id))
+    if count >= settings.WEBHOOK_MAX_ENDPOINTS:
+        raise HTTPException(status_code=409, detail=f"at most {settings.WEBHOOK_MAX_ENDPOINTS} webhooks per user")
+    try:
+        await resolve(str(payload.url))
+    except ForbiddenTarget as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    endpoint = WebhookEndpoint(url=str(payload.url), secret=secrets.token_hex(32), owner_id=user.id)
+    db.add(endpoint)
+    await db.commit()
+    await db.refresh(endpoint)
+    return endpoint
+
+
+@router.delete("/{endpoint_id}", status_code=204)
+async def delete_webhook(endpoint_id: int, db: AsyncSession = Depends(get_db), user: Principal = Depends(get_current_user)):
+    # its undelivered events and dead letters go with it (ON DELETE CASCADE)
+    deleted = await db.scalar(
+        delete(WebhookEndpoint)
+        .where(WebhookEndpoint.id == endpoint_id, WebhookEndpoint.owner_id == user.id)
+        .returning(WebhookEndpoint.id)
+    )
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    await db.commit()
+    return None
+
+
+@router.get("/{endpoint_id}/dead-letters", response_model=list[DeadLetterOut])
+async def list_dead_letters(
+    endpoint_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+    limit: int = Query(50, ge=1, le=100),
+):
+    """Events that failed ``WEBHOOK_MAX_ATTEMPTS`` deliveries, newest first."""
+    await owned_endpoint(db, endpoint_id, user.id)
+    rows = await db.execute(
+        select(*dead_letter_rows.columns(OutboxEvent))
+        .where(OutboxEvent.endpoint_id == endpoint_id, OutboxEvent.dead_at.is_not(None))
+        .order_by(OutboxEvent.id.desc())
+        .limit(limit)
+    )
+    return dead_letter_rows.response(rows)
+
+
+@router.post("/{endpoint_id}/dead-letters/redeliver", response_model=RedeliverResult)
+async def redeliver_dead_letters(
+    endpoint_id: int, db: AsyncSession = Depends(get_db), user: Principal = Depends(get_current_user)
+):
+    """Queue the endpoint's dead letters again and end its backoff."""
+    endpoint = await owned_endpoint(db, endpoint_id, user.id)
+    result = await db.execute(
+        update(OutboxEvent)
+        .where(OutboxEvent.endpoint_id == endpoint_id, OutboxEvent.dead_at.is_not(None))
+        .values(dead_at=None, attempts=0, last_error=None, claimed_until=None)
+    )
+    endpoint.failures = 0
+    endpoint.retry_at = None
+    await db.commit()
+    return {"requeued": result.rowcount}
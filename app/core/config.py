@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +11,69 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # authenticated-principal cache in get_current_user; 0 disables it
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: int = 30
+
+    # Argon2 runs in a process pool of this size (0 = default thread pool);
+    # past PASSWORD_HASH_MAX_PENDING queued jobs logins get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # login throttle: attempts per username in a sliding window. "memory" is
+    # per process; "sqlite" shares the counters between workers on one host
+    LOGIN_MAX_ATTEMPTS: int = 5
+    LOGIN_WINDOW_SECONDS: int = 60
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_RATE_LIMIT_PATH: str = "./login_throttle.sqlite3"
+    # usernames the memory backend tracks at once. Keys idle for two windows
+    # are dropped; live counters never are. When all of them are live,
+    # usernames not yet tracked share one counter allowing 100 times
+    # LOGIN_MAX_ATTEMPTS until some go idle
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    # users whose GET /applications/analytics results are kept per process;
+    # 0 disables the cache
+    ANALYTICS_CACHE_MAX_USERS: int = 10_000
+
+    # follow-up reminder scheduler (app/core/reminders.py), one per worker:
+    # every REMINDER_POLL_SECONDS it claims up to REMINDER_BATCH_SIZE
+    # reminders due within REMINDER_WINDOW_SECONDS; a claim that is not
+    # fired within REMINDER_CLAIM_SECONDS goes back to the other workers
+    REMINDER_SCHEDULER_ENABLED: bool = True
+    REMINDER_WINDOW_SECONDS: float = 60.0
+    REMINDER_POLL_SECONDS: float = 5.0
+    REMINDER_BATCH_SIZE: int = 1000
+    REMINDER_CLAIM_SECONDS: float = 300.0
+
+    # webhooks: endpoints each user may register, and the delivery worker
+    # (python -m app.core.webhooks). It claims up to WEBHOOK_BATCH_SIZE
+    # outbox rows at a time and posts up to WEBHOOK_CONCURRENCY of them at
+    # once. An endpoint that fails is skipped for WEBHOOK_BACKOFF_BASE_SECONDS,
+    # doubling per consecutive failure up to WEBHOOK_BACKOFF_MAX_SECONDS; an
+    # event that failed WEBHOOK_MAX_ATTEMPTS times becomes a dead letter
+    WEBHOOK_MAX_ENDPOINTS: int = 5
+    WEBHOOK_BATCH_SIZE: int = 500
+    WEBHOOK_CONCURRENCY: int = 32
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_POLL_SECONDS: float = 1.0
+    WEBHOOK_CLAIM_SECONDS: float = 120.0
+    WEBHOOK_MAX_ATTEMPTS: int = 8
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = 5.0
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = 3600.0
+    # webhooks may only go to public addresses (app/core/webhook_targets.py);
+    # true also allows loopback, private and link-local ones
+    WEBHOOK_ALLOW_PRIVATE_TARGETS: bool = False
+
+    # background log writer (app/core/logging.py)
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_BATCH_SIZE: int = 256
+    # records per second allowed for chatty loggers (WARNING and up always pass)
+    LOG_RATE_LIMITS: dict[str, float] = {"app.health": 1.0}
+
+    # shared directory for per-worker metric files; see app/serve.py
+    PROMETHEUS_MULTIPROC_DIR: str | None = None
+
     # credentials for a PostgreSQL database; optional for simple setups/tests
     POSTGRES_HOST: str | None = None
     POSTGRES_PORT: int = 5432
@@ -19,6 +84,40 @@ class Settings(BaseSettings):
     # you can override the entire URL directly if you prefer
     DATABASE_URL: str | None = None
 
+    # optional read replica for the read-only endpoints (app/db/replica.py);
+    # same URL forms as DATABASE_URL
+    READ_DATABASE_URL: str | None = None
+    # after a write, that user's reads go to the primary for this many
+    # seconds; keep it above the replica's usual lag
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # after a failed connect, reads skip the replica for this many seconds
+    READ_REPLICA_RETRY_SECONDS: float = 30.0
+
+    # /readyz serves a database status refreshed this often (app/core/readiness.py)
+    READINESS_INTERVAL_SECONDS: float = 5.0
+    # a check taking longer than this counts as a failure
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+
+    # connection pool of each engine, per worker process (app/db/pool.py)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # replace connections older than this many seconds; -1 keeps them
+    DB_POOL_RECYCLE: int = 1800
+    # "always" pings on every checkout, "idle" only connections unused for
+    # DB_POOL_PRE_PING_IDLE_SECONDS, "never" trusts the pool
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+    # open DB_POOL_SIZE connections at startup instead of on first use
+    DB_POOL_PREWARM: bool = True
+    # checkouts waiting longer than this are logged with the request id
+    DB_SLOW_CHECKOUT_MS: int = 100
+    # PostgreSQL only: server-side statement_timeout (0 = none) and psycopg's
+    # prepare_threshold (negative disables prepared statements, which
+    # PgBouncer in transaction mode needs)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_PREPARE_THRESHOLD: int = 5
+
     @property
     def database_url(self) -> str:
         """Return a SQLAlchemy-compatible URL.
@@ -44,7 +143,29 @@ class Settings(BaseSettings):
         # default for local development without PostgreSQL
         return "sqlite:///./db.sqlite3"
 
+    @property
+    def async_database_url(self) -> str:
+        """Return ``database_url`` rewritten for an async driver.
+
+        psycopg 3 ships its own asyncio support, so PostgreSQL URLs are used
+        as-is; SQLite needs the ``aiosqlite`` driver.
+        """
+        return _async_url(self.database_url)
+
+    @property
+    def async_read_database_url(self) -> str | None:
+        """``READ_DATABASE_URL`` rewritten like :attr:`async_database_url`."""
+        return _async_url(self.READ_DATABASE_URL) if self.READ_DATABASE_URL else None
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
+def _async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgresql:"):
+        return "postgresql+psycopg:" + url[len("postgresql:"):]
+    return url
+
+
 settings = Settings()
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import exc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import decode_token, oauth2_scheme
-from app.db.session import SessionLocal
+from app.core.principal_cache import Principal, principal_cache
+from app.core.security import decode_token_claims, oauth2_scheme
+from app.db.replica import READ_SESSIONS, read_router
+from app.db.session import AsyncSessionLocal, ReadAsyncSessionLocal, SessionLocal
 from app.models.user import User
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_sync_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
@@ -18,21 +27,51 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme),
-) -> User:
-    try:
-        email = decode_token(token)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        ) from e
-
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    if not user.is_active:
+) -> Principal:
+    # a hit means the token was already verified and the user looked up
+    # within the cache TTL, so both the JWT decode and the query are skipped
+    principal = principal_cache.get(token)
+    if principal is None:
+        try:
+            claims = decode_token_claims(token)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            ) from e
+
+        user = await db.scalar(select(User).where(User.email == claims["sub"]))
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal = Principal.from_user(user)
+        principal_cache.put(token, principal, claims.get("exp"))
+
+    if not principal.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
-    return user
+    return principal
+
+
+async def get_read_db(
+    user: Principal = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints: the replica when one is configured
+    and :data:`~app.db.replica.read_router` allows it, else the primary."""
+    reason = "no_replica" if ReadAsyncSessionLocal is None else read_router.route(user.id)
+    if reason == "replica":
+        async with ReadAsyncSessionLocal() as db:
+            try:
+                # connect now so an unreachable replica still falls back
+                await db.connection()
+            except exc.DBAPIError as e:
+                read_router.mark_down(e)
+                reason = "replica_down"
+            else:
+                READ_SESSIONS.labels("replica", "replica").inc()
+                yield db
+                return
+    READ_SESSIONS.labels("primary", reason).inc()
+    async with AsyncSessionLocal() as db:
+        yield db
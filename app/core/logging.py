@@ -1,12 +1,40 @@
+import atexit
+import contextvars
+import copy
 import json
 import logging
-import contextvars
+import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
+from typing import TextIO
+
+from prometheus_client import Counter
+
+from app.core.config import settings
+
+try:  # optional: pip install ".[fast]"
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 
 # contextvar used to store the current request id for the formatter
 request_id_var: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
 
+LOG_DROPPED = Counter("log_records_dropped_total", "Log records dropped because the log queue was full")
+LOG_SUPPRESSED = Counter(
+    "log_records_suppressed_total", "Log records discarded by per-logger rate limits", ["logger"]
+)
+
+
+def _dumps(data: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str)
+
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -21,23 +49,192 @@ class JsonFormatter(logging.Formatter):
         rid = getattr(record, "request_id", None) or request_id_var.get()
         if rid:
             data["request_id"] = rid
-        # include exception info if any
+        # include exception info if any; records from QueuedHandler carry
+        # it pre-rendered in exc_text
         if record.exc_info:
             data["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(data)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return _dumps(data)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most ``rate`` records per second through for each listed logger.
+
+    ``limits`` maps logger names to records per second; a logger's children
+    share its budget. Bursts of up to one second's worth are allowed. Records
+    of level WARNING and above are never limited.
+    """
+
+    def __init__(self, limits: dict[str, float]) -> None:
+        super().__init__()
+        self.limits = limits
+        # logger name -> (tokens, last refill); one bucket per configured name
+        self._buckets: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def _limit_for(self, name: str) -> str | None:
+        while name:
+            if name in self.limits:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = self._limit_for(record.name)
+        if key is None:
+            return True
+        rate = self.limits[key]
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(key, [rate, now])
+            bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+        LOG_SUPPRESSED.labels(key).inc()
+        return False
 
 
-def setup_logging(json_output: bool = True) -> None:
+class QueuedHandler(logging.Handler):
+    """Hand records to a background thread that formats and writes them.
+
+    ``emit`` only snapshots the record and enqueues it, so a slow or blocked
+    stdout no longer stalls the request. The writer drains up to
+    ``batch_size`` records per write and flush. When the queue is full the
+    record is dropped and counted in ``log_records_dropped_total`` rather
+    than blocking the caller.
+    """
+
+    def __init__(self, stream: TextIO | None = None, max_queue: int = 10_000, batch_size: int = 256) -> None:
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stderr
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: queue.Queue[logging.LogRecord | None] = queue.Queue(max_queue)
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def _ensure_writer(self) -> None:
+        # threads do not survive fork; a child starts its own writer
+        if self._pid != os.getpid():
+            with self.lock:
+                if self._pid != os.getpid():
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """A copy of ``record`` that is safe to format later on another thread.
+
+        As ``logging.handlers.QueueHandler.prepare`` does, the message is
+        rendered now, while its arguments still hold the values they had at
+        the call, and errors in them surface on the caller's thread. The
+        traceback is rendered too, so the exception and its frames are not
+        kept alive in the queue.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = (self.formatter or logging.Formatter()).formatException(record.exc_info)
+            record.exc_info = None
+        # the contextvar is only visible on the calling thread
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._ensure_writer()
+        try:
+            record = self.prepare(record)
+        except Exception:
+            self.handleError(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_DROPPED.inc()
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            lines = []
+            for item in batch:
+                if item is None:
+                    continue
+                try:
+                    lines.append(self.format(item))
+                except Exception:
+                    self.handleError(item)
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except Exception:
+                    self.handleError(batch[0])
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until every record queued so far has been written.
+
+        Gives up after ``timeout`` seconds so a stuck stream cannot hang
+        interpreter shutdown.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._queue.all_tasks_done.wait(remaining)
+
+    def close(self) -> None:
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+        super().close()
+
+
+def setup_logging(json_output: bool = True, queued: bool = True) -> None:
     """Configure root logger for the app.
 
     If ``json_output`` is True (default) logs are formatted as simple
     JSON objects. Otherwise standard human-readable logging is used.
+    With ``queued`` (default) records are written by a background thread;
+    ``LOG_RATE_LIMITS`` caps chatty loggers such as the health check.
     """
-    handler = logging.StreamHandler()
+    if queued:
+        handler = QueuedHandler(sys.stderr, settings.LOG_QUEUE_SIZE, settings.LOG_BATCH_SIZE)
+        atexit.register(handler.close)
+    else:
+        handler = logging.StreamHandler()
     if json_output:
         handler.setFormatter(JsonFormatter())
     else:
         handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    if settings.LOG_RATE_LIMITS:
+        handler.addFilter(RateLimitFilter(settings.LOG_RATE_LIMITS))
     root = logging.getLogger()
     root.setLevel(logging.INFO)
+    for old in root.handlers:
+        if isinstance(old, QueuedHandler):
+            old.close()
     root.handlers[:] = [handler]
@@ -0,0 +1,104 @@
+"""Run Argon2 hashing and verification off the event loop.
+
+Each hash or verify burns tens of milliseconds of CPU. Inline in a handler
+that stalls every other request on the worker during a login burst, so the
+work goes to a small process pool instead.
+
+``PASSWORD_HASH_WORKERS`` sets the pool size; ``0`` falls back to the
+default thread pool, which is what tests and tiny deployments want. At most
+``PASSWORD_HASH_MAX_PENDING`` jobs may be queued or running at once. Past
+that, :class:`PasswordPoolBusy` is raised and the handler answers 503
+instead of letting the queue grow without bound.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core import security
+from app.core.config import settings
+
+T = TypeVar("T")
+
+QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hash jobs queued or running", multiprocess_mode="livesum"
+)
+JOB_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Password hash job latency including queue wait",
+    ["op"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+REJECTED = Counter("password_hash_rejected_total", "Password hash jobs rejected because the queue was full")
+
+
+class PasswordPoolBusy(RuntimeError):
+    """Raised when too many password hash jobs are already pending."""
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor | None:
+        # created lazily so each uvicorn worker gets its own pool after fork;
+        # "spawn" keeps the children free of the parent's threads and sockets
+        if self.workers > 0 and self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def start(self) -> None:
+        """Spawn the worker processes ahead of the first login."""
+        executor = self._get_executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            for future in [executor.submit(int) for _ in range(self.workers)]:
+                future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, op: str, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                REJECTED.inc()
+                raise PasswordPoolBusy("password hashing queue is full")
+            self._pending += 1
+        QUEUE_DEPTH.inc()
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            JOB_SECONDS.labels(op).observe(time.perf_counter() - start)
+            QUEUE_DEPTH.dec()
+            with self._lock:
+                self._pending -= 1
+
+
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run("hash", security.hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await password_pool.run("verify", security.verify_password, password, hashed)
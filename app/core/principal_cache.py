@@ -0,0 +1,175 @@
+"""Bounded TTL+LRU cache of authenticated principals.
+
+``get_current_user`` used to decode the JWT and then look the user up by
+email on every request. The cache maps a digest of the bearer token to a
+small :class:`Principal` so a hit skips both.
+
+Entries expire after ``AUTH_CACHE_TTL_SECONDS`` or when the token itself
+expires, whichever comes first. Changing a user's ``is_active`` flag or
+password through the ORM drops every cached entry for that user once the
+transaction commits (see the events at the bottom). Dropping them at flush
+time instead would let a concurrent request re-cache the old, still
+committed row for a full TTL. Other worker processes only notice once their
+own entries expire, so keep the TTL short. Bulk ``update(User)`` statements
+bypass mapper events; call :meth:`PrincipalCache.invalidate_user` after them.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from prometheus_client import Counter
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.user import User
+
+CACHE_HITS = Counter("auth_principal_cache_hits_total", "Principal cache hits")
+CACHE_MISSES = Counter("auth_principal_cache_misses_total", "Principal cache misses")
+CACHE_EVICTIONS = Counter(
+    "auth_principal_cache_evictions_total", "Principal cache evictions", ["reason"]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    email: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> Principal:
+        return cls(id=user.id, email=user.email, is_active=user.is_active)
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # digest -> (deadline on the monotonic clock, principal)
+        self._entries: OrderedDict[bytes, tuple[float, Principal]] = OrderedDict()
+        self._by_user: dict[int, set[bytes]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        # never keep raw bearer tokens around in memory
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Principal | None:
+        if not self.enabled:
+            return None
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                CACHE_MISSES.inc()
+                return None
+            deadline, principal = entry
+            if deadline <= time.monotonic():
+                self._remove(key, principal.id)
+                CACHE_EVICTIONS.labels("expired").inc()
+                CACHE_MISSES.inc()
+                return None
+            self._entries.move_to_end(key)
+        CACHE_HITS.inc()
+        return principal
+
+    def put(self, token: str, principal: Principal, token_exp: float | None = None) -> None:
+        """Cache ``principal`` for ``token``.
+
+        ``token_exp`` is the token's ``exp`` claim (epoch seconds); the entry
+        never outlives it.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+            if ttl <= 0:
+                return
+        key = self._digest(token)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._by_user.get(old[1].id, set()).discard(key)
+            self._entries[key] = (time.monotonic() + ttl, principal)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                old_key, (_, old_principal) = self._entries.popitem(last=False)
+                self._unindex(old_key, old_principal.id)
+                CACHE_EVICTIONS.labels("size").inc()
+
+    def invalidate_user(self, user_id: int) -> int:
+        with self._lock:
+            keys = self._by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+        if keys:
+            CACHE_EVICTIONS.labels("invalidated").inc(len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: bytes, user_id: int) -> None:
+        self._entries.pop(key, None)
+        self._unindex(key, user_id)
+
+    def _unindex(self, key: bytes, user_id: int) -> None:
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+# users whose entries go once the session's transaction commits
+_PENDING_KEY = "principal_cache_invalidate"
+
+
+def _invalidate_after_commit(target: User) -> None:
+    session = object_session(target)
+    if session is None:
+        principal_cache.invalidate_user(target.id)
+    else:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_credential_change(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if state.attrs.is_active.history.has_changes() or state.attrs.hashed_password.history.has_changes():
+        _invalidate_after_commit(target)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target: User) -> None:
+    _invalidate_after_commit(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,209 @@
+"""Sliding-window rate limiters with fixed memory per key.
+
+Each key keeps three integers: the index of the current fixed window, the
+hit count in it and the count from the window before. The number of hits in
+the trailing window is estimated as::
+
+    curr + prev * (fraction of the previous window still inside it)
+
+This is the usual sliding-window-counter approximation. The estimate is
+rounded up, so it errs on the side of limiting and a burst that straddles a
+window boundary cannot get more than ``limit`` hits through. Rejected hits
+are not counted.
+
+Two backends share the same algorithm:
+
+* :class:`MemoryRateLimiter` – per-process, with eviction of idle keys and
+  a hard cap on the number of tracked keys. When the cap is reached, new
+  keys share one overflow counter rather than live counters being dropped.
+* :class:`SqliteRateLimiter` – a local SQLite file shared by every uvicorn
+  worker on the host, so the limit is not multiplied by the worker count.
+
+Async callers use :meth:`RateLimiter.hit_async`. SQLite can block for up to
+its busy timeout while another worker holds the write lock, so that backend
+runs its hits on a thread instead of the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+
+
+class RateLimiter(ABC):
+    def __init__(self, limit: int, window_seconds: float) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    def _decide(
+        self, state: tuple[int, int, int] | None, now: float, limit: int | None = None
+    ) -> tuple[bool, tuple[int, int, int]]:
+        """Apply one hit to ``(window, prev, curr)`` and return the new state."""
+        limit = self.limit if limit is None else limit
+        window = int(now // self.window_seconds)
+        if state is None or state[0] < window - 1:
+            prev, curr = 0, 0
+        elif state[0] == window - 1:
+            prev, curr = state[2], 0
+        else:
+            prev, curr = state[1], state[2]
+        elapsed = now / self.window_seconds - window
+        estimate = curr + math.ceil(prev * (1.0 - elapsed))
+        if estimate >= limit:
+            return False, (window, prev, curr)
+        return True, (window, prev, curr + 1)
+
+    @abstractmethod
+    def hit(self, key: str, now: float | None = None) -> bool:
+        """Record an attempt for ``key``; return ``False`` if it is over the limit."""
+
+    async def hit_async(self, key: str, now: float | None = None) -> bool:
+        """:meth:`hit` for code running on the event loop."""
+        return self.hit(key, now)
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget every key."""
+
+
+class MemoryRateLimiter(RateLimiter):
+    # the overflow counter allows this many times ``limit``
+    OVERFLOW_FACTOR = 100
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = 100_000) -> None:
+        super().__init__(limit, window_seconds)
+        self.max_keys = max_keys
+        # shared by every key that doesn't fit in the table
+        self._overflow: tuple[int, int, int] | None = None
+        # least recently hit first, so idle keys are always at the front
+        self._state: OrderedDict[str, tuple[int, int, int]] = OrderedDict()
+        self._swept_window = -1
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            window = int(now // self.window_seconds)
+            if window != self._swept_window:
+                self._sweep(window)
+            current = self._state.get(key)
+            if current is None and len(self._state) >= self.max_keys:
+                # after the sweep every key was hit in the last two windows;
+                # dropping one would reset a live counter, and flooding junk
+                # keys would reset a victim's. Refusing new keys outright
+                # would let the flood lock everyone else out, so they share
+                # one coarse counter until the table has room again
+                allowed, self._overflow = self._decide(self._overflow, now, self.limit * self.OVERFLOW_FACTOR)
+                return allowed
+            allowed, state = self._decide(current, now)
+            self._state[key] = state
+            self._state.move_to_end(key)
+        return allowed
+
+    def _sweep(self, window: int) -> None:
+        # a key untouched for two windows has an estimate of zero, so dropping
+        # it changes nothing; runs once per window so hits stay O(1)
+        self._swept_window = window
+        while self._state:
+            oldest_key, oldest = next(iter(self._state.items()))
+            if oldest[0] >= window - 1:
+                break
+            del self._state[oldest_key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state.clear()
+            self._overflow = None
+            self._swept_window = -1
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+class SqliteRateLimiter(RateLimiter):
+    # idle rows are purged every this many hits rather than on each one
+    PURGE_EVERY = 1000
+
+    def __init__(self, limit: int, window_seconds: float, path: str) -> None:
+        super().__init__(limit, window_seconds)
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._hits = 0
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_pid: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per process; a connection inherited through fork
+        # must not be reused
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # throttle state is disposable; losing the last writes on a crash is fine
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit ("
+                " key TEXT PRIMARY KEY, win INTEGER NOT NULL, prev INTEGER NOT NULL, curr INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_win ON rate_limit (win)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def hit(self, key: str, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            # BEGIN IMMEDIATE takes the write lock up front so two workers
+            # cannot both read the same count and both let a hit through
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT win, prev, curr FROM rate_limit WHERE key = ?", (key,)).fetchone()
+                allowed, state = self._decide(row, now)
+                conn.execute(
+                    "INSERT INTO rate_limit (key, win, prev, curr) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET win = excluded.win, prev = excluded.prev, curr = excluded.curr",
+                    (key, *state),
+                )
+                self._hits += 1
+                if self._hits % self.PURGE_EVERY == 0:
+                    conn.execute("DELETE FROM rate_limit WHERE win < ?", (state[0] - 1,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return allowed
+
+    async def hit_async(self, key: str, now: float | None = None) -> bool:
+        # hits are serialised by the lock anyway, so one thread is enough and
+        # waiting logins don't take threads from the shared pool
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit")
+            self._executor_pid = os.getpid()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.hit, key, now)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM rate_limit")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT count(*) FROM rate_limit").fetchone()[0]
+
+
+def build_login_limiter() -> RateLimiter:
+    limit, window = settings.LOGIN_MAX_ATTEMPTS, settings.LOGIN_WINDOW_SECONDS
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "sqlite":
+        return SqliteRateLimiter(limit, window, settings.LOGIN_RATE_LIMIT_PATH)
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimiter(limit, window, settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+    raise ValueError(f"unknown LOGIN_RATE_LIMIT_BACKEND {settings.LOGIN_RATE_LIMIT_BACKEND!r}")
@@ -0,0 +1,151 @@
+"""Cached database status behind ``/readyz``.
+
+Kubernetes probes every pod every few seconds. Answering each probe with a
+fresh ``SELECT 1`` (and a log line) turns probes into steady database and
+log traffic that says nothing new. Instead :class:`ReadinessMonitor` checks
+the database from a background task every ``READINESS_INTERVAL_SECONDS``
+and ``/readyz`` serves the last result, along with the connection pools'
+current usage (read from the pool objects, no I/O).
+
+Only changes are logged: the first result, the database going away and it
+coming back.
+
+Without the lifespan running (e.g. ``TestClient`` used without ``with``)
+there is no background task; a probe that finds the status older than the
+interval then refreshes it itself, so there is still at most one check per
+interval.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db import session as db_session
+
+logger = logging.getLogger("app.readiness")
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseStatus:
+    ok: bool
+    # on the monotonic clock
+    checked_at: float
+    latency_ms: float
+    error: str | None = None
+
+
+async def _ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+def pool_usage(engine: AsyncEngine) -> dict | None:
+    """Current checkouts against the pool's capacity; ``None`` for unsized pools."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "saturation": round(checked_out / capacity, 3) if capacity else 1.0,
+    }
+
+
+def report(status: DatabaseStatus) -> dict:
+    """``/readyz`` body for ``status`` plus the pools' usage right now."""
+    engines = {"primary": db_session.async_engine, "replica": db_session.read_async_engine}
+    return {
+        "status": "ready" if status.ok else "unavailable",
+        "database": {
+            "ok": status.ok,
+            "latency_ms": round(status.latency_ms, 2),
+            "age_seconds": round(time.monotonic() - status.checked_at, 2),
+            "error": status.error,
+        },
+        "pools": {name: pool_usage(e) for name, e in engines.items() if e is not None},
+    }
+
+
+class ReadinessMonitor:
+    def __init__(self, interval: float, timeout: float) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.status: DatabaseStatus | None = None
+        self._task: asyncio.Task | None = None
+        self._refresh: asyncio.Future | None = None
+
+    async def check(self) -> DatabaseStatus:
+        """Ping the primary database now and record the result."""
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(_ping(db_session.async_engine), self.timeout)
+            error = None
+        except Exception as e:  # anything that keeps the query from running
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        now = time.monotonic()
+        status = DatabaseStatus(error is None, now, (now - start) * 1000, error)
+        self._record(status)
+        return status
+
+    def _record(self, status: DatabaseStatus) -> None:
+        previous, self.status = self.status, status
+        if previous is not None and previous.ok == status.ok:
+            return
+        if status.ok:
+            logger.info("database reachable (%.1fms)", status.latency_ms)
+        else:
+            logger.warning("database unavailable: %s", status.error)
+
+    async def current(self) -> DatabaseStatus:
+        """The cached status, refreshed first if it is out of date.
+
+        Concurrent probes share one refresh.
+        """
+        status = self.status
+        # the background task refreshes every interval; allow it some slack
+        max_age = self.interval if self._task is None else 2 * self.interval + self.timeout
+        if status is not None and time.monotonic() - status.checked_at < max_age:
+            return status
+        refresh = self._refresh
+        loop = asyncio.get_running_loop()
+        if refresh is None or refresh.done() or refresh.get_loop() is not loop:
+            refresh = self._refresh = asyncio.ensure_future(self.check())
+        # a probe that disconnects must not cancel the check the others wait on
+        return await asyncio.shield(refresh)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def start(self) -> None:
+        """Check once, then keep checking in the background."""
+        await self.check()
+        self._task = asyncio.create_task(self._run(), name="readiness")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def reset(self) -> None:
+        self.status = None
+        self._refresh = None
+
+
+readiness = ReadinessMonitor(
+    settings.READINESS_INTERVAL_SECONDS, settings.READINESS_TIMEOUT_SECONDS
+)
@@ -0,0 +1,225 @@
+"""Scheduler that fires follow-up reminders when they fall due.
+
+A follow-up with a ``due_at`` is a reminder. Every worker process runs one
+:class:`ReminderScheduler` (started from the app's lifespan). Rather than
+polling for reminders that are already due, each worker claims the ones due
+within the next ``REMINDER_WINDOW_SECONDS`` and keeps them in a heap ordered
+by ``due_at``. It sleeps until the earliest one is due or the next poll,
+whichever comes first. Memory therefore holds one window of reminders, however
+many are scheduled further out.
+
+Claiming is a single ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP
+LOCKED)`` that stamps ``claimed_until`` on the rows it takes. On PostgreSQL,
+workers polling at the same time skip each other's locked rows instead of
+waiting for them. SQLite has no row locks (SQLAlchemy leaves the clause
+out) but runs each write statement alone, so the claim is atomic there too.
+The scan reads the partial index on pending reminders.
+
+When a reminder fires, the handlers run (:meth:`ReminderScheduler.add_handler`;
+by default the batch is only counted and logged) and then ``reminded_at`` is
+set. If the handlers fail or the worker dies first, the rows stay pending.
+Once ``REMINDER_CLAIM_SECONDS`` have passed, another worker claims them
+again, so a reminder fires at least once. ``stop`` hands unfired claims back
+straight away.
+
+SQLite stores datetimes without an offset; all of these are UTC.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import or_, select, update
+
+from app.core.config import settings
+from app.db import data_version
+from app.db import session as db_session
+from app.models.followup import FollowUp
+
+logger = logging.getLogger("app.reminders")
+
+REMINDERS_CLAIMED = Counter("reminders_claimed_total", "Reminders claimed into a worker's queue")
+REMINDERS_FIRED = Counter("reminders_fired_total", "Reminders fired")
+REMINDER_FAILURES = Counter("reminder_handler_failures_total", "Reminder batches whose handlers raised")
+REMINDER_LAG = Histogram(
+    "reminder_lag_seconds",
+    "Delay between a reminder's due_at and its firing",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Reminder:
+    id: int
+    owner_id: int
+    application_id: int
+    note: str
+    due_at: datetime
+
+
+Handler = Callable[[list[Reminder]], Awaitable[None]]
+
+
+def utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive values
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+async def _log_reminders(reminders: list[Reminder]) -> None:
+    logger.info("fired %d reminders", len(reminders))
+
+
+class ReminderScheduler:
+    def __init__(self, window: float, poll_interval: float, batch_size: int, claim_seconds: float) -> None:
+        self.window = timedelta(seconds=window)
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        # a claim must outlive the window it was taken for
+        self.claim_duration = timedelta(seconds=max(claim_seconds, window + poll_interval))
+        self._heap: list[tuple[datetime, int, Reminder]] = []
+        self._queued: set[int] = set()
+        self._handlers: list[Handler] = [_log_reminders]
+        self._task: asyncio.Task | None = None
+
+    def add_handler(self, handler: Handler) -> None:
+        """Run ``handler`` with every batch of reminders as it falls due."""
+        self._handlers.append(handler)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    async def claim(self, now: datetime | None = None) -> int:
+        """Take unclaimed reminders due within the window into the queue."""
+        now = now or utcnow()
+        candidates = (
+            select(FollowUp.id)
+            .where(
+                FollowUp.due_at.is_not(None),
+                FollowUp.reminded_at.is_(None),
+                FollowUp.due_at <= now + self.window,
+                or_(FollowUp.claimed_until.is_(None), FollowUp.claimed_until < now),
+            )
+            .order_by(FollowUp.due_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with db_session.async_engine.begin() as conn:
+            rows = (
+                await conn.execute(
+                    update(FollowUp)
+                    .where(FollowUp.id.in_(candidates.scalar_subquery()))
+                    .values(claimed_until=now + self.claim_duration)
+                    .returning(
+                        FollowUp.id,
+                        FollowUp.owner_id,
+                        FollowUp.application_id,
+                        FollowUp.note,
+                        FollowUp.due_at,
+                    )
+                )
+            ).all()
+        for row in rows:
+            if row.id in self._queued:
+                continue
+            reminder = Reminder(row.id, row.owner_id, row.application_id, row.note, _utc(row.due_at))
+            heapq.heappush(self._heap, (reminder.due_at, reminder.id, reminder))
+            self._queued.add(reminder.id)
+        REMINDERS_CLAIMED.inc(len(rows))
+        return len(rows)
+
+    async def fire_due(self, now: datetime | None = None) -> int:
+        """Fire every queued reminder due by ``now``; returns how many fired."""
+        now = now or utcnow()
+        due: list[Reminder] = []
+        while self._heap and self._heap[0][0] <= now:
+            reminder = heapq.heappop(self._heap)[2]
+            self._queued.discard(reminder.id)
+            due.append(reminder)
+        if not due:
+            return 0
+        try:
+            for handler in self._handlers:
+                await handler(due)
+        except Exception:
+            # left claimed; another worker retries once the claim runs out
+            REMINDER_FAILURES.inc()
+            logger.exception("reminder handler failed for %d reminders", len(due))
+            return 0
+        async with db_session.async_engine.begin() as conn:
+            await conn.execute(
+                update(FollowUp)
+                .where(FollowUp.id.in_([r.id for r in due]), FollowUp.reminded_at.is_(None))
+                .values(reminded_at=now, claimed_until=None)
+            )
+            # reminded_at is part of the follow-ups' representation
+            await data_version.bump_many(conn, {r.owner_id for r in due})
+        for reminder in due:
+            REMINDER_LAG.observe(max((now - reminder.due_at).total_seconds(), 0.0))
+        REMINDERS_FIRED.inc(len(due))
+        return len(due)
+
+    async def release(self) -> int:
+        """Hand the queued, unfired reminders back to the other workers."""
+        ids = list(self._queued)
+        self._heap.clear()
+        self._queued.clear()
+        if ids:
+            async with db_session.async_engine.begin() as conn:
+                await conn.execute(
+                    update(FollowUp)
+                    .where(FollowUp.id.in_(ids), FollowUp.reminded_at.is_(None))
+                    .values(claimed_until=None)
+                )
+        return len(ids)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time()
+        while True:
+            if loop.time() >= next_poll:
+                next_poll = loop.time() + self.poll_interval
+                try:
+                    await self.claim()
+                except Exception:
+                    logger.exception("claiming reminders failed")
+            try:
+                await self.fire_due()
+            except Exception:
+                # fired but not marked; they fire again once the claim runs out
+                logger.exception("marking reminders as fired failed")
+            delay = next_poll - loop.time()
+            if self._heap:
+                delay = min(delay, (self._heap[0][0] - utcnow()).total_seconds())
+            await asyncio.sleep(max(delay, 0.0))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="reminders")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        try:
+            await self.release()
+        except Exception:
+            logger.exception("releasing reminder claims failed")
+
+
+reminder_scheduler = ReminderScheduler(
+    settings.REMINDER_WINDOW_SECONDS,
+    settings.REMINDER_POLL_SECONDS,
+    settings.REMINDER_BATCH_SIZE,
+    settings.REMINDER_CLAIM_SECONDS,
+)
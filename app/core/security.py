@@ -43,9 +43,13 @@ def create_access_token(subject: str, expires_minutes: int | None = None) -> str
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
-def decode_token(token: str) -> str:
+def decode_token_claims(token: str) -> dict:
     payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
     sub = payload.get("sub")
     if not isinstance(sub, str) or not sub:
         raise JWTError("Missing subject")
-    return sub
+    return payload
+
+
+def decode_token(token: str) -> str:
+    return decode_token_claims(token)["sub"]
@@ -0,0 +1,72 @@
+"""Which hosts webhooks may be sent to.
+
+Any user can register a webhook URL, and the delivery worker POSTs to it
+from inside the deployment. Left unchecked, that reaches whatever the
+worker can reach: loopback services, the private network, and cloud
+metadata endpoints such as ``169.254.169.254``. So only globally routable
+addresses are allowed.
+
+The host is resolved when the webhook is registered, to reject it early,
+and again before every delivery batch, because DNS can change in between.
+The worker then connects to the address it checked, not to whatever a
+second lookup returns. The ``Host`` header and the TLS server name still
+carry the original host name.
+
+``WEBHOOK_ALLOW_PRIVATE_TARGETS`` turns the check off for local setups and
+tests that deliver to a server on localhost.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import socket
+
+import httpx
+
+from app.core.config import settings
+
+
+class ForbiddenTarget(ValueError):
+    """The URL's host resolves to an address webhooks may not be sent to."""
+
+
+def is_allowed(address: str) -> bool:
+    ip = ipaddress.ip_address(address)
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    # is_global is false for loopback, RFC 1918, link-local, shared (CGNAT)
+    # and reserved ranges; some multicast ranges count as global
+    return ip.is_global and not ip.is_multicast
+
+
+async def resolve(url: str) -> str | None:
+    """The checked address to connect to for ``url``.
+
+    ``None`` when the check is turned off. Raises :class:`ForbiddenTarget`
+    if the host doesn't resolve or any of its addresses is not allowed.
+    """
+    if settings.WEBHOOK_ALLOW_PRIVATE_TARGETS:
+        return None
+    parsed = httpx.URL(url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(parsed.host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as exc:
+        raise ForbiddenTarget(f"cannot resolve {parsed.host}: {exc.strerror}") from None
+    addresses = [info[4][0] for info in infos]
+    # a name with one private address among public ones is refused too:
+    # there is no telling which one a client would connect to
+    refused = [address for address in addresses if not is_allowed(address)]
+    if not addresses or refused:
+        raise ForbiddenTarget(f"{parsed.host} resolves to a non-public address")
+    return addresses[0]
+
+
+def pinned(url: str, address: str | None) -> tuple[str, dict[str, str], dict[str, str]]:
+    """``url`` pointed at ``address``, with the ``Host`` header and request
+    extensions that keep the original host name for HTTP and TLS."""
+    if address is None:
+        return url, {}, {}
+    parsed = httpx.URL(url)
+    extensions = {"sni_hostname": parsed.host} if parsed.scheme == "https" else {}
+    return str(parsed.copy_with(host=address)), {"Host": parsed.netloc.decode("ascii")}, extensions
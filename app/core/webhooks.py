@@ -0,0 +1,419 @@
+"""Worker that delivers the webhook outbox.
+
+The API handlers only write events to ``webhook_outbox`` (``app/db/outbox.py``),
+so the latency of a user's endpoint never reaches a request. This worker
+runs as its own process::
+
+    python -m app.core.webhooks [--metrics-port 9101]
+
+and repeats the following:
+
+1. Claim up to ``WEBHOOK_BATCH_SIZE`` pending events, oldest first, with one
+   ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)`` that stamps
+   ``claimed_until``, as ``app/core/reminders.py`` does. Any number of workers
+   can share the table; SQLite runs the statement atomically instead.
+   Events of endpoints that are backing off are not claimed.
+2. POST them, up to ``WEBHOOK_CONCURRENCY`` at once and at most
+   ``CONNECTIONS_PER_ENDPOINT`` to one endpoint. The body is ``{"id", "event", "created_at", "data"}`` and
+   ``X-Webhook-Signature`` is ``sha256=`` and the HMAC-SHA256 of the body
+   with the endpoint's secret. Each endpoint's host is resolved once per
+   batch and must pass ``app/core/webhook_targets.py``; a host that no
+   longer does counts as a failed delivery.
+3. Record the outcome in one transaction. Delivered events are deleted. A
+   failure (non-2xx, timeout, connection error) counts an attempt on the
+   event and a consecutive failure on the endpoint. The endpoint then backs
+   off ``WEBHOOK_BACKOFF_BASE_SECONDS * 2**(failures - 1)``, capped at
+   ``WEBHOOK_BACKOFF_MAX_SECONDS`` and jittered, and its events later in the
+   batch are handed back unsent. After ``WEBHOOK_MAX_ATTEMPTS`` attempts an
+   event becomes a dead letter (``dead_at``); see ``/webhooks/{id}/dead-letters``.
+
+Delivery is at least once: if a worker dies before step 3, its claims run
+out after ``WEBHOOK_CLAIM_SECONDS`` and the events are sent again. Events
+are sent concurrently, so receivers should order by ``id`` (increasing per
+endpoint) and use it to drop duplicates.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import json
+import logging
+import random
+import signal
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from prometheus_client import Counter, Histogram, start_http_server
+from sqlalchemy import bindparam, delete, or_, select, update
+
+from app.core import logging as logging_config
+from app.core.config import settings
+from app.core.webhook_targets import ForbiddenTarget, pinned, resolve
+from app.db import session as db_session
+from app.models.webhook import OutboxEvent, WebhookEndpoint
+
+logger = logging.getLogger("app.webhooks")
+
+WEBHOOK_DELIVERIES = Counter(
+    "webhook_deliveries_total", "Webhook delivery attempts by outcome", ["outcome"]
+)
+WEBHOOK_DURATION = Histogram(
+    "webhook_delivery_seconds",
+    "Duration of webhook POSTs",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# Each endpoint gets its own small httpx client. One client's pool serves
+# requests in a single queue whose bookkeeping grows with the requests
+# waiting: 32 requests in flight on one client reached ~300 requests/s
+# against a local receiver, on 8 clients of 4 connections ~1100/s. It also keeps one slow endpoint from taking every connection.
+# A client must never serve two host names: requests go to the checked IP
+# address (app/core/webhook_targets.py), and httpcore reuses connections
+# by (scheme, IP, port), so two host names behind one CDN address sharing a
+# pool would send the second one's requests over a TLS connection whose
+# server name and certificate were checked for the first.
+CONNECTIONS_PER_ENDPOINT = 4
+# clients kept open between batches; the least recently used are closed
+MAX_IDLE_CLIENTS = 256
+
+_outbox = OutboxEvent.__table__
+_endpoints = WebhookEndpoint.__table__
+
+
+@dataclass(frozen=True, slots=True)
+class Delivery:
+    id: int
+    endpoint_id: int
+    event: str
+    payload: str
+    created_at: datetime
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    id: int
+    url: str
+    secret: str
+    failures: int
+
+
+def utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive values
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def encode(delivery: Delivery) -> bytes:
+    """Request body; the stored payload is spliced in without decoding it."""
+    head = json.dumps(
+        {"id": delivery.id, "event": delivery.event, "created_at": delivery.created_at.isoformat()}
+    )
+    return f'{head[:-1]}, "data": {delivery.payload}}}'.encode()
+
+
+def signature(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        batch_size: int,
+        concurrency: int,
+        timeout: float,
+        claim_seconds: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        poll_interval: float,
+    ) -> None:
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        # a claim must outlive a batch of requests that all time out
+        self.claim_duration = timedelta(seconds=max(claim_seconds, timeout * 2))
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        # loading the CA bundle is slow; the clients share one context
+        self._ssl_context = httpx.create_ssl_context()
+        # (endpoint id, url) -> client; ids of deleted endpoints can come back
+        self._clients: OrderedDict[tuple[int, str], httpx.AsyncClient] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls) -> WebhookDispatcher:
+        return cls(
+            settings.WEBHOOK_BATCH_SIZE,
+            settings.WEBHOOK_CONCURRENCY,
+            settings.WEBHOOK_TIMEOUT_SECONDS,
+            settings.WEBHOOK_CLAIM_SECONDS,
+            settings.WEBHOOK_MAX_ATTEMPTS,
+            settings.WEBHOOK_BACKOFF_BASE_SECONDS,
+            settings.WEBHOOK_BACKOFF_MAX_SECONDS,
+            settings.WEBHOOK_POLL_SECONDS,
+        )
+
+    def backoff(self, failures: int) -> timedelta:
+        """Pause after the ``failures``-th consecutive failure."""
+        delay = min(self.backoff_base * 2 ** (failures - 1), self.backoff_max)
+        # jittered so endpoints that failed together don't retry together
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def claim(self, now: datetime | None = None) -> tuple[list[Delivery], dict[int, Endpoint]]:
+        """Take a batch of pending events and the endpoints they go to."""
+        now = now or utcnow()
+        candidates = (
+            select(OutboxEvent.id)
+            .join(WebhookEndpoint, WebhookEndpoint.id == OutboxEvent.endpoint_id)
+            .where(
+                OutboxEvent.dead_at.is_(None),
+                or_(OutboxEvent.claimed_until.is_(None), OutboxEvent.claimed_until < now),
+                or_(WebhookEndpoint.retry_at.is_(None), WebhookEndpoint.retry_at <= now),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(self.batch_size)
+            .with_for_update(of=OutboxEvent, skip_locked=True)
+        )
+        async with db_session.async_engine.begin() as conn:
+            rows = (
+                await conn.execute(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_(candidates.scalar_subquery()))
+                    .values(claimed_until=now + self.claim_duration)
+                    .returning(
+                        OutboxEvent.id,
+                        OutboxEvent.endpoint_id,
+                        OutboxEvent.event,
+                        OutboxEvent.payload,
+                        OutboxEvent.created_at,
+                        OutboxEvent.attempts,
+                    )
+                )
+            ).all()
+            if not rows:
+                return [], {}
+            endpoint_rows = await conn.execute(
+                select(WebhookEndpoint.id, WebhookEndpoint.url, WebhookEndpoint.secret, WebhookEndpoint.failures)
+                .where(WebhookEndpoint.id.in_({row.endpoint_id for row in rows}))
+            )
+            endpoints = {row.id: Endpoint(*row) for row in endpoint_rows}
+        # RETURNING order is unspecified
+        deliveries = sorted(
+            (Delivery(r.id, r.endpoint_id, r.event, r.payload, _utc(r.created_at), r.attempts) for r in rows),
+            key=lambda d: d.id,
+        )
+        return deliveries, endpoints
+
+    def _client(self, endpoint: Endpoint) -> httpx.AsyncClient:
+        key = (endpoint.id, endpoint.url)
+        client = self._clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=CONNECTIONS_PER_ENDPOINT),
+                verify=self._ssl_context,
+            )
+            self._clients[key] = client
+        self._clients.move_to_end(key)
+        return client
+
+    async def _close_idle_clients(self) -> None:
+        # only between batches, so no request is using them
+        while len(self._clients) > MAX_IDLE_CLIENTS:
+            _, client = self._clients.popitem(last=False)
+            await client.aclose()
+
+    async def _post(self, endpoint: Endpoint, address: str | None, delivery: Delivery) -> str | None:
+        """Send one event to ``address``; returns the error, or ``None`` once delivered."""
+        body = encode(delivery)
+        url, headers, extensions = pinned(endpoint.url, address)
+        headers |= {
+            "Content-Type": "application/json",
+            "X-Webhook-Id": str(delivery.id),
+            "X-Webhook-Event": delivery.event,
+            "X-Webhook-Signature": signature(endpoint.secret, body),
+        }
+        start = time.perf_counter()
+        try:
+            client = self._client(endpoint)
+            response = await client.post(url, content=body, headers=headers, extensions=extensions)
+        except httpx.HTTPError as exc:
+            return f"{type(exc).__name__}: {exc}"[:500]
+        finally:
+            WEBHOOK_DURATION.observe(time.perf_counter() - start)
+        return None if response.is_success else f"HTTP {response.status_code}"
+
+    async def _resolve(self, endpoint: Endpoint) -> str | None | ForbiddenTarget:
+        try:
+            return await resolve(endpoint.url)
+        except ForbiddenTarget as exc:
+            return exc
+
+    async def deliver(
+        self, deliveries: list[Delivery], endpoints: dict[int, Endpoint], now: datetime | None = None
+    ) -> int:
+        """Send claimed events and record the outcome; returns how many were delivered."""
+        limit = asyncio.Semaphore(self.concurrency)
+        delivered: list[int] = []
+        failed: list[tuple[Delivery, str]] = []
+        skipped: list[int] = []
+        failing: set[int] = set()
+        addresses = dict(
+            zip(endpoints, await asyncio.gather(*(self._resolve(e) for e in endpoints.values())), strict=True)
+        )
+
+        async def send(delivery: Delivery) -> None:
+            async with limit:
+                endpoint = endpoints.get(delivery.endpoint_id)
+                # deleted since the claim (its events went with it), or
+                # already failing in this batch: leave it for later
+                if endpoint is None or endpoint.id in failing:
+                    skipped.append(delivery.id)
+                    return
+                address = addresses[endpoint.id]
+                if isinstance(address, ForbiddenTarget):
+                    error = str(address)[:500]
+                else:
+                    error = await self._post(endpoint, address, delivery)
+                if error is None:
+                    delivered.append(delivery.id)
+                else:
+                    failing.add(endpoint.id)
+                    failed.append((delivery, error))
+
+        await asyncio.gather(*(send(d) for d in deliveries))
+        await self._close_idle_clients()
+        await self._record(now or utcnow(), delivered, failed, skipped, endpoints, failing)
+        return len(delivered)
+
+    async def _record(
+        self,
+        now: datetime,
+        delivered: list[int],
+        failed: list[tuple[Delivery, str]],
+        skipped: list[int],
+        endpoints: dict[int, Endpoint],
+        failing: set[int],
+    ) -> None:
+        dead = 0
+        failures = []
+        for delivery, error in failed:
+            gives_up = delivery.attempts + 1 >= self.max_attempts
+            dead += gives_up
+            failures.append({"b_id": delivery.id, "b_error": error, "b_dead": now if gives_up else None})
+        async with db_session.async_engine.begin() as conn:
+            if delivered:
+                await conn.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(delivered)))
+            if failures:
+                await conn.execute(
+                    update(_outbox)
+                    .where(_outbox.c.id == bindparam("b_id"))
+                    .values(
+                        attempts=_outbox.c.attempts + 1,
+                        last_error=bindparam("b_error"),
+                        dead_at=bindparam("b_dead"),
+                        claimed_until=None,
+                    ),
+                    failures,
+                )
+            if skipped:
+                await conn.execute(
+                    update(OutboxEvent).where(OutboxEvent.id.in_(skipped)).values(claimed_until=None)
+                )
+            if failing:
+                await conn.execute(
+                    update(_endpoints)
+                    .where(_endpoints.c.id == bindparam("b_id"))
+                    .values(failures=bindparam("b_failures"), retry_at=bindparam("b_retry_at")),
+                    [
+                        {
+                            "b_id": endpoint_id,
+                            "b_failures": endpoints[endpoint_id].failures + 1,
+                            "b_retry_at": now + self.backoff(endpoints[endpoint_id].failures + 1),
+                        }
+                        for endpoint_id in failing
+                    ],
+                )
+            recovered = [e.id for e in endpoints.values() if e.failures and e.id not in failing]
+            if recovered:
+                await conn.execute(
+                    update(WebhookEndpoint)
+                    .where(WebhookEndpoint.id.in_(recovered))
+                    .values(failures=0, retry_at=None)
+                )
+        WEBHOOK_DELIVERIES.labels("delivered").inc(len(delivered))
+        WEBHOOK_DELIVERIES.labels("failed").inc(len(failed) - dead)
+        WEBHOOK_DELIVERIES.labels("dead_lettered").inc(dead)
+        if failed:
+            logger.warning(
+                "%d webhook deliveries failed (%d dead-lettered) for endpoints %s",
+                len(failed),
+                dead,
+                sorted(failing),
+            )
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """Claim and deliver one batch; returns how many events were claimed."""
+        deliveries, endpoints = await self.claim(now)
+        if deliveries:
+            await self.deliver(deliveries, endpoints, now)
+        return len(deliveries)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Deliver batches until ``stop`` is set, resting when the outbox is drained."""
+        while not stop.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                # claims taken by a failed batch run out and are retried
+                logger.exception("webhook delivery batch failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+
+    async def aclose(self) -> None:
+        while self._clients:
+            await self._clients.popitem()[1].aclose()
+
+
+async def _serve() -> None:
+    dispatcher = WebhookDispatcher.from_settings()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    logger.info("webhook worker started")
+    try:
+        await dispatcher.run(stop)
+    finally:
+        await dispatcher.aclose()
+        await db_session.async_engine.dispose()
+    logger.info("webhook worker stopped")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.webhooks", description="Deliver queued webhook events.")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args(argv)
+    logging_config.setup_logging(json_output=True)
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    asyncio.run(_serve())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,22 @@
+"""Multi-row inserts for the bulk create endpoints."""
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import Row, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def insert_returning(
+    db: AsyncSession, model: type, rows: Sequence[Mapping[str, Any]], *columns
+) -> list[Row]:
+    """Insert ``rows`` in one statement; returns ``columns`` of each, in the order of ``rows``.
+
+    ``columns`` must include the model's ``id``. RETURNING order is
+    unspecified, but ids are assigned in VALUES order, so sorting by id
+    restores the input order. (SQLAlchemy's ``sort_by_parameter_order``
+    would guarantee it, but it makes SQLite insert row by row.)
+    """
+    result = await db.execute(insert(model).returning(*columns), rows)
+    return sorted(result.all(), key=lambda row: row.id)
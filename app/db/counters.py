@@ -0,0 +1,152 @@
+"""Maintenance of the ``dashboard_counters`` table.
+
+The write handlers call the async helpers below inside their own
+transaction, so a counter row never disagrees with a committed change. The
+deltas are applied with ``UPDATE ... SET col = col + :n`` so concurrent
+requests for the same user cannot lose increments.
+
+``repair`` recomputes rows from the source tables. It runs as a fallback
+when a row is missing and from the command line::
+
+    python -m app.db.counters check     # report drifted users, exit 1 if any
+    python -m app.db.counters repair    # rebuild every user's row
+"""
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from collections.abc import Iterable
+from typing import get_args
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.application import Application
+from app.models.dashboard_counters import DashboardCounters
+from app.models.followup import FollowUp
+from app.models.user import User
+from app.schemas.application import Status
+
+STATUSES: tuple[str, ...] = get_args(Status)
+
+
+def status_column(status: str):
+    return getattr(DashboardCounters, f"{status}_count")
+
+
+def counts_by_status(row: DashboardCounters) -> dict[str, int]:
+    # only statuses that occur, matching the old GROUP BY output
+    counts = {status: getattr(row, f"{status}_count") for status in STATUSES}
+    return {status: n for status, n in counts.items() if n}
+
+
+def _computed_rows(owner_ids: Iterable[int] | None = None):
+    """SELECT producing the expected counter row for each user."""
+    values = {
+        f"{status}_count": (
+            select(func.count(Application.id))
+            .where(Application.owner_id == User.id, Application.status == status)
+            .scalar_subquery()
+        )
+        for status in STATUSES
+    }
+    values["followup_count"] = (
+        select(func.count(FollowUp.id)).where(FollowUp.owner_id == User.id).scalar_subquery()
+    )
+    query = select(User.id.label("owner_id"), *(v.label(k) for k, v in values.items()))
+    if owner_ids is not None:
+        query = query.where(User.id.in_(list(owner_ids)))
+    return query
+
+
+def repair(db: Session, owner_ids: Iterable[int] | None = None) -> None:
+    """Rebuild counter rows from the source tables (all users by default)."""
+    owner_ids = None if owner_ids is None else list(owner_ids)
+    stmt = delete(DashboardCounters)
+    if owner_ids is not None:
+        stmt = stmt.where(DashboardCounters.owner_id.in_(owner_ids))
+    db.execute(stmt)
+    query = _computed_rows(owner_ids)
+    db.execute(
+        insert(DashboardCounters).from_select([c.name for c in query.selected_columns], query)
+    )
+
+
+def check(db: Session) -> list[int]:
+    """Return the ids of users whose counter row differs from the source tables."""
+    expected = {row.owner_id: tuple(row) for row in db.execute(_computed_rows())}
+    columns = [DashboardCounters.__table__.c[name] for name in _computed_rows().selected_columns.keys()]
+    actual = {row.owner_id: tuple(row) for row in db.execute(select(*columns))}
+    return sorted(uid for uid in expected.keys() | actual.keys() if expected.get(uid) != actual.get(uid))
+
+
+async def _update_or_repair(db: AsyncSession, owner_id: int, values: dict) -> None:
+    result = await db.execute(
+        update(DashboardCounters).where(DashboardCounters.owner_id == owner_id).values(**values)
+    )
+    if result.rowcount == 0:
+        # no row yet (e.g. a user created outside the API): build it from the
+        # source tables, which already include the pending change
+        await db.flush()
+        await db.run_sync(repair, [owner_id])
+
+
+async def status_changed(db: AsyncSession, owner_id: int, old: str | None, new: str | None) -> None:
+    """Move one application from ``old`` to ``new`` (either may be None)."""
+    if old == new:
+        return
+    values = {}
+    if old is not None:
+        values[f"{old}_count"] = status_column(old) - 1
+    if new is not None:
+        values[f"{new}_count"] = status_column(new) + 1
+    await _update_or_repair(db, owner_id, values)
+
+
+async def applications_added(db: AsyncSession, owner_id: int, statuses: Iterable[str]) -> None:
+    """Count a batch of new applications with one UPDATE."""
+    added = Counter(statuses)
+    if added:
+        await _update_or_repair(
+            db, owner_id, {f"{status}_count": status_column(status) + n for status, n in added.items()}
+        )
+
+
+async def followup_added(db: AsyncSession, owner_id: int, count: int = 1) -> None:
+    """Count ``count`` new follow-ups."""
+    await _update_or_repair(db, owner_id, {"followup_count": DashboardCounters.followup_count + count})
+
+
+async def followups_removed(db: AsyncSession, owner_id: int, count: int) -> None:
+    """Account for ``count`` deleted follow-ups."""
+    if not count:
+        return
+    await _update_or_repair(db, owner_id, {"followup_count": DashboardCounters.followup_count - count})
+
+
+async def repair_owner(db: AsyncSession, owner_id: int) -> None:
+    await db.flush()
+    await db.run_sync(repair, [owner_id])
+
+
+def main(argv: list[str]) -> int:
+    from app.db.session import SessionLocal
+
+    if argv not in (["check"], ["repair"]):
+        print("usage: python -m app.db.counters check|repair", file=sys.stderr)
+        return 2
+    with SessionLocal() as db:
+        if argv == ["repair"]:
+            repair(db)
+            db.commit()
+        drifted = check(db)
+    if drifted:
+        print(f"{len(drifted)} user(s) with drifted counters: {drifted[:20]}")
+        return 1
+    print("dashboard counters consistent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,40 @@
+"""Per-user data version behind the ETags of the collection endpoints.
+
+Every handler that creates, changes or deletes a user's companies,
+applications or follow-ups calls :func:`bump` in the same transaction, so a
+committed change always comes with a new version. It also starts the user's
+read-your-writes window (``app/db/replica.py``). Conditional GETs compare
+the client's ``If-None-Match`` with an ETag derived from it (see
+``app/api/etag.py``) and can answer ``304`` after a single primary-key read.
+
+The version lives on ``users`` rather than ``dashboard_counters`` because
+``counters.repair`` deletes and rebuilds those rows; a version that went
+back to an earlier value would let a stale ETag match again.
+"""
+from __future__ import annotations
+
+from collections.abc import Collection
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.db.replica import read_router
+from app.models.user import User
+
+
+async def bump(db: AsyncSession, owner_id: int) -> None:
+    read_router.note_write(owner_id)
+    await db.execute(update(User).where(User.id == owner_id).values(data_version=User.data_version + 1))
+
+
+async def bump_many(db: AsyncSession | AsyncConnection, owner_ids: Collection[int]) -> None:
+    """:func:`bump` for several users in one statement, for background jobs."""
+    for owner_id in owner_ids:
+        read_router.note_write(owner_id)
+    await db.execute(
+        update(User).where(User.id.in_(owner_ids)).values(data_version=User.data_version + 1)
+    )
+
+
+async def current(db: AsyncSession, owner_id: int) -> int:
+    return await db.scalar(select(User.data_version).where(User.id == owner_id))
@@ -0,0 +1,75 @@
+"""Full-text indexes behind ``GET /search``.
+
+Each searchable column gets a backend-specific index that the database keeps
+current on every insert, update and delete, so no write path has to know
+about search:
+
+* PostgreSQL: a GIN index on ``to_tsvector('english', <column>)``, declared
+  on the model with :func:`search_index`. Queries must use the same
+  expression (:func:`tsvector`) for the planner to pick it.
+* SQLite: an external-content FTS5 table ``<table>_fts`` over the column and
+  ``owner_id``, filled by triggers, created by :func:`sqlite_fts` when the
+  table is created. Indexing ``owner_id`` as a token lets the ``MATCH``
+  intersect the user's rows with the terms instead of matching every user's
+  rows and filtering afterwards.
+
+Both stem English words (``porter`` on SQLite), so "recruiters" finds
+"recruiter" on either backend.
+"""
+from __future__ import annotations
+
+from sqlalchemy import DDL, Index, Table, event, func, literal_column, text
+from sqlalchemy.sql.elements import ColumnElement
+
+SEARCH_CONFIG = "english"
+
+
+def search_index(table: str, column: str) -> Index:
+    """GIN index for :func:`tsvector` of ``column``; created on PostgreSQL only."""
+    return Index(
+        f"ix_{table}_{column}_search",
+        text(f"to_tsvector('{SEARCH_CONFIG}', {column})"),
+        postgresql_using="gin",
+    ).ddl_if(dialect="postgresql")
+
+
+def tsvector(column) -> ColumnElement:
+    # the config is inlined rather than bound so the expression matches the index
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), column)
+
+
+def tsquery(terms: list[str]) -> ColumnElement:
+    # every term must match, like the FTS5 expression below
+    return func.plainto_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), " ".join(terms))
+
+
+def fts_match(column: str, owner_id: int, terms: list[str]) -> str:
+    """FTS5 query for the rows of ``owner_id`` containing all ``terms``.
+
+    ``terms`` must be plain word characters (see the search router), so
+    quoting them is enough to keep FTS5 operators out.
+    """
+    return " AND ".join([f'owner_id : "{owner_id}"', *(f'{column} : "{term}"' for term in terms)])
+
+
+def sqlite_fts(table: Table, column: str) -> None:
+    """Create (and drop) ``<table>_fts`` and its triggers along with ``table`` on SQLite."""
+    name = table.name
+    fts = f"{name}_fts"
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column}, owner_id, content='{name}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}, owner_id) VALUES (new.id, new.{column}, new.owner_id); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}, owner_id) "
+        f"VALUES ('delete', old.id, old.{column}, old.owner_id); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {column}, owner_id ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}, owner_id) "
+        f"VALUES ('delete', old.id, old.{column}, old.owner_id); "
+        f"INSERT INTO {fts}(rowid, {column}, owner_id) VALUES (new.id, new.{column}, new.owner_id); END",
+    ]
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    # the triggers go with the table; the FTS table has to be dropped itself
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {fts}").execute_if(dialect="sqlite"))
@@ -0,0 +1,148 @@
+"""Statement and connection-pool metrics for the SQLAlchemy engines.
+
+``instrument_engine`` hooks ``before/after_cursor_execute`` on an engine. Each
+statement's wall time is added to the :class:`DbStats` of the current request,
+which :class:`~app.middleware.observability.ObservabilityMiddleware` puts in
+``db_stats_var`` and reports per route when the request finishes. Statements
+run outside a request (scripts, background tasks) are not counted.
+
+Pool gauges are updated from checkout/checkin events rather than read at
+scrape time, so they also work in multiprocess mode (see ``app/serve.py``),
+where each worker's values are summed. Checkout wait is timed by the
+``Timed*Pool`` classes that :func:`pool_options` selects; waits longer than
+``DB_SLOW_CHECKOUT_MS`` are also logged, with the pool's status, so a
+saturated pool shows up next to the request it slowed down.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import time
+
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.pool")
+
+DB_STATEMENTS = Histogram(
+    "app_db_statements_per_request",
+    "SQL statements executed per request",
+    ["method", "endpoint"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+DB_SECONDS = Histogram(
+    "app_db_seconds_per_request",
+    "Time spent executing SQL statements per request",
+    ["method", "endpoint"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+POOL_CHECKED_OUT = Gauge(
+    "app_db_pool_checked_out", "Connections currently checked out", ["engine"], multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "app_db_pool_overflow", "Connections open beyond pool_size", ["engine"], multiprocess_mode="livesum"
+)
+POOL_WAIT = Histogram(
+    "app_db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+
+class DbStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+
+
+db_stats_var: contextvars.ContextVar[DbStats | None] = contextvars.ContextVar("db_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = db_stats_var.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+
+
+def _handle_error(exception_context) -> None:
+    # a failed statement never reaches after_cursor_execute
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+class _TimedCheckout:
+    # QueuePool._do_get is where a checkout blocks when the pool is exhausted
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            name = self._orig_logging_name or "default"
+            POOL_WAIT.labels(name).observe(waited)
+            if waited * 1000 >= settings.DB_SLOW_CHECKOUT_MS:
+                logger.warning("slow checkout from pool %s: %.1fms, %s", name, waited * 1000, self.status())
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: str, name: str, is_async: bool) -> dict:
+    """Engine keyword arguments selecting a timed pool for ``url``.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    if url.startswith("sqlite") and (url.endswith(":memory:") or url.rstrip("/").endswith("sqlite:")):
+        return {}
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_logging_name": name,
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Attach statement timing and pool gauges to a (sync) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+    checked_out = POOL_CHECKED_OUT.labels(name)
+    overflow = POOL_OVERFLOW.labels(name)
+
+    def update_overflow() -> None:
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            # overflow() is negative while the pool is below pool_size
+            overflow.set(max(pool.overflow(), 0))
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_out.inc()
+        update_overflow()
+
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        checked_out.dec()
+        update_overflow()
+
+    # pool events registered on the engine carry over when dispose()
+    # recreates the pool
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
@@ -0,0 +1,69 @@
+"""Transactional outbox for webhook events.
+
+Handlers that change a user's applications call :func:`enqueue` in their own
+transaction, before committing. It writes one ``webhook_outbox`` row per
+registered endpoint of the user, so an event exists exactly when the change
+was committed and nothing is sent over the network on the request path. The
+delivery worker (``app/core/webhooks.py``) drains the table.
+
+For a user without endpoints this is a single index read. Otherwise the
+endpoint rows are read ``FOR SHARE`` (PostgreSQL), so an endpoint cannot be
+deleted between reading it and inserting its events.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Literal
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.webhook import OutboxEvent, WebhookEndpoint
+from app.schemas.application import ApplicationOut
+
+Event = Literal["application.created", "application.updated", "application.deleted", "company.deleted"]
+
+_json = TypeAdapter(Any)
+
+
+def application_data(app_: Any) -> dict[str, Any]:
+    """Event data for an application: the ``ApplicationOut`` fields of an ORM object or row."""
+    return {name: getattr(app_, name) for name in ApplicationOut.model_fields}
+
+
+async def endpoint_ids(db: AsyncSession, owner_id: int) -> Sequence[int]:
+    """The user's endpoints, read ``FOR SHARE``; empty when there is nothing to queue for."""
+    return (
+        await db.scalars(
+            select(WebhookEndpoint.id)
+            .where(WebhookEndpoint.owner_id == owner_id)
+            .with_for_update(read=True)
+        )
+    ).all()
+
+
+async def enqueue(
+    db: AsyncSession,
+    owner_id: int,
+    event: Event,
+    items: Sequence[Mapping[str, Any]],
+    endpoints: Sequence[int] | None = None,
+) -> int:
+    """Queue ``event`` once per item for each of the user's endpoints; returns the rows written.
+
+    ``endpoints`` is the result of :func:`endpoint_ids` when the caller already read it.
+    """
+    if endpoints is None:
+        endpoints = await endpoint_ids(db, owner_id)
+    if not endpoints or not items:
+        return 0
+    payloads = [_json.dump_json(item).decode() for item in items]
+    rows = [
+        {"endpoint_id": endpoint_id, "event": event, "payload": payload}
+        for payload in payloads
+        for endpoint_id in endpoints
+    ]
+    # Core table: an executemany of plain INSERTs, no ORM bookkeeping
+    await db.execute(insert(OutboxEvent.__table__), rows)
+    return len(rows)
@@ -0,0 +1,115 @@
+"""Engine and connection-pool configuration from ``Settings``.
+
+:func:`engine_options` turns the ``DB_*`` settings into ``create_engine``
+keyword arguments for one engine: pool sizing and recycling for the timed
+pools picked by :func:`~app.db.instrumentation.pool_options`, and on
+PostgreSQL a server-side ``statement_timeout`` plus psycopg's
+``prepare_threshold``.
+
+``pool_pre_ping`` costs a round trip on every checkout. With the default
+``DB_POOL_PRE_PING=idle`` :func:`configure_engine` only pings connections
+that sat unused in the pool for a while, which is when a server or proxy
+may have dropped them; a failed ping discards the connection and the pool
+opens a new one.
+
+:func:`prewarm` opens the pool's connections at startup so the first
+requests after a deploy don't each pay for a connect.
+
+SQLite only enforces foreign keys (and so ``ON DELETE CASCADE``) on
+connections that turn them on; :func:`configure_engine` does so for every
+new connection.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db.instrumentation import pool_options
+
+logger = logging.getLogger("app.db.pool")
+
+
+def engine_options(url: str, name: str, is_async: bool) -> dict:
+    """Keyword arguments for ``create_engine``/``create_async_engine``."""
+    options = pool_options(url, name, is_async)
+    if "poolclass" in options:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    options["pool_pre_ping"] = settings.DB_POOL_PRE_PING == "always"
+
+    parsed = make_url(url)
+    connect_args: dict = {}
+    if parsed.get_backend_name() == "postgresql":
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        if parsed.get_driver_name() == "psycopg":
+            threshold = settings.DB_PREPARE_THRESHOLD
+            connect_args["prepare_threshold"] = threshold if threshold >= 0 else None
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def configure_engine(engine: Engine) -> None:
+    """Set up new connections and the idle pre-ping policy on a (sync) engine."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _sqlite_foreign_keys)
+    if settings.DB_POOL_PRE_PING != "idle":
+        return
+    idle_seconds = settings.DB_POOL_PRE_PING_IDLE_SECONDS
+
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        # fresh connections have never been checked in and need no ping
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except engine.dialect.loaded_dbapi.Error as e:
+            # the pool drops this connection and retries with a new one
+            raise exc.DisconnectionError("idle connection failed pre-ping") from e
+
+    event.listen(engine, "checkin", on_checkin)
+    event.listen(engine, "checkout", on_checkout)
+
+
+async def prewarm(engine: AsyncEngine, connections: int) -> int:
+    """Open ``connections`` pooled connections and return them to the pool.
+
+    Failures are logged rather than raised: the app still starts (and
+    ``/readyz`` reports the problem) when the database is down. Returns the
+    number of connections opened.
+    """
+    if connections <= 0 or not isinstance(engine.pool, QueuePool):
+        return 0
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in opened))
+    if len(opened) < connections:
+        error = next(r for r in results if isinstance(r, BaseException))
+        logger.warning(
+            "pool prewarm opened %d of %d connections: %s", len(opened), connections, error
+        )
+    return len(opened)
@@ -0,0 +1,84 @@
+"""Which database a read-only request reads from.
+
+With ``READ_DATABASE_URL`` set, the list, export and dashboard endpoints take
+their session from :func:`~app.core.deps.get_read_db`, which asks
+:data:`read_router` whether the replica may serve the current user:
+
+* after one of the user's writes (every write bumps the data version, see
+  ``app/db/data_version.py``) their reads stay on the primary for
+  ``READ_YOUR_WRITES_SECONDS``, so they never see the replica without their
+  own change;
+* after the replica fails to hand out a connection, all reads go to the
+  primary for ``READ_REPLICA_RETRY_SECONDS`` before it is tried again.
+
+Writes are tracked per process. Under ``app/serve.py`` a write and the
+following read may land on different workers, so keep the window above the
+replica's lag and treat it as best effort across workers.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.replica")
+
+READ_SESSIONS = Counter(
+    "app_db_read_sessions_total",
+    "Sessions opened for read-only endpoints",
+    ["engine", "reason"],
+)
+
+# users whose last write is remembered; the oldest are forgotten first
+MAX_TRACKED_USERS = 100_000
+
+
+class ReadRouter:
+    def __init__(self, max_users: int = MAX_TRACKED_USERS) -> None:
+        self.max_users = max_users
+        # user id -> time of their last write on the monotonic clock
+        self._writes: OrderedDict[int, float] = OrderedDict()
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def note_write(self, user_id: int) -> None:
+        with self._lock:
+            self._writes[user_id] = time.monotonic()
+            self._writes.move_to_end(user_id)
+            while len(self._writes) > self.max_users:
+                self._writes.popitem(last=False)
+
+    def route(self, user_id: int) -> str:
+        """``"replica"``, or the reason this user's read goes to the primary."""
+        now = time.monotonic()
+        if now < self._down_until:
+            return "replica_down"
+        with self._lock:
+            written_at = self._writes.get(user_id)
+            if written_at is not None:
+                if now - written_at < settings.READ_YOUR_WRITES_SECONDS:
+                    return "recent_write"
+                del self._writes[user_id]
+        return "replica"
+
+    def mark_down(self, error: BaseException) -> None:
+        retry = settings.READ_REPLICA_RETRY_SECONDS
+        logger.warning("read replica unavailable, using the primary for %.0fs: %s", retry, error)
+        self._down_until = time.monotonic() + retry
+
+    @property
+    def replica_down(self) -> bool:
+        return time.monotonic() < self._down_until
+
+    def clear(self) -> None:
+        with self._lock:
+            self._writes.clear()
+        self._down_until = 0.0
+
+
+read_router = ReadRouter()
@@ -1,9 +1,42 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import configure_engine, engine_options
 
 # use the computed database URL; this allows the settings to decide
 # between SQLite (dev/tests) and Postgres.
-engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
+engine = create_engine(
+    settings.database_url,
+    future=True,
+    **engine_options(settings.database_url, "primary_sync", is_async=False),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+# async counterpart used by the API handlers so a DB round trip does not pin
+# one of the threadpool workers. the sync engine above is kept for scripts
+# and benchmarks that run outside the event loop.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    **engine_options(settings.async_database_url, "primary", is_async=True),
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+configure_engine(engine)
+configure_engine(async_engine.sync_engine)
+instrument_engine(engine, "primary_sync")
+instrument_engine(async_engine.sync_engine, "primary")
+
+# optional read replica for the read-only endpoints; see app/db/replica.py
+read_async_engine = None
+ReadAsyncSessionLocal = None
+if settings.async_read_database_url:
+    read_async_engine = create_async_engine(
+        settings.async_read_database_url,
+        **engine_options(settings.async_read_database_url, "replica", is_async=True),
+    )
+    ReadAsyncSessionLocal = async_sessionmaker(bind=read_async_engine, autoflush=False, expire_on_commit=False)
+    configure_engine(read_async_engine.sync_engine)
+    instrument_engine(read_async_engine.sync_engine, "replica")
@@ -1,50 +1,94 @@
 import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends, HTTPException, Response
 from sqlalchemy import text
-from starlette.requests import Request
 
 from app.core.deps import get_db
 from app.core import logging as logging_config
 
+from app.api.responses import JSONBytesResponse
 from app.api.routers.applications import router as applications_router
 from app.api.routers.auth import router as auth_router
 from app.api.routers.companies import router as companies_router
 from app.api.routers.followups import router as followups_router
+from app.api.routers.search import router as search_router
+from app.api.routers.webhooks import router as webhooks_router
 from app.core.config import settings
-from app.middleware.request_id import RequestIdMiddleware
+from app.core.password_pool import password_pool
+from app.core.readiness import readiness, report
+from app.core.reminders import reminder_scheduler
+from app.db.pool import prewarm
+from app.db import session as db_session
+from app.middleware.observability import ObservabilityMiddleware
 
 # configure logging as soon as app starts
 logging_config.setup_logging(json_output=True)
 
-app = FastAPI(title=settings.APP_NAME)
-app.add_middleware(RequestIdMiddleware)
 
-# basic prometheus metrics
-from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # spawn the password hashing workers before the first login needs them
+    password_pool.start()
+    if settings.DB_POOL_PREWARM:
+        await prewarm(db_session.async_engine, settings.DB_POOL_SIZE)
+        if db_session.read_async_engine is not None:
+            await prewarm(db_session.read_async_engine, settings.DB_POOL_SIZE)
+    await readiness.start()
+    if settings.REMINDER_SCHEDULER_ENABLED:
+        reminder_scheduler.start()
+    yield
+    await reminder_scheduler.stop()
+    await readiness.stop()
+    password_pool.shutdown()
+
 
-REQUEST_COUNT = Counter("app_requests_total", "Total requests", ["method", "endpoint", "http_status"])
+# list endpoints return pre-encoded bytes (app/api/responses.py); everything
+# else is encoded by the same class
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan, default_response_class=JSONBytesResponse)
+app.add_middleware(ObservabilityMiddleware)
 
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    response = await call_next(request)
-    REQUEST_COUNT.labels(request.method, request.url.path, response.status_code).inc()
-    return response
+# basic prometheus metrics; requests are counted by ObservabilityMiddleware
+from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import multiprocess
 
 @app.get("/metrics", tags=["system"])
 def metrics():
+    # under app/serve.py every worker writes its values to files in this
+    # directory; merge them so the scrape covers all workers
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 
+@app.get("/livez", tags=["system"])
+async def livez():
+    # liveness: the process serves requests; no I/O, no logging
+    return {"status": "ok"}
+
+
+@app.get("/readyz", tags=["system"])
+async def readyz():
+    # readiness: the database status cached by app/core/readiness.py
+    status = await readiness.current()
+    return JSONBytesResponse(report(status), status_code=200 if status.ok else 503)
+
+
+# kept for existing clients; probes should use /livez and /readyz
 @app.get("/health", tags=["system"])
-def health(db=Depends(get_db)):
+async def health(db=Depends(get_db)):
     # execute a cheap query to ensure the database is reachable
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
     except Exception as exc:
         raise HTTPException(status_code=503, detail="database unavailable")
     # log something so we have a record to inspect
-    logging.getLogger(__name__).info("health check passed")
+    # probes hit this constantly; "app.health" is rate limited by LOG_RATE_LIMITS
+    logging.getLogger("app.health").info("health check passed")
     return {"status": "ok"}
 
 
@@ -52,3 +96,5 @@ app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(companies_router, prefix="/companies", tags=["companies"])
 app.include_router(applications_router, prefix="/applications", tags=["applications"])
 app.include_router(followups_router, prefix="/followups", tags=["followups"])
+app.include_router(search_router, prefix="/search", tags=["search"])
+app.include_router(webhooks_router, prefix="/webhooks", tags=["webhooks"])
@@ -0,0 +1,94 @@
+"""Request id and request metrics as one pure ASGI middleware.
+
+``BaseHTTPMiddleware`` runs the downstream app in a separate task and pipes
+the response through a memory stream; two of them stacked doubled that cost
+on every request and re-chunked streaming responses between the layers. This
+middleware only wraps ``send`` to read the status code and append the
+``X-Request-Id`` header, so the response body passes straight through.
+
+Metrics are labeled with the matched route template (``/applications/{application_id}``)
+rather than the raw path, so the number of series is bounded by the number of
+routes. Requests that match no route share the ``unmatched`` label.
+"""
+from __future__ import annotations
+
+import time
+import uuid
+
+from prometheus_client import Counter, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import request_id_var
+from app.db.instrumentation import DB_SECONDS, DB_STATEMENTS, DbStats, db_stats_var
+
+REQUEST_COUNT = Counter("app_requests_total", "Total requests", ["method", "endpoint", "http_status"])
+REQUEST_LATENCY = Histogram(
+    "app_request_duration_seconds",
+    "Request latency until the response body is complete",
+    ["method", "endpoint"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+_REQUEST_ID_HEADER = b"x-request-id"
+UNMATCHED = "unmatched"
+
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route that handled ``scope``.
+
+    Routes from included routers carry their path without the router prefix,
+    so the prefix is taken from the request path: a route template with ``n``
+    segments matched the last ``n`` segments of the path, and the prefixes in
+    this app are literals.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return UNMATCHED
+    prefix = scope["path"].rsplit("/", template.count("/"))[0]
+    return prefix + template
+
+
+class ObservabilityMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == _REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None:
+            request_id = str(uuid.uuid4())
+        # store in contextvar for log formatter
+        token = request_id_var.set(request_id)
+        stats = DbStats()
+        stats_token = db_stats_var.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.append((_REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method, endpoint = scope["method"], route_template(scope)
+            # an exception escaping the app is answered with a 500 further out
+            REQUEST_COUNT.labels(method, endpoint, status_code).inc()
+            REQUEST_LATENCY.labels(method, endpoint).observe(time.perf_counter() - start)
+            DB_STATEMENTS.labels(method, endpoint).observe(stats.statements)
+            DB_SECONDS.labels(method, endpoint).observe(stats.seconds)
+            db_stats_var.reset(stats_token)
+            request_id_var.reset(token)
@@ -1,6 +1,8 @@
 from app.models.application import Application
 from app.models.company import Company
+from app.models.dashboard_counters import DashboardCounters
 from app.models.followup import FollowUp
 from app.models.user import User
+from app.models.webhook import OutboxEvent, WebhookEndpoint
 
-__all__ = ["User", "Company", "Application", "FollowUp"]
\ No newline at end of file
+__all__ = ["User", "Company", "Application", "FollowUp", "DashboardCounters", "WebhookEndpoint", "OutboxEvent"]
\ No newline at end of file
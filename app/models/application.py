@@ -1,13 +1,25 @@
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, String
+from sqlalchemy import Date, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.fts import search_index, sqlite_fts
 
 
 class Application(Base):
     __tablename__ = "applications"
+    # composite indexes follow the router query shapes: every query filters by
+    # owner first, then sorts by the list ``order_by`` column with ``id`` as
+    # the keyset tie-breaker. ``(owner_id, status, id)`` also covers the
+    # dashboard ``GROUP BY status`` without touching the table.
+    __table_args__ = (
+        Index("ix_applications_owner_id_id", "owner_id", "id"),
+        Index("ix_applications_owner_id_applied_at", "owner_id", "applied_at", "id"),
+        Index("ix_applications_owner_id_status", "owner_id", "status", "id"),
+        Index("ix_applications_owner_id_status_applied_at", "owner_id", "status", "applied_at", "id"),
+        search_index("applications", "position"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -15,10 +27,14 @@ class Application(Base):
     status: Mapped[str] = mapped_column(String(50), default="applied", nullable=False)
     applied_at: Mapped[date | None] = mapped_column(Date, nullable=True)
 
-    company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), index=True, nullable=False)
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    company_id: Mapped[int] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), index=True, nullable=False)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     company = relationship("Company", back_populates="applications")
     owner = relationship("User")
-    followups = relationship("FollowUp", back_populates="application", cascade="all, delete-orphan")
-    
\ No newline at end of file
+    followups = relationship(
+        "FollowUp", back_populates="application", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+sqlite_fts(Application.__table__, "position")
@@ -1,18 +1,29 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.fts import search_index, sqlite_fts
 
 
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index("ix_companies_owner_id_id", "owner_id", "id"),
+        search_index("companies", "name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(200), unique=True, index=True, nullable=False)
     website: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     owner = relationship("User")
-    applications = relationship("Application", back_populates="company", cascade="all, delete-orphan")
-    
+    # ON DELETE CASCADE removes the applications (and their follow-ups) in
+    # the database; passive_deletes keeps the ORM from loading them first
+    applications = relationship(
+        "Application", back_populates="company", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+sqlite_fts(Company.__table__, "name")
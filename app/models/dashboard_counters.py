@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DashboardCounters(Base):
+    """Per-user aggregates behind ``GET /applications/dashboard/summary``.
+
+    Kept in step by the write handlers in the same transaction as the change
+    they describe; ``python -m app.db.counters repair`` rebuilds them from the
+    source tables.
+    """
+
+    __tablename__ = "dashboard_counters"
+
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+
+    applied_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    interview_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    offer_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rejected_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    followup_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -1,21 +1,54 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.fts import search_index, sqlite_fts
+
+# reminders the scheduler has yet to fire (app/core/reminders.py)
+PENDING_REMINDER = "due_at IS NOT NULL AND reminded_at IS NULL"
 
 
 class FollowUp(Base):
     __tablename__ = "followups"
+    # the reminder indexes are partial: most follow-ups are plain notes
+    # without a ``due_at``, and fired reminders drop out of the pending one
+    __table_args__ = (
+        Index("ix_followups_application_id_owner_id", "application_id", "owner_id", "id"),
+        Index("ix_followups_owner_id_created_at", "owner_id", "created_at", "id"),
+        Index(
+            "ix_followups_owner_id_due_at",
+            "owner_id",
+            "due_at",
+            "id",
+            postgresql_where=text("due_at IS NOT NULL"),
+            sqlite_where=text("due_at IS NOT NULL"),
+        ),
+        Index(
+            "ix_followups_pending_due_at",
+            "due_at",
+            postgresql_where=text(PENDING_REMINDER),
+            sqlite_where=text(PENDING_REMINDER),
+        ),
+        search_index("followups", "note"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
     note: Mapped[str] = mapped_column(String(1000), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # optional reminder: when to remind, when the scheduler did, and until
+    # when a worker holds it in its queue
+    due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    reminded_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    application_id: Mapped[int] = mapped_column(ForeignKey("applications.id"), index=True, nullable=False)
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    application_id: Mapped[int] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     application = relationship("Application", back_populates="followups")
-    owner = relationship("User")
\ No newline at end of file
+    owner = relationship("User")
+
+
+sqlite_fts(FollowUp.__table__, "note")
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -10,4 +10,6 @@ class User(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(String(320), unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
\ No newline at end of file
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # bumped by every write to the user's data; the ETags are derived from it
+    data_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class WebhookEndpoint(Base):
+    __tablename__ = "webhook_endpoints"
+    __table_args__ = (Index("ix_webhook_endpoints_owner_id", "owner_id", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    # HMAC key for the X-Webhook-Signature header
+    secret: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # consecutive failed deliveries and, while backing off, when to try again
+    # (maintained by app/core/webhooks.py)
+    failures: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+
+
+class OutboxEvent(Base):
+    """One event waiting to be delivered to one endpoint.
+
+    Written by the API handlers in the transaction of the change itself and
+    deleted once delivered; rows with ``dead_at`` set are dead letters.
+    """
+
+    __tablename__ = "webhook_outbox"
+    # the worker scans pending rows in id order; dead letters stay out of it.
+    # Receivers deduplicate by id, so SQLite must not reuse the ids of
+    # delivered (deleted) rows: AUTOINCREMENT
+    __table_args__ = (
+        Index("ix_webhook_outbox_endpoint_id", "endpoint_id", "id"),
+        Index(
+            "ix_webhook_outbox_pending",
+            "id",
+            postgresql_where=text("dead_at IS NULL"),
+            sqlite_where=text("dead_at IS NULL"),
+        ),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    event: Mapped[str] = mapped_column(String(50), nullable=False)
+    # JSON of the event's data, encoded by the handler
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    dead_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    endpoint_id: Mapped[int] = mapped_column(
+        ForeignKey("webhook_endpoints.id", ondelete="CASCADE"), nullable=False
+    )
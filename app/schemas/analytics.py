@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Literal
+
+from pydantic import BaseModel
+
+# weeks start on Monday on both backends
+Bucket = Literal["day", "week", "month"]
+
+
+class AnalyticsBucket(BaseModel):
+    # first day of the bucket
+    start: date
+    # applications by ``applied_at``; ``interviews`` counts those that got to
+    # the interview stage (status ``interview`` or ``offer``)
+    applied: int
+    interviews: int
+    offers: int
+    # null when nothing was applied for (in the bucket / since ``start``)
+    interview_rate: float | None
+    offer_rate: float | None
+    interview_rate_to_date: float | None
+    offer_rate_to_date: float | None
+    # follow-ups by ``created_at``
+    followups: int
+
+
+class ApplicationAnalytics(BaseModel):
+    bucket: Bucket
+    start: date
+    end: date
+    # every bucket from ``start`` to ``end``, oldest first, empty ones included
+    buckets: list[AnalyticsBucket]
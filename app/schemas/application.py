@@ -5,6 +5,9 @@ from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, field_validator
 
+from app.schemas.company import CompanyOut
+from app.schemas.followup import FollowUpOut
+
 Status = Literal["applied", "interview", "offer", "rejected"]
 
 
@@ -30,4 +33,16 @@ class ApplicationOut(BaseModel):
     status: Status
     applied_at: date | None
     company_id: int
-    
\ No newline at end of file
+
+
+# relations that ``GET /applications/?include=`` can add to each item
+Include = Literal["company", "followups", "latest_followup"]
+
+
+class ApplicationDetailOut(ApplicationOut):
+    """``ApplicationOut`` plus the relations named in ``include``; the others are left out."""
+
+    company: CompanyOut | None = None
+    # newest first
+    followups: list[FollowUpOut] | None = None
+    latest_followup: FollowUpOut | None = None
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+# upper bound on items per bulk request; keeps a single transaction bounded
+BULK_MAX_ITEMS = 1000
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkResult(BaseModel, Generic[T]):
+    # created rows in input order; items listed in ``errors`` are skipped
+    created: list[T]
+    errors: list[BulkItemError]
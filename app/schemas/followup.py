@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import UTC, datetime
 
 from pydantic import BaseModel, ConfigDict, field_validator
 
@@ -8,6 +8,8 @@ from pydantic import BaseModel, ConfigDict, field_validator
 class FollowUpCreate(BaseModel):
     application_id: int
     note: str
+    # remind the user at this time; naive values are taken as UTC
+    due_at: datetime | None = None
 
     @field_validator("note")
     @classmethod
@@ -19,6 +21,14 @@ class FollowUpCreate(BaseModel):
             raise ValueError("note too long (max 1000 characters)")
         return v
 
+    @field_validator("due_at")
+    @classmethod
+    def normalize_due_at(cls, v: datetime | None) -> datetime | None:
+        # stored as UTC; SQLite keeps no offset, so it must be the same everywhere
+        if v is None:
+            return v
+        return v.replace(tzinfo=UTC) if v.tzinfo is None else v.astimezone(UTC)
+
 
 class FollowUpOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -27,3 +37,6 @@ class FollowUpOut(BaseModel):
     note: str
     created_at: datetime
     application_id: int
+    due_at: datetime | None = None
+    # set once the reminder has fired
+    reminded_at: datetime | None = None
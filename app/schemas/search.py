@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+SearchKind = Literal["application", "company", "followup"]
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: int
+    # the matched position, company name or note
+    text: str
+    # the application a follow-up (or the application itself) belongs to
+    application_id: int | None = None
+    # higher is better; only comparable within one result list
+    rank: float
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict
+
+
+class WebhookCreate(BaseModel):
+    url: AnyHttpUrl
+
+
+class WebhookOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    url: str
+    created_at: datetime
+    # consecutive failed deliveries; while backing off, the next attempt
+    failures: int
+    retry_at: datetime | None
+
+
+class WebhookCreated(WebhookOut):
+    """Only returned on creation: the key that signs every delivery."""
+
+    secret: str
+
+
+class DeadLetterOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    event: str
+    created_at: datetime
+    attempts: int
+    last_error: str | None
+    dead_at: datetime
+
+
+class RedeliverResult(BaseModel):
+    requeued: int
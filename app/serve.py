@@ -0,0 +1,133 @@
+"""Run the API in several uvicorn worker processes with shared metrics.
+
+Every worker keeps its own Prometheus values, so with plain ``uvicorn
+--workers`` each scrape of ``/metrics`` only sees the worker that answered
+it. When ``PROMETHEUS_MULTIPROC_DIR`` is set, ``prometheus_client`` writes
+values to per-process files in that directory and ``/metrics`` merges them.
+This launcher:
+
+* clears the directory on startup so totals from a previous run don't leak in;
+* binds the socket once and hands it to ``--workers`` spawned processes;
+* restarts workers that die, calling ``mark_process_dead`` first so their
+  live gauges stop counting (their counters and histograms are kept, so
+  totals never go backwards).
+
+With more than one worker and no directory configured, a temporary one is
+created for the lifetime of the launcher.
+
+Usage::
+
+    python -m app.serve --host 0.0.0.0 --port 8000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.serve")
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def prepare_multiproc_dir(path: str) -> None:
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.db"):
+        stale.unlink()
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    def __init__(self, config: uvicorn.Config, workers: int, multiproc_dir: str | None) -> None:
+        self.config = config
+        self.workers = workers
+        self.multiproc_dir = multiproc_dir
+        self.processes: dict[int, multiprocessing.process.BaseProcess] = {}
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop = threading.Event()
+
+    def _spawn(self, sock: socket.socket) -> None:
+        process = self._ctx.Process(target=_run_worker, args=(self.config, sock))
+        process.start()
+        self.processes[process.pid] = process
+        logger.info("started worker %s", process.pid)
+
+    def _reap(self, sock: socket.socket) -> None:
+        for pid, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            del self.processes[pid]
+            if self.multiproc_dir:
+                from prometheus_client import multiprocess
+
+                multiprocess.mark_process_dead(pid, self.multiproc_dir)
+            if not self._stop.is_set():
+                logger.warning("worker %s exited with %s, restarting", pid, process.exitcode)
+                self._spawn(sock)
+
+    def stop(self, *_args) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        sock = self.config.bind_socket()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.stop)
+        try:
+            for _ in range(self.workers):
+                self._spawn(sock)
+            while not self._stop.wait(0.5):
+                self._reap(sock)
+        finally:
+            for process in self.processes.values():
+                process.terminate()
+            for process in self.processes.values():
+                process.join(timeout=self.config.timeout_graceful_shutdown or 30)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+            sock.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", "1")))
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    # prometheus_client picks its storage when it is imported, so the
+    # directory must be in the environment before the workers start
+    multiproc_dir = settings.PROMETHEUS_MULTIPROC_DIR
+    temporary = False
+    if multiproc_dir is None and args.workers > 1:
+        multiproc_dir, temporary = tempfile.mkdtemp(prefix="prometheus-"), True
+    if multiproc_dir:
+        prepare_multiproc_dir(multiproc_dir)
+        os.environ[MULTIPROC_ENV] = multiproc_dir
+
+    config = uvicorn.Config("app.main:app", host=args.host, port=args.port, proxy_headers=True)
+    try:
+        Supervisor(config, args.workers, multiproc_dir).run()
+    finally:
+        if temporary:
+            shutil.rmtree(multiproc_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
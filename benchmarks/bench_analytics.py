@@ -0,0 +1,103 @@
+"""Latency of ``GET /applications/analytics`` over ten years of history.
+
+Seeds ``--users`` users with :mod:`benchmarks.datagen`, spreading their
+applications and follow-ups over ``--years`` years, then asks for the whole
+history by week and by month, and for the last year by day, as random users.
+Each request is timed twice: cold (the analytics cache emptied first, so the
+database aggregates) and warm (answered from the cache). Latencies through
+the ASGI app are reported as percentiles.
+
+By default the data goes to a temporary SQLite file; pass ``--url`` to run
+against PostgreSQL. The database is wiped first.
+
+Usage::
+
+    python -m benchmarks.bench_analytics --users 500 --years 10
+    python -m benchmarks.bench_analytics --url postgresql+psycopg://u:p@localhost/bench
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# datagen's fixed "today", so every run asks for the same ranges
+TODAY = date(2026, 1, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url", help="sync SQLAlchemy URL to fill (default: temporary SQLite file)"
+    )
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="requests per query kind")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        url = args.url or f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        os.environ["DATABASE_URL"] = url
+        import httpx
+
+        from app.api.analytics import analytics_cache
+        from app.core.security import create_access_token
+        from app.db import session as db_session
+        from app.main import app
+        from benchmarks.datagen import email_for, generate
+
+        logging.getLogger().setLevel(logging.WARNING)
+        start = time.perf_counter()
+        profile = generate(url, args.users, today=TODAY, history_days=365 * args.years)
+        print(
+            f"seeded {profile.applications} applications and {profile.followups} follow-ups "
+            f"over {args.years} years for {profile.users} users "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        tokens = [
+            {"Authorization": f"Bearer {create_access_token(email_for(n))}"} for n in range(args.users)
+        ]
+        history_start = TODAY - timedelta(days=365 * args.years)
+        queries = {
+            "week": {"bucket": "week", "start": history_start.isoformat(), "end": TODAY.isoformat()},
+            "month": {"bucket": "month", "start": history_start.isoformat(), "end": TODAY.isoformat()},
+            "day/1y": {
+                "bucket": "day",
+                "start": (TODAY - timedelta(days=365)).isoformat(),
+                "end": TODAY.isoformat(),
+            },
+        }
+
+        async def run() -> None:
+            rng = random.Random(1)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                print(f"{'query':<8} {'cache':<5} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}")
+                for kind, params in queries.items():
+                    latencies: dict[str, list[float]] = {"cold": [], "warm": []}
+                    for _ in range(args.requests):
+                        headers = rng.choice(tokens)
+                        analytics_cache.clear()
+                        for cache in ("cold", "warm"):
+                            t0 = time.perf_counter()
+                            r = await client.get("/applications/analytics", params=params, headers=headers)
+                            latencies[cache].append(time.perf_counter() - t0)
+                            r.raise_for_status()
+                    for cache, samples in latencies.items():
+                        p = [q * 1000 for q in statistics.quantiles(samples, n=100)]
+                        print(f"{kind:<8} {cache:<5} {p[49]:>7.2f} {p[94]:>7.2f} {p[98]:>7.2f}")
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
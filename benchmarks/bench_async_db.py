@@ -0,0 +1,162 @@
+"""Compare the sync (threadpool) and async DB paths at equal concurrency.
+
+Both endpoints run the same ``list_applications`` query for a single seeded
+owner; the only difference is whether the handler is a ``def`` backed by a
+``Session`` or an ``async def`` backed by an ``AsyncSession``. Requests are
+driven in-process through ``httpx.ASGITransport`` so no network noise is
+included.
+
+Usage::
+
+    python -m benchmarks.bench_async_db --requests 2000 --concurrency 64
+    python -m benchmarks.bench_async_db --url postgresql+psycopg://u:p@localhost/bench
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models  # noqa: F401
+from app.core.config import Settings
+from app.db.base import Base
+from app.models.application import Application
+from app.models.company import Company
+from app.models.user import User
+
+
+def seed(url: str, rows: int) -> int:
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = User(email="bench@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        company = Company(name="Bench Corp", owner_id=user.id)
+        db.add(company)
+        db.flush()
+        db.add_all(
+            Application(position=f"Role {i}", status="applied", company_id=company.id, owner_id=user.id)
+            for i in range(rows)
+        )
+        db.commit()
+        owner_id = user.id
+    engine.dispose()
+    return owner_id
+
+
+def build_app(sync_url: str, async_url: str, owner_id: int) -> FastAPI:
+    sync_engine = create_engine(sync_url)
+    async_engine = create_async_engine(async_url)
+    SyncSession = sessionmaker(bind=sync_engine, expire_on_commit=False)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    query = (
+        select(Application.id, Application.position, Application.status)
+        .where(Application.owner_id == owner_id)
+        .order_by(Application.id)
+        .limit(20)
+    )
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_list(db: Session = Depends(get_sync_db)):
+        return [dict(row._mapping) for row in db.execute(query)]
+
+    @app.get("/async")
+    async def async_list(db: AsyncSession = Depends(get_async_db)):
+        return [dict(row._mapping) for row in await db.execute(query)]
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with sem:
+                start = time.perf_counter()
+                r = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                r.raise_for_status()
+
+        # warm up connections and the threadpool before timing
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "path": path,
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[math.ceil(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="sync SQLAlchemy URL (defaults to a temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--threadpool",
+        type=int,
+        default=None,
+        help="override AnyIO's threadpool size (default 40) to mimic a constrained worker",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_url = args.url or f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        async_url = Settings(DATABASE_URL=sync_url).async_database_url
+        owner_id = seed(sync_url, args.rows)
+        app = build_app(sync_url, async_url, owner_id)
+
+        async def run() -> list[dict]:
+            if args.threadpool:
+                anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+            return [
+                await drive(app, path, args.requests, args.concurrency)
+                for path in ("/sync", "/async")
+            ]
+
+        results = asyncio.run(run())
+
+    print(f"requests={args.requests} concurrency={args.concurrency} rows={args.rows}")
+    for res in results:
+        print(f"{res['path']:<7} {res['rps']:>9.1f} req/s  p50={res['p50_ms']:.2f}ms  p99={res['p99_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Rows per second through the single-item and bulk create endpoints.
+
+Creates ``--rows`` applications and as many follow-ups for one user, first
+with one ``POST`` per row and then with ``POST /.../bulk`` in batches of
+``--batch``. Each single-item request does its own ownership query, counter
+update and commit; a bulk request does one of each for the whole batch.
+
+Usage::
+
+    python -m benchmarks.bench_bulk --rows 5000 --batch 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+async def register(client) -> dict:
+    creds = {"email": "bulk@example.com", "password": "password123"}
+    (await client.post("/auth/register", json=creds)).raise_for_status()
+    r = await client.post("/auth/login", data={"username": creds["email"], "password": creds["password"]})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def single(client, path: str, items: list[dict], headers: dict) -> list[int]:
+    ids = []
+    for item in items:
+        r = await client.post(path, json=item, headers=headers)
+        r.raise_for_status()
+        ids.append(r.json()["id"])
+    return ids
+
+
+async def bulk(client, path: str, items: list[dict], headers: dict, batch: int) -> list[int]:
+    ids = []
+    for start in range(0, len(items), batch):
+        r = await client.post(path, json=items[start : start + batch], headers=headers)
+        r.raise_for_status()
+        body = r.json()
+        assert not body["errors"], body["errors"][:3]
+        ids.extend(row["id"] for row in body["created"])
+    return ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        import httpx
+
+        from app.db import session as db_session
+        from app.db.base import Base
+        from app.main import app
+
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        Base.metadata.create_all(db_session.engine)
+
+        async def run() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                headers = await register(client)
+                r = await client.post("/companies/", json={"name": "Bulk Corp"}, headers=headers)
+                company_id = r.json()["id"]
+                apps = [{"position": f"Role {i}", "company_id": company_id} for i in range(args.rows)]
+
+                print(f"rows={args.rows} batch={args.batch}")
+                print(f"{'endpoint':<14} {'mode':<7} {'seconds':>8} {'rows/s':>10}")
+                for mode in ("single", "bulk"):
+                    start = time.perf_counter()
+                    if mode == "single":
+                        app_ids = await single(client, "/applications/", apps, headers)
+                    else:
+                        app_ids = await bulk(client, "/applications/bulk", apps, headers, args.batch)
+                    elapsed = time.perf_counter() - start
+                    print(f"{'applications':<14} {mode:<7} {elapsed:>8.2f} {args.rows / elapsed:>10.0f}")
+
+                    notes = [{"application_id": a, "note": f"note {a}"} for a in app_ids]
+                    start = time.perf_counter()
+                    if mode == "single":
+                        await single(client, "/followups/", notes, headers)
+                    else:
+                        await bulk(client, "/followups/bulk", notes, headers, args.batch)
+                    elapsed = time.perf_counter() - start
+                    print(f"{'followups':<14} {mode:<7} {elapsed:>8.2f} {args.rows / elapsed:>10.0f}")
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Delete latency against the number of rows a delete cascades to.
+
+For each size in ``--sizes`` seeds a company with that many applications,
+each with ``--notes`` follow-ups, then times ``DELETE /applications/{id}``
+on one of them and ``DELETE /companies/{id}`` on the whole company. With
+``ON DELETE CASCADE`` each is a single statement, so the time grows with
+the rows the database removes rather than with ORM round trips.
+
+Usage::
+
+    python -m benchmarks.bench_delete --sizes 10,100,1000,5000 --notes 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+async def register(client) -> dict:
+    creds = {"email": "delete@example.com", "password": "password123"}
+    (await client.post("/auth/register", json=creds)).raise_for_status()
+    r = await client.post("/auth/login", data={"username": creds["email"], "password": creds["password"]})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def bulk(client, path: str, items: list[dict], headers: dict, batch: int) -> list[int]:
+    ids = []
+    for start in range(0, len(items), batch):
+        r = await client.post(path, json=items[start : start + batch], headers=headers)
+        r.raise_for_status()
+        ids.extend(row["id"] for row in r.json()["created"])
+    return ids
+
+
+async def seed(client, headers: dict, size: int, notes: int, batch: int) -> tuple[int, list[int]]:
+    r = await client.post("/companies/", json={"name": f"Delete Corp {size}"}, headers=headers)
+    r.raise_for_status()
+    company_id = r.json()["id"]
+    apps = [{"position": f"Role {i}", "company_id": company_id} for i in range(size)]
+    app_ids = await bulk(client, "/applications/bulk", apps, headers, batch)
+    followups = [{"application_id": a, "note": f"note {n}"} for a in app_ids for n in range(notes)]
+    await bulk(client, "/followups/bulk", followups, headers, batch)
+    return company_id, app_ids
+
+
+async def timed_delete(client, path: str, headers: dict) -> float:
+    start = time.perf_counter()
+    r = await client.delete(path, headers=headers)
+    elapsed = time.perf_counter() - start
+    assert r.status_code == 204, r.text
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,5000", help="applications per company")
+    parser.add_argument("--notes", type=int, default=5, help="follow-ups per application")
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        import httpx
+
+        from app.db import session as db_session
+        from app.db.base import Base
+        from app.main import app
+
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        Base.metadata.create_all(db_session.engine)
+
+        async def run() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                headers = await register(client)
+                print(f"notes per application={args.notes}")
+                print(f"{'applications':>12} {'rows':>8} {'app delete ms':>14} {'company delete ms':>18}")
+                for size in sizes:
+                    company_id, app_ids = await seed(client, headers, size, args.notes, args.batch)
+                    app_ms = await timed_delete(client, f"/applications/{app_ids[0]}", headers) * 1000
+                    company_ms = await timed_delete(client, f"/companies/{company_id}", headers) * 1000
+                    rows = size * (1 + args.notes)
+                    print(f"{size:>12} {rows:>8} {app_ms:>14.1f} {company_ms:>18.1f}")
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
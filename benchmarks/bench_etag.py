@@ -0,0 +1,134 @@
+"""Polling cost with and without ``If-None-Match``.
+
+Seeds one user with ``--rows`` applications (and a follow-up for every tenth)
+in a temporary SQLite file and polls the list and dashboard endpoints the
+way the web client does. ``full`` sends no validator and gets the whole
+page each time; ``304`` sends the ETag from the first response, so only the
+data version is read and no body is produced.
+
+Usage::
+
+    python -m benchmarks.bench_etag --rows 5000 --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+PATHS = ("/applications/?limit=100", "/companies/", "/applications/dashboard/summary")
+
+
+def seed(url: str, rows: int) -> str:
+    from sqlalchemy import create_engine, insert, select
+
+    from app.db import counters
+    from app.db.base import Base
+    from app.models.application import Application
+    from app.models.company import Company
+    from app.models.followup import FollowUp
+    from app.models.user import User
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    email = "bench@example.com"
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(email=email, hashed_password="x", is_active=True).returning(User.id)
+        ).scalar_one()
+        company_ids = conn.execute(
+            insert(Company).returning(Company.id),
+            [{"name": f"Bench Corp {i}", "owner_id": user_id} for i in range(20)],
+        ).scalars().all()
+        statuses = ("applied", "interview", "offer", "rejected")
+        conn.execute(
+            insert(Application),
+            [
+                {
+                    "position": f"Role {i}",
+                    "status": statuses[i % 4],
+                    "applied_at": date(2020, 1, 1) + timedelta(days=i % 1500),
+                    "company_id": company_ids[i % len(company_ids)],
+                    "owner_id": user_id,
+                }
+                for i in range(rows)
+            ],
+        )
+        app_ids = conn.execute(select(Application.id).where(Application.owner_id == user_id)).scalars().all()
+        conn.execute(
+            insert(FollowUp),
+            [{"application_id": a, "owner_id": user_id, "note": "ping"} for a in app_ids[::10]],
+        )
+    with engine.begin() as conn:
+        counters.repair(conn)
+    engine.dispose()
+    return email
+
+
+async def drive(client, path: str, headers: dict, requests: int, concurrency: int, expect: int) -> list[float]:
+    samples: list[float] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            r = await client.get(path, headers=headers)
+            samples.append(time.perf_counter() - start)
+            assert r.status_code == expect, r.status_code
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        url = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        os.environ["DATABASE_URL"] = url
+        import httpx
+
+        from app.core.security import create_access_token
+        from app.db import session as db_session
+        from app.main import app
+
+        logging.getLogger().setLevel(logging.WARNING)
+        email = seed(url, args.rows)
+        headers = {"Authorization": f"Bearer {create_access_token(email)}"}
+
+        async def run() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                print(f"rows={args.rows} requests={args.requests} concurrency={args.concurrency}")
+                print(f"{'endpoint':<32} {'mode':<5} {'req/s':>7} {'p50 ms':>7} {'bytes':>7}")
+                for path in PATHS:
+                    first = await client.get(path, headers=headers)
+                    first.raise_for_status()
+                    conditional = {**headers, "If-None-Match": first.headers["etag"]}
+                    for mode, h, expect in (("full", headers, 200), ("304", conditional, 304)):
+                        start = time.perf_counter()
+                        samples = await drive(client, path, h, args.requests, args.concurrency, expect)
+                        rate = args.requests / (time.perf_counter() - start)
+                        size = len(first.content) if expect == 200 else 0
+                        p50 = statistics.median(samples) * 1000
+                        print(f"{path:<32} {mode:<5} {rate:>7.0f} {p50:>7.2f} {size:>7}")
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Log throughput and /health latency with the inline and queued handlers.
+
+``throughput`` logs ``--records`` JSON lines to a file from the calling
+thread and reports how fast the caller gets through them and how long the
+output takes to drain. It compares the old inline ``StreamHandler`` with
+``QueuedHandler``, with stdlib ``json`` and with ``orjson`` when installed.
+
+``latency`` serves ``/health`` (which logs on every call) while stdout is a
+slow pipe, simulated by a stream whose writes take ``--write-ms``. With the
+inline handler every probe waits for the write; the queued handler with the
+default ``LOG_RATE_LIMITS`` takes the write off the request path.
+
+Usage::
+
+    python -m benchmarks.bench_logging --records 200000 --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import logging
+import math
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+class SlowStream(io.TextIOBase):
+    def __init__(self, write_seconds: float) -> None:
+        self.write_seconds = write_seconds
+        self.writes = 0
+
+    def write(self, s: str) -> int:
+        # stands in for a full pipe to a log shipper
+        time.sleep(self.write_seconds)
+        self.writes += 1
+        return len(s)
+
+
+def install(handler: logging.Handler) -> None:
+    from app.core.logging import JsonFormatter
+
+    handler.setFormatter(JsonFormatter())
+    root = logging.getLogger()
+    for old in root.handlers:
+        old.close()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+
+
+def throughput(records: int, tmp: str) -> None:
+    from app.core import logging as app_logging
+    from app.core.logging import QueuedHandler
+
+    fast = app_logging.orjson
+    variants = [("inline", "json"), ("queued", "json")]
+    if fast is not None:
+        variants += [("inline", "orjson"), ("queued", "orjson")]
+    logger = logging.getLogger("bench.throughput")
+    print(f"{'handler':<8} {'encoder':<7} {'caller rec/s':>13} {'drained rec/s':>14} {'dropped':>8}")
+    for handler_name, encoder in variants:
+        app_logging.orjson = fast if encoder == "orjson" else None
+        out = open(Path(tmp) / f"{handler_name}-{encoder}.log", "w")
+        if handler_name == "inline":
+            handler = logging.StreamHandler(out)
+        else:
+            handler = QueuedHandler(out, max_queue=records, batch_size=256)
+        install(handler)
+        start = time.perf_counter()
+        for i in range(records):
+            logger.info("record %d of %s", i, "bench")
+        caller = time.perf_counter() - start
+        handler.flush(timeout=600) if handler_name == "queued" else handler.flush()
+        drained = time.perf_counter() - start
+        dropped = getattr(handler, "dropped", 0)
+        print(f"{handler_name:<8} {encoder:<7} {records / caller:>13.0f} {records / drained:>14.0f} {dropped:>8}")
+        handler.close()
+        out.close()
+    app_logging.orjson = fast
+
+
+async def probe(app, requests: int, concurrency: int) -> list[float]:
+    import httpx
+
+    samples: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                r = await client.get("/health")
+                samples.append(time.perf_counter() - start)
+                r.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def summarize(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p99 = samples[math.ceil(len(samples) * 0.99) - 1] * 1000
+    return f"p50={p50:7.2f}ms  p99={p99:7.2f}ms"
+
+
+def latency(requests: int, concurrency: int, write_ms: float) -> None:
+    from app.core.config import settings
+    from app.core.logging import QueuedHandler, RateLimitFilter
+    from app.db import session as db_session
+    from app.main import app
+
+    # the ASGI client logs every request at INFO; keep it out of the picture
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async def run() -> None:
+        print(f"/health x{requests}, concurrency={concurrency}, {write_ms}ms per write")
+        for name in ("inline", "queued"):
+            stream = SlowStream(write_ms / 1000)
+            if name == "inline":
+                handler = logging.StreamHandler(stream)
+            else:
+                handler = QueuedHandler(stream)
+                handler.addFilter(RateLimitFilter(settings.LOG_RATE_LIMITS))
+            install(handler)
+            await probe(app, 50, concurrency)  # warm-up
+            start = time.perf_counter()
+            samples = await probe(app, requests, concurrency)
+            rate = requests / (time.perf_counter() - start)
+            print(f"{name:<8} {summarize(samples)}  req/s={rate:7.0f}  writes={stream.writes}")
+            handler.close()
+        await db_session.async_engine.dispose()
+
+    asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--write-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        throughput(args.records, tmp)
+        print()
+        latency(args.requests, args.concurrency, args.write_ms)
+
+
+if __name__ == "__main__":
+    main()
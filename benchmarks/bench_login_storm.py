@@ -0,0 +1,139 @@
+"""Non-auth latency during a login storm, inline vs process-pool hashing.
+
+A probe calls ``GET /health`` back to back while ``--concurrency`` clients
+hammer ``POST /auth/login`` with valid credentials. Each login costs one Argon2
+verification. In ``inline`` mode the verification runs on the event loop,
+which was the old behaviour, and probe latency climbs with the storm. In
+``pool`` mode it runs in the password process pool and probe latency should
+stay close to the idle baseline.
+
+Usage::
+
+    python -m benchmarks.bench_login_storm --workers 4 --concurrency 32 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def seed(url: str, users: int) -> list[str]:
+    from sqlalchemy import create_engine, insert
+
+    from app.core.security import hash_password
+    from app.db.base import Base
+    from app.models.user import User
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    hashed = hash_password("password123")
+    emails = [f"storm-{i}@example.com" for i in range(users)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User), [{"email": e, "hashed_password": hashed, "is_active": True} for e in emails]
+        )
+    engine.dispose()
+    return emails
+
+
+def summarize(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p99 = samples[math.ceil(len(samples) * 0.99) - 1] * 1000
+    return f"n={len(samples):<6} p50={p50:7.2f}ms  p99={p99:7.2f}ms"
+
+
+async def probe(client, stop: asyncio.Event) -> list[float]:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        r = await client.get("/health")
+        samples.append(time.perf_counter() - start)
+        r.raise_for_status()
+        await asyncio.sleep(0.005)
+    return samples
+
+
+async def storm(client, emails: list[str], concurrency: int, stop: asyncio.Event) -> int:
+    # every email is used at most 5 times so the login throttle never kicks in
+    queue = [e for e in emails for _ in range(5)]
+    done = 0
+
+    async def worker() -> None:
+        nonlocal done
+        while queue and not stop.is_set():
+            email = queue.pop()
+            r = await client.post("/auth/login", data={"username": email, "password": "password123"})
+            r.raise_for_status()
+            done += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+        os.environ["PASSWORD_HASH_MAX_PENDING"] = str(args.concurrency * 2)
+        import httpx
+
+        from app.api.routers import auth
+        from app.core import security
+        from app.core.password_pool import password_pool
+        from app.db import session as db_session
+        from app.main import app
+
+        logging.getLogger().setLevel(logging.WARNING)
+        emails = seed(os.environ["DATABASE_URL"], args.users)
+        pooled_verify = auth.verify_password_async
+
+        async def inline_verify(password: str, hashed: str) -> bool:
+            return security.verify_password(password, hashed)
+
+        async def run_phase(name: str, with_storm: bool) -> None:
+            auth.login_limiter.reset()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                stop = asyncio.Event()
+                probe_task = asyncio.create_task(probe(client, stop))
+                storm_task = (
+                    asyncio.create_task(storm(client, emails, args.concurrency, stop)) if with_storm else None
+                )
+                await asyncio.sleep(args.seconds)
+                stop.set()
+                samples = await probe_task
+                logins = await storm_task if storm_task else 0
+            print(f"{name:<14} /health {summarize(samples)}  logins/s={logins / args.seconds:7.1f}")
+
+        async def run() -> None:
+            password_pool.start()
+            await run_phase("idle", with_storm=False)
+            auth.verify_password_async = inline_verify
+            await run_phase("storm inline", with_storm=True)
+            auth.verify_password_async = pooled_verify
+            await run_phase("storm pool", with_storm=True)
+            await db_session.async_engine.dispose()
+            password_pool.shutdown()
+
+        print(f"workers={args.workers} concurrency={args.concurrency} seconds={args.seconds}")
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
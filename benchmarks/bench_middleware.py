@@ -0,0 +1,114 @@
+"""Requests per second on ``/health`` with the old and new middleware stacks.
+
+``legacy`` is the previous setup: ``RequestIdMiddleware`` as a
+``BaseHTTPMiddleware`` plus an ``@app.middleware("http")`` metrics function.
+``asgi`` is ``ObservabilityMiddleware``. ``none`` has no middleware at all and
+shows the floor. All three serve the real ``/health`` handler against a
+temporary SQLite file, driven in-process through ``httpx.ASGITransport``.
+
+Usage::
+
+    python -m benchmarks.bench_middleware --requests 5000 --concurrency 16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+
+def build_app(stack: str):
+    from fastapi import FastAPI
+    from prometheus_client import CollectorRegistry, Counter
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from starlette.requests import Request
+
+    from app.core.logging import request_id_var
+    from app.main import health
+    from app.middleware.observability import ObservabilityMiddleware
+
+    app = FastAPI()
+    app.add_api_route("/health", health)
+    if stack == "asgi":
+        app.add_middleware(ObservabilityMiddleware)
+    elif stack == "legacy":
+
+        class RequestIdMiddleware(BaseHTTPMiddleware):
+            async def dispatch(self, request: Request, call_next):
+                request_id = request.headers.get("X-Request-Id", str(uuid.uuid4()))
+                request_id_var.set(request_id)
+                response = await call_next(request)
+                response.headers["X-Request-Id"] = request_id
+                return response
+
+        app.add_middleware(RequestIdMiddleware)
+        request_count = Counter(
+            "legacy_requests_total", "Total requests", ["method", "endpoint", "http_status"],
+            registry=CollectorRegistry(),
+        )
+
+        @app.middleware("http")
+        async def metrics_middleware(request: Request, call_next):
+            response = await call_next(request)
+            request_count.labels(request.method, request.url.path, response.status_code).inc()
+            return response
+
+    return app
+
+
+async def drive(app, requests: int, concurrency: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                r = await client.get("/health")
+                r.raise_for_status()
+
+        # warm-up, then the timed run
+        await client.get("/health")
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3, help="best of this many runs per stack")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        import app.main  # noqa: F401  (configures logging on import)
+        from app.db import session as db_session
+
+        # /health logs every call; keep the handler cost out of the comparison
+        logging.getLogger().setLevel(logging.WARNING)
+
+        async def run() -> None:
+            print(f"requests={args.requests} concurrency={args.concurrency}")
+            print(f"{'stack':<8} {'req/s':>9}")
+            for stack in ("none", "legacy", "asgi"):
+                stack_app = build_app(stack)
+                best = max([await drive(stack_app, args.requests, args.concurrency) for _ in range(args.rounds)])
+                print(f"{stack:<8} {best:>9.0f}")
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Page-N latency of ``GET /applications/`` with ``offset`` vs ``cursor``.
+
+Seeds one user with ``--rows`` applications in a temporary SQLite file, then
+requests a page at increasing depths. Offset pages get slower the deeper they
+are; cursor pages should stay flat because the database seeks straight to the
+last ``(order_by value, id)`` instead of discarding rows.
+
+Usage::
+
+    python -m benchmarks.bench_pagination --rows 100000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+
+def seed(url: str, rows: int) -> tuple[str, list[tuple]]:
+    from sqlalchemy import create_engine, insert, select
+
+    from app.api.pagination import keyset_order
+    from app.db.base import Base
+    from app.models.application import Application
+    from app.models.company import Company
+    from app.models.user import User
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    email = "bench@example.com"
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(email=email, hashed_password="x", is_active=True).returning(User.id)
+        ).scalar_one()
+        company_id = conn.execute(
+            insert(Company).values(name="Bench Corp", owner_id=user_id).returning(Company.id)
+        ).scalar_one()
+        start = date(2015, 1, 1)
+        conn.execute(
+            insert(Application),
+            [
+                {
+                    "position": f"Role {i}",
+                    "status": "applied",
+                    "applied_at": start + timedelta(days=i % 3650),
+                    "company_id": company_id,
+                    "owner_id": user_id,
+                }
+                for i in range(rows)
+            ],
+        )
+        # (applied_at, id) of every row in page order, used to build cursors
+        keys = conn.execute(
+            select(Application.applied_at, Application.id)
+            .where(Application.owner_id == user_id)
+            .order_by(*keyset_order(Application.applied_at, Application.id, False))
+        ).all()
+    engine.dispose()
+    return email, keys
+
+
+async def time_page(client, headers: dict, params: dict, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        r = await client.get("/applications/", params=params, headers=headers)
+        samples.append(time.perf_counter() - start)
+        r.raise_for_status()
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        import httpx
+
+        from app.api.pagination import encode_cursor
+        from app.core.security import create_access_token
+        from app.db import session as db_session
+        from app.main import app
+
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        email, keys = seed(os.environ["DATABASE_URL"], args.rows)
+        headers = {"Authorization": f"Bearer {create_access_token(email)}"}
+        depths = [d for d in (0, 1_000, 10_000, 50_000, args.rows - args.limit) if d < args.rows]
+
+        async def run() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                print(f"rows={args.rows} limit={args.limit} (median of {args.repeat})")
+                print(f"{'depth':>8} {'offset ms':>10} {'cursor ms':>10}")
+                for depth in depths:
+                    offset_ms = await time_page(
+                        client, headers, {"limit": args.limit, "offset": depth}, args.repeat
+                    )
+                    params = {"limit": args.limit}
+                    if depth:
+                        applied_at, last_id = keys[depth - 1]
+                        params["cursor"] = encode_cursor("applied_at", False, applied_at, last_id)
+                    cursor_ms = await time_page(client, headers, params, args.repeat)
+                    print(f"{depth:>8} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
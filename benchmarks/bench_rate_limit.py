@@ -0,0 +1,87 @@
+"""Login throttle throughput and memory over millions of distinct keys.
+
+Compares the old per-process ``dict[str, list[datetime]]`` throttle with the
+sliding-window-counter backends in ``app/core/rate_limit.py``. Every hit uses
+a new username and simulated time advances steadily across ``--windows``
+windows, like a credential-stuffing run cycling through an email list. Each
+phase runs in a forked child so its peak RSS is measured in isolation.
+
+Usage::
+
+    python -m benchmarks.bench_rate_limit --keys 2000000
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from app.core.rate_limit import MemoryRateLimiter, SqliteRateLimiter
+
+WINDOW = 60
+
+
+class LegacyLimiter:
+    """The previous implementation from app/api/routers/auth.py."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.attempts: dict[str, list] = {}
+
+    def hit(self, key: str, now: float) -> bool:
+        now_dt = datetime.fromtimestamp(now, UTC)
+        attempts = [t for t in self.attempts.get(key, []) if now_dt - t < timedelta(seconds=WINDOW)]
+        if len(attempts) >= self.limit:
+            return False
+        attempts.append(now_dt)
+        self.attempts[key] = attempts
+        return True
+
+    def __len__(self) -> int:
+        return len(self.attempts)
+
+
+def _phase(name: str, keys: int, windows: int, tmp: str, conn) -> None:
+    if name == "legacy":
+        limiter = LegacyLimiter(5)
+    elif name == "memory":
+        limiter = MemoryRateLimiter(5, WINDOW)
+    else:
+        limiter = SqliteRateLimiter(5, WINDOW, str(Path(tmp) / "throttle.sqlite3"))
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    step = windows * WINDOW / keys
+    t0 = 1_000_000.0
+    start = time.perf_counter()
+    for i in range(keys):
+        limiter.hit(f"user{i}@example.com", t0 + i * step)
+    elapsed = time.perf_counter() - start
+    rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024
+    conn.send((keys / elapsed, rss_mb, len(limiter)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=2_000_000)
+    parser.add_argument("--sqlite-keys", type=int, default=200_000, help="the sqlite backend is slower; use fewer keys")
+    parser.add_argument("--windows", type=int, default=10, help="simulated windows the run spans")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("fork")
+    print(f"{'backend':<8} {'keys':>10} {'hits/s':>12} {'peak RSS +MB':>13} {'keys kept':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("legacy", "memory", "sqlite"):
+            keys = args.sqlite_keys if name == "sqlite" else args.keys
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_phase, args=(name, keys, args.windows, tmp, child))
+            proc.start()
+            rate, rss_mb, kept = parent.recv()
+            proc.join()
+            print(f"{name:<8} {keys:>10} {rate:>12.0f} {rss_mb:>13.1f} {kept:>10}")
+
+
+if __name__ == "__main__":
+    main()
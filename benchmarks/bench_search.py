@@ -0,0 +1,185 @@
+"""Latency of ``GET /search`` over a large follow-up history.
+
+Seeds ``--users`` users sharing ``--notes`` follow-up notes (plus a few
+thousand applications and companies) built from a Zipf-like vocabulary, so
+some words occur in a large share of a user's notes and most are rare. Then
+searches as random users with three kinds of query: a rare word, a common
+word, and two words together. Each query's latency through the ASGI app is
+reported as percentiles along with the average number of hits on the first
+page.
+
+By default the data goes to a temporary SQLite file (FTS5); pass ``--url``
+to run against PostgreSQL (GIN ``tsvector`` indexes). The database is wiped
+first.
+
+Usage::
+
+    python -m benchmarks.bench_search --notes 1000000 --users 100
+    python -m benchmarks.bench_search --url postgresql+psycopg://u:p@localhost/bench
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+VOCABULARY = 5_000
+BATCH = 10_000
+NAMES = ("dana", "miguel", "priya", "olek", "sven", "amara", "kenji", "lucia", "tomas", "noor")
+
+
+def words(rng: random.Random) -> list[str]:
+    # deterministic pseudo-words, so a seed is the same data everywhere
+    letters = "bcdfghjklmnprstvz"
+    vowels = "aeiou"
+    return [
+        "".join(rng.choice(letters) + rng.choice(vowels) for _ in range(rng.randint(2, 4)))
+        for _ in range(VOCABULARY)
+    ]
+
+
+def seed(url: str, users: int, notes: int, seed: int = 0) -> dict[str, list[str]]:
+    """Fill the database at ``url``; returns sample query words by kind."""
+    from sqlalchemy import create_engine, insert
+
+    from app.db.base import Base
+    from app.models.application import Application
+    from app.models.company import Company
+    from app.models.followup import FollowUp
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    vocabulary = words(rng)
+    # word i is drawn with weight 1/(i+1)
+    weights = [1 / (i + 1) for i in range(VOCABULARY)]
+    apps_per_user = 50
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "id": u + 1,
+                    "email": f"search-{u}@example.com",
+                    "hashed_password": "x",
+                    "is_active": True,
+                }
+                for u in range(users)
+            ],
+        )
+        conn.execute(
+            insert(Company),
+            [
+                {
+                    "id": u * 10 + c + 1,
+                    "name": f"{rng.choice(vocabulary)} {u}-{c}",
+                    "owner_id": u + 1,
+                }
+                for u in range(users)
+                for c in range(10)
+            ],
+        )
+        conn.execute(
+            insert(Application),
+            [
+                {
+                    "id": u * apps_per_user + a + 1,
+                    "position": f"{rng.choice(vocabulary)} engineer",
+                    "status": "applied",
+                    "company_id": u * 10 + a % 10 + 1,
+                    "owner_id": u + 1,
+                }
+                for u in range(users)
+                for a in range(apps_per_user)
+            ],
+        )
+        for start in range(0, notes, BATCH):
+            batch = []
+            for _ in range(min(BATCH, notes - start)):
+                owner = rng.randrange(users)
+                text = rng.choices(vocabulary, weights, k=rng.randint(6, 12))
+                if rng.random() < 0.2:
+                    text.insert(rng.randrange(len(text)), f"recruiter {rng.choice(NAMES)}")
+                batch.append(
+                    {
+                        "application_id": owner * apps_per_user + rng.randrange(apps_per_user) + 1,
+                        "owner_id": owner + 1,
+                        "note": " ".join(text),
+                    }
+                )
+            conn.execute(insert(FollowUp), batch)
+    engine.dispose()
+    return {
+        "rare": vocabulary[VOCABULARY // 2 :],
+        "common": vocabulary[:5],
+        "two words": [f"recruiter {name}" for name in NAMES],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url", help="sync SQLAlchemy URL to fill (default: temporary SQLite file)"
+    )
+    parser.add_argument("--notes", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200, help="searches per query kind")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        url = args.url or f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        os.environ["DATABASE_URL"] = url
+        import httpx
+
+        from app.core.security import create_access_token
+        from app.db import session as db_session
+        from app.main import app
+
+        logging.getLogger().setLevel(logging.WARNING)
+        start = time.perf_counter()
+        queries = seed(url, args.users, args.notes)
+        elapsed = time.perf_counter() - start
+        print(f"seeded {args.notes} notes for {args.users} users in {elapsed:.1f}s")
+        tokens = [
+            {"Authorization": f"Bearer {create_access_token(f'search-{u}@example.com')}"}
+            for u in range(args.users)
+        ]
+
+        async def run() -> None:
+            rng = random.Random(1)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                print(f"{'query':<10} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'hits':>5}")
+                for kind, samples in queries.items():
+                    latencies, hits = [], []
+                    for _ in range(args.queries):
+                        q = rng.choice(samples)
+                        t0 = time.perf_counter()
+                        r = await client.get(
+                            "/search/", params={"q": q}, headers=rng.choice(tokens)
+                        )
+                        latencies.append(time.perf_counter() - t0)
+                        r.raise_for_status()
+                        hits.append(len(r.json()))
+                    p = [q * 1000 for q in statistics.quantiles(latencies, n=100)]
+                    print(
+                        f"{kind:<10} {p[49]:>7.2f} {p[94]:>7.2f} {p[98]:>7.2f} "
+                        f"{statistics.mean(hits):>5.1f}"
+                    )
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""List-endpoint serialization: per-object validation vs pre-encoded rows.
+
+``per-object`` is how the list endpoints used to answer: load ORM objects and
+let FastAPI validate each one into ``ApplicationOut`` (``response_model``)
+before encoding. ``rows`` is the current path: select the schema's columns
+as Core rows and encode them with :class:`app.api.responses.RowSerializer`.
+
+The first table times only fetch + encode of one page on a sync connection;
+the second serves ``--limit``-row pages of ``GET /applications/`` through
+``httpx.ASGITransport`` next to a copy of the old handler mounted at
+``/legacy/applications``.
+
+Usage::
+
+    python -m benchmarks.bench_serialization --rows 5000 --limit 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+
+def seed(url: str, rows: int) -> tuple[str, int]:
+    from sqlalchemy import create_engine, insert
+
+    from app.db.base import Base
+    from app.models.application import Application
+    from app.models.company import Company
+    from app.models.user import User
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    email = "bench@example.com"
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User).values(email=email, hashed_password="x", is_active=True).returning(User.id)
+        ).scalar_one()
+        company_id = conn.execute(
+            insert(Company).values(name="Bench Corp", owner_id=user_id).returning(Company.id)
+        ).scalar_one()
+        statuses = ("applied", "interview", "offer", "rejected")
+        conn.execute(
+            insert(Application),
+            [
+                {
+                    "position": f"Role {i}",
+                    "status": statuses[i % 4],
+                    "applied_at": date(2020, 1, 1) + timedelta(days=i % 1500),
+                    "company_id": company_id,
+                    "owner_id": user_id,
+                }
+                for i in range(rows)
+            ],
+        )
+    engine.dispose()
+    return email, user_id
+
+
+def encode_only(url: str, user_id: int, limit: int, number: int) -> None:
+    from pydantic import TypeAdapter
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.api.routers.applications import application_rows
+    from app.models.application import Application
+    from app.schemas.application import ApplicationOut
+
+    engine = create_engine(url)
+    # what FastAPI builds for response_model=list[ApplicationOut]
+    adapter = TypeAdapter(list[ApplicationOut])
+    page = select(Application).where(Application.owner_id == user_id).order_by(Application.id).limit(limit)
+    row_page = (
+        select(*application_rows.columns(Application))
+        .where(Application.owner_id == user_id)
+        .order_by(Application.id)
+        .limit(limit)
+    )
+    with Session(engine) as session:
+
+        def per_object() -> bytes:
+            session.expunge_all()
+            return adapter.dump_json(adapter.validate_python(session.scalars(page).all()))
+
+        def rows() -> bytes:
+            return application_rows.dump_json(session.execute(row_page).all())
+
+        assert per_object() == rows()
+        print(f"fetch + encode one {limit}-row page (best of 5 x {number})")
+        print(f"{'path':<11} {'us/page':>9}")
+        for name, fn in (("per-object", per_object), ("rows", rows)):
+            best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+            print(f"{name:<11} {best * 1e6:>9.0f}")
+    engine.dispose()
+
+
+def add_legacy_route(app) -> None:
+    from fastapi import Depends
+    from fastapi.datastructures import Default
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import select
+
+    from app.core.deps import get_current_user, get_db
+    from app.models.application import Application
+    from app.schemas.application import ApplicationOut
+
+    async def legacy_list(limit: int = 20, db=Depends(get_db), user=Depends(get_current_user)):
+        query = select(Application).where(Application.owner_id == user.id).order_by(Application.id)
+        return (await db.scalars(query.limit(limit))).all()
+
+    # Default(...) keeps FastAPI's own serialize-to-bytes path, as before
+    app.add_api_route(
+        "/legacy/applications",
+        legacy_list,
+        response_model=list[ApplicationOut],
+        response_class=Default(JSONResponse),
+    )
+
+
+async def drive(client, path: str, headers: dict, limit: int, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            r = await client.get(path, params={"limit": limit}, headers=headers)
+            r.raise_for_status()
+
+    await client.get(path, params={"limit": limit}, headers=headers)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--number", type=int, default=500, help="pages per timing in the encode-only table")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3, help="best of this many runs per endpoint")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        url = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        os.environ["DATABASE_URL"] = url
+        import httpx
+
+        from app.core.security import create_access_token
+        from app.db import session as db_session
+        from app.main import app
+
+        logging.getLogger().setLevel(logging.WARNING)
+        email, user_id = seed(url, args.rows)
+        encode_only(url, user_id, args.limit, args.number)
+        add_legacy_route(app)
+        headers = {"Authorization": f"Bearer {create_access_token(email)}"}
+
+        async def run() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                print()
+                print(f"GET with limit={args.limit}, requests={args.requests} concurrency={args.concurrency}")
+                print(f"{'endpoint':<22} {'req/s':>8}")
+                for path in ("/legacy/applications", "/applications/"):
+                    best = max(
+                        [
+                            await drive(client, path, headers, args.limit, args.requests, args.concurrency)
+                            for _ in range(args.rounds)
+                        ]
+                    )
+                    print(f"{path:<22} {best:>8.0f}")
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
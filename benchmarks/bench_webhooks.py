@@ -0,0 +1,230 @@
+"""Webhook outbox: cost on the write path and delivery throughput.
+
+Everything runs in one process against a temporary SQLite file, with a
+local asyncio HTTP receiver standing in for users' endpoints.
+
+``write path``: ``PATCH /applications/{id}`` latency for a user with no
+webhook endpoints, with one, and with ``WEBHOOK_MAX_ENDPOINTS``. The
+difference is what writing the outbox rows adds. ``inline`` is the
+no-endpoint PATCH followed by one POST to the receiver, which is what
+calling the webhook from the handler would cost (with ``--delay-ms`` of
+simulated endpoint latency).
+
+``delivery``: ``--events`` queued events spread over ``--endpoints``
+endpoints, drained by one ``WebhookDispatcher`` with ``--concurrency``
+requests in flight. Reports deliveries per second.
+
+Usage::
+
+    python -m benchmarks.bench_webhooks --requests 1000 --events 20000
+    python -m benchmarks.bench_webhooks --events 20000 --delay-ms 50 --concurrency 64
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+BATCH = 10_000
+
+
+class Receiver:
+    """Minimal keep-alive HTTP/1.1 server answering every POST with 204."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.received = 0
+        self.server: asyncio.Server | None = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = re.search(rb"(?i)content-length: *(\d+)", head)
+                await reader.readexactly(int(length.group(1)) if length else 0)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                self.received += 1
+                writer.write(b"HTTP/1.1 204 No Content\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def seed(url: str, receiver_url: str, max_endpoints: int) -> dict[int, tuple[str, int]]:
+    """One user per endpoint count, each with one application; returns {endpoints: (email, app id)}."""
+    from sqlalchemy import create_engine, insert
+
+    from app.db import counters
+    from app.db.base import Base
+    from app.models.application import Application
+    from app.models.company import Company
+    from app.models.user import User
+    from app.models.webhook import WebhookEndpoint
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    users = {}
+    with engine.begin() as conn:
+        for endpoints in sorted({0, 1, max_endpoints}):
+            email = f"bench-{endpoints}@example.com"
+            user_id = conn.execute(
+                insert(User).values(email=email, hashed_password="x").returning(User.id)
+            ).scalar_one()
+            company_id = conn.execute(
+                insert(Company).values(name=f"Bench {endpoints}", owner_id=user_id).returning(Company.id)
+            ).scalar_one()
+            app_id = conn.execute(
+                insert(Application)
+                .values(position="Engineer", company_id=company_id, owner_id=user_id)
+                .returning(Application.id)
+            ).scalar_one()
+            for i in range(endpoints):
+                conn.execute(
+                    insert(WebhookEndpoint).values(
+                        url=f"{receiver_url}/write/{i}", secret="s" * 64, owner_id=user_id
+                    )
+                )
+            users[endpoints] = (email, app_id)
+        counters.repair(conn)
+    engine.dispose()
+    return users
+
+
+def seed_outbox(url: str, receiver_url: str, events: int, endpoints: int) -> None:
+    from sqlalchemy import create_engine, delete, insert, select
+
+    from app.models.user import User
+    from app.models.webhook import OutboxEvent, WebhookEndpoint
+
+    payload = json.dumps(
+        {"id": 1, "position": "Engineer", "status": "interview", "applied_at": "2026-01-01", "company_id": 1}
+    )
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        # only the queued events below are measured
+        conn.execute(delete(OutboxEvent))
+        owner_id = conn.execute(select(User.id).limit(1)).scalar_one()
+        endpoint_ids = conn.execute(
+            insert(WebhookEndpoint).returning(WebhookEndpoint.id),
+            [{"url": f"{receiver_url}/drain/{i}", "secret": "s" * 64, "owner_id": owner_id} for i in range(endpoints)],
+        ).scalars().all()
+        for start in range(0, events, BATCH):
+            conn.execute(
+                insert(OutboxEvent),
+                [
+                    {"endpoint_id": endpoint_ids[i % endpoints], "event": "application.updated", "payload": payload}
+                    for i in range(start, min(start + BATCH, events))
+                ],
+            )
+    engine.dispose()
+
+
+async def patch_latency(client, headers: dict, app_id: int, requests: int, after=None) -> list[float]:
+    samples = []
+    for i in range(requests):
+        status = ("interview", "applied")[i % 2]
+        start = time.perf_counter()
+        r = await client.patch(f"/applications/{app_id}", json={"status": status}, headers=headers)
+        if after is not None:
+            await after()
+        samples.append(time.perf_counter() - start)
+        assert r.status_code == 200, r.status_code
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="PATCHes per write-path mode")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--endpoints", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="receiver latency per request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # must be set before the app (and its engines) are imported
+        url = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        os.environ["DATABASE_URL"] = url
+        # the receiver listens on localhost
+        os.environ["WEBHOOK_ALLOW_PRIVATE_TARGETS"] = "true"
+        import httpx
+
+        from app.core.config import settings
+        from app.core.security import create_access_token
+        from app.core.webhooks import WebhookDispatcher
+        from app.db import session as db_session
+        from app.main import app
+
+        logging.getLogger().setLevel(logging.ERROR)
+
+        async def run() -> None:
+            receiver = Receiver(args.delay_ms / 1000)
+            receiver_url = await receiver.start()
+            users = seed(url, receiver_url, settings.WEBHOOK_MAX_ENDPOINTS)
+
+            print(f"write path: {args.requests} PATCHes each, receiver delay {args.delay_ms:.0f} ms")
+            print(f"{'mode':<16} {'p50 ms':>7} {'p99 ms':>7} {'outbox rows':>12}")
+            transport = httpx.ASGITransport(app=app)
+            async with (
+                httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+                httpx.AsyncClient() as outbound,
+            ):
+                modes = [(f"{n} endpoints", n, None) for n in users]
+
+                async def inline() -> None:
+                    (await outbound.post(f"{receiver_url}/inline", content=b"{}")).raise_for_status()
+
+                modes.append(("inline webhook", 0, inline))
+                for name, endpoints, after in modes:
+                    email, app_id = users[endpoints]
+                    headers = {"Authorization": f"Bearer {create_access_token(email)}"}
+                    samples = sorted(await patch_latency(client, headers, app_id, args.requests, after))
+                    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+                    rows = args.requests * endpoints
+                    print(f"{name:<16} {statistics.median(samples) * 1000:>7.2f} {p99:>7.2f} {rows:>12}")
+
+            seed_outbox(url, receiver_url, args.events, args.endpoints)
+            dispatcher = WebhookDispatcher(
+                args.batch, args.concurrency, 10.0, 120.0, 8, 5.0, 3600.0, 1.0
+            )
+            received = receiver.received
+            start = time.perf_counter()
+            while await dispatcher.run_once():
+                pass
+            elapsed = time.perf_counter() - start
+            await dispatcher.aclose()
+            delivered = receiver.received - received
+            print()
+            print(
+                f"delivery: {args.events} events to {args.endpoints} endpoints, "
+                f"concurrency={args.concurrency} batch={args.batch}"
+            )
+            print(f"{delivered} delivered in {elapsed:.2f}s: {delivered / elapsed:,.0f} deliveries/s")
+            await receiver.stop()
+            await db_session.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Deterministic test data for load tests.
+
+Creates ``--users`` users with a realistic spread of data: most users track
+a few dozen applications across somewhat fewer companies, and a long tail
+tracks hundreds. Statuses follow a typical funnel (most applications stay
+``applied``, few reach ``offer``), dates cover the last two years (or
+``--history-days``), and about a third of the applications have follow-ups.
+The same ``--seed`` always produces the same rows, so runs against different
+backends or commits see identical data.
+
+Every user is ``load-<n>@example.com`` with the password :data:`PASSWORD`.
+The hash is computed once and shared, so seeding is bound by inserts rather
+than Argon2.
+
+Usage::
+
+    python -m benchmarks.datagen --url sqlite:///./load.sqlite3 --users 200
+    python -m benchmarks.datagen --url postgresql+psycopg://u:p@localhost/load --users 1000
+
+The target database is wiped first.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as dt_time
+
+PASSWORD = "load-test-password"
+
+# application status funnel
+STATUS_WEIGHTS = {"applied": 0.55, "interview": 0.22, "rejected": 0.18, "offer": 0.05}
+POSITIONS = (
+    "Backend Engineer", "Frontend Engineer", "Data Engineer", "SRE", "Product Manager",
+    "Data Scientist", "QA Engineer", "Engineering Manager", "Mobile Developer", "Designer",
+)
+SENIORITY = ("Junior", "", "Senior", "Staff", "Lead")
+NOTES = (
+    "Sent thank-you email", "Recruiter call scheduled", "Asked for salary range",
+    "Take-home submitted", "Followed up on status", "Referred by a former colleague",
+)
+HISTORY_DAYS = 730
+INSERT_BATCH = 5_000
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Shape of the generated data set, kept in the results of a load run."""
+
+    users: int
+    seed: int
+    companies: int
+    applications: int
+    followups: int
+
+
+def email_for(n: int) -> str:
+    return f"load-{n:05d}@example.com"
+
+
+def _applications_per_user(rng: random.Random) -> int:
+    # log-normal: median ~30, long tail into the hundreds
+    return max(1, min(800, int(rng.lognormvariate(3.4, 0.9))))
+
+
+def _batches(rows: Iterator[dict], size: int = INSERT_BATCH) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(
+    url: str,
+    users: int,
+    seed: int = 0,
+    today: date | None = None,
+    history_days: int = HISTORY_DAYS,
+) -> Profile:
+    """Recreate the schema at ``url`` and fill it; returns the data set's shape."""
+    from sqlalchemy import create_engine, insert, text
+
+    from app.core.security import hash_password
+    from app.db import counters
+    from app.db.base import Base
+    from app.models.application import Application
+    from app.models.company import Company
+    from app.models.followup import FollowUp
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    # dates are relative to a fixed day so a seed means the same rows tomorrow
+    today = today or date(2026, 1, 1)
+    statuses, weights = zip(*STATUS_WEIGHTS.items(), strict=True)
+    hashed = hash_password(PASSWORD)
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    totals = {"companies": 0, "applications": 0, "followups": 0}
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"id": n + 1, "email": email_for(n), "hashed_password": hashed, "is_active": True}
+                for n in range(users)
+            ],
+        )
+
+        company_rows, app_rows = [], []
+        company_id = app_id = 0
+        for n in range(users):
+            owner_id = n + 1
+            n_apps = _applications_per_user(rng)
+            n_companies = max(1, min(n_apps, int(n_apps * rng.uniform(0.3, 0.8))))
+            first_company = company_id + 1
+            for c in range(n_companies):
+                company_id += 1
+                website = f"https://company-{owner_id}-{c}.example" if rng.random() < 0.7 else None
+                company_rows.append(
+                    {
+                        "id": company_id,
+                        "name": f"Company {owner_id}-{c}",
+                        "website": website,
+                        "owner_id": owner_id,
+                    }
+                )
+            for _ in range(n_apps):
+                app_id += 1
+                applied = today - timedelta(days=rng.randrange(history_days))
+                app_rows.append(
+                    {
+                        "id": app_id,
+                        "position": f"{rng.choice(SENIORITY)} {rng.choice(POSITIONS)}".strip(),
+                        "status": rng.choices(statuses, weights)[0],
+                        # a few legacy rows without a date
+                        "applied_at": applied if rng.random() < 0.97 else None,
+                        "company_id": rng.randint(first_company, company_id),
+                        "owner_id": owner_id,
+                    }
+                )
+
+        for batch in _batches(iter(company_rows)):
+            conn.execute(insert(Company), batch)
+        for batch in _batches(iter(app_rows)):
+            conn.execute(insert(Application), batch)
+
+        def followups() -> Iterator[dict]:
+            for row in app_rows:
+                if rng.random() >= 0.35:
+                    continue
+                applied = row["applied_at"] or today - timedelta(days=history_days)
+                start = datetime.combine(applied, dt_time(9), UTC)
+                for _ in range(1 + int(rng.expovariate(0.8))):
+                    totals["followups"] += 1
+                    yield {
+                        "application_id": row["id"],
+                        "owner_id": row["owner_id"],
+                        "note": rng.choice(NOTES),
+                        "created_at": start + timedelta(hours=rng.randrange(24 * 60)),
+                    }
+
+        for batch in _batches(followups()):
+            conn.execute(insert(FollowUp), batch)
+        if conn.dialect.name == "postgresql":
+            # ids above were given explicitly; move the sequences past them so
+            # rows created through the API during the run don't collide
+            for table in ("users", "companies", "applications"):
+                sequence = f"pg_get_serial_sequence('{table}', 'id')"
+                conn.execute(text(f"SELECT setval({sequence}, (SELECT max(id) FROM {table}))"))
+        counters.repair(conn)
+        totals["companies"], totals["applications"] = len(company_rows), len(app_rows)
+    engine.dispose()
+    return Profile(users=users, seed=seed, **totals)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True, help="sync SQLAlchemy URL of the database to fill")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history-days", type=int, default=HISTORY_DAYS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    profile = generate(args.url, args.users, args.seed, history_days=args.history_days)
+    print(
+        f"{profile.users} users, {profile.companies} companies, "
+        f"{profile.applications} applications, {profile.followups} follow-ups "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
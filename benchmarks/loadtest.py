@@ -0,0 +1,376 @@
+"""Mixed-scenario load test with latency percentiles and JSON results.
+
+Virtual users (``--concurrency``) each log in as one of the users created by
+:mod:`benchmarks.datagen` and then run scenarios back to back for
+``--duration`` seconds, picking each one at random according to ``--mix``:
+
+* ``login`` – ``POST /auth/login`` (Argon2 verify)
+* ``list`` – ``GET /applications/``, sometimes filtered by status or sorted
+* ``dashboard`` – ``GET /applications/dashboard/summary``
+* ``create`` – ``POST /applications/`` for one of the user's companies
+* ``patch`` – ``PATCH /applications/{id}`` with a new status
+
+``--mix`` is a preset name (see :data:`MIXES`) or weights such as
+``list=6,dashboard=3,patch=1``. Requests made during the first ``--warmup``
+seconds are not recorded.
+
+Without ``--base-url`` the app runs in-process behind ``httpx.ASGITransport``
+on a freshly generated database: a temporary SQLite file, or ``--url`` (which
+is wiped). The login throttle is lifted there, since the virtual users log in
+far more often than a person would. With ``--base-url`` a running server is
+tested; fill its database with ``python -m benchmarks.datagen`` first, using
+the same ``--users`` and ``--seed``, and raise its ``LOGIN_MAX_ATTEMPTS`` or
+expect ``429`` answers in the ``login`` scenario.
+
+``--out`` writes the results as JSON (see :func:`results_document`), and
+``--compare`` prints the change against an earlier results file, so runs on
+SQLite and PostgreSQL, or before and after a change, can be put side by
+side.
+
+Usage::
+
+    python -m benchmarks.loadtest --users 200 --concurrency 16 --duration 30 --out sqlite.json
+    python -m benchmarks.loadtest --url postgresql+psycopg://u:p@localhost/load \
+        --out pg.json --compare sqlite.json
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 --mix read
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.datagen import PASSWORD, email_for
+
+RESULTS_FORMAT = 1
+
+MIXES: dict[str, dict[str, int]] = {
+    # a client polling its lists, with occasional edits
+    "default": {"list": 50, "dashboard": 25, "patch": 10, "create": 10, "login": 5},
+    "read": {"list": 70, "dashboard": 30},
+    "write": {"create": 40, "patch": 40, "list": 20},
+}
+STATUSES = ("applied", "interview", "offer", "rejected")
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    rng: random.Random
+    headers: dict[str, str] = field(default_factory=dict)
+    company_ids: list[int] = field(default_factory=list)
+    application_ids: list[int] = field(default_factory=list)
+
+
+async def login(client: httpx.AsyncClient, vu: VirtualUser) -> httpx.Response:
+    r = await client.post("/auth/login", data={"username": vu.email, "password": PASSWORD})
+    if r.status_code == 200:
+        vu.headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    return r
+
+
+async def list_applications(client: httpx.AsyncClient, vu: VirtualUser) -> httpx.Response:
+    params: dict[str, str | int] = {"limit": vu.rng.choice((20, 20, 50, 100))}
+    if vu.rng.random() < 0.3:
+        params["status"] = vu.rng.choice(STATUSES)
+    if vu.rng.random() < 0.3:
+        params["order_by"] = vu.rng.choice(("id", "status"))
+        params["desc"] = "true"
+    return await client.get("/applications/", params=params, headers=vu.headers)
+
+
+async def dashboard(client: httpx.AsyncClient, vu: VirtualUser) -> httpx.Response:
+    return await client.get("/applications/dashboard/summary", headers=vu.headers)
+
+
+async def create_application(client: httpx.AsyncClient, vu: VirtualUser) -> httpx.Response:
+    body = {
+        "position": f"Load test role {vu.rng.randrange(10_000)}",
+        "company_id": vu.rng.choice(vu.company_ids),
+    }
+    r = await client.post("/applications/", json=body, headers=vu.headers)
+    if r.status_code == 201:
+        vu.application_ids.append(r.json()["id"])
+    return r
+
+
+async def patch_application(client: httpx.AsyncClient, vu: VirtualUser) -> httpx.Response:
+    app_id = vu.rng.choice(vu.application_ids)
+    body = {"status": vu.rng.choice(STATUSES)}
+    return await client.patch(f"/applications/{app_id}", json=body, headers=vu.headers)
+
+
+SCENARIOS: dict[str, Callable[[httpx.AsyncClient, VirtualUser], Awaitable[httpx.Response]]] = {
+    "login": login,
+    "list": list_applications,
+    "dashboard": dashboard,
+    "create": create_application,
+    "patch": patch_application,
+}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"expected a preset {sorted(MIXES)} or name=weight pairs of {sorted(SCENARIOS)}"
+            )
+        mix[name] = int(weight)
+    return mix
+
+
+@dataclass
+class Recorder:
+    started: float
+    warmup: float
+    samples: dict[str, list[float]] = field(default_factory=dict)
+    statuses: dict[str, Counter] = field(default_factory=dict)
+    errors: Counter = field(default_factory=Counter)
+
+    def record(self, scenario: str, status: int | str, seconds: float, ok: bool) -> None:
+        if time.perf_counter() - self.started < self.warmup:
+            return
+        self.samples.setdefault(scenario, []).append(seconds)
+        self.statuses.setdefault(scenario, Counter())[str(status)] += 1
+        if not ok:
+            self.errors[scenario] += 1
+
+
+async def prepare(client: httpx.AsyncClient, vu: VirtualUser) -> None:
+    """Log in and learn the user's company and application ids (not timed)."""
+    r = await login(client, vu)
+    r.raise_for_status()
+    r = await client.get("/companies/", headers=vu.headers)
+    r.raise_for_status()
+    vu.company_ids = [c["id"] for c in r.json()]
+    r = await client.get(
+        "/applications/", params={"limit": 100, "order_by": "id"}, headers=vu.headers
+    )
+    r.raise_for_status()
+    vu.application_ids = [a["id"] for a in r.json()]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    users: int,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    mix: dict[str, int],
+    seed: int,
+) -> tuple[Recorder, float]:
+    rng = random.Random(seed)
+    vus = [
+        VirtualUser(email_for(i % users), random.Random(rng.random())) for i in range(concurrency)
+    ]
+    await asyncio.gather(*(prepare(client, vu) for vu in vus))
+    names, weights = list(mix), list(mix.values())
+    recorder = Recorder(started=time.perf_counter(), warmup=warmup)
+    deadline = recorder.started + warmup + duration
+
+    async def worker(vu: VirtualUser) -> None:
+        while time.perf_counter() < deadline:
+            scenario = vu.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                r = await SCENARIOS[scenario](client, vu)
+            except httpx.TransportError as exc:
+                recorder.record(scenario, type(exc).__name__, time.perf_counter() - start, ok=False)
+                continue
+            recorder.record(
+                scenario, r.status_code, time.perf_counter() - start, ok=r.status_code < 400
+            )
+
+    await asyncio.gather(*(worker(vu) for vu in vus))
+    measured = time.perf_counter() - recorder.started - warmup
+    return recorder, measured
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    return sorted_samples[max(0, math.ceil(len(sorted_samples) * q) - 1)]
+
+
+def summarize(samples: list[float], errors: int, seconds: float) -> dict:
+    samples = sorted(samples)
+    if not samples:
+        return {"requests": 0, "errors": errors, "rps": 0.0}
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / seconds, 1),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def results_document(
+    recorder: Recorder, seconds: float, backend: str, target: str, config: dict, data: dict | None
+) -> dict:
+    """The JSON written by ``--out``.
+
+    ``format`` is bumped whenever a field changes meaning. ``scenarios`` and
+    ``total`` hold ``requests``, ``errors``, ``rps`` and ``p50_ms``/``p95_ms``/
+    ``p99_ms``/``max_ms``; scenarios also list response ``status`` counts.
+    """
+    scenarios = {}
+    for name, samples in sorted(recorder.samples.items()):
+        scenarios[name] = summarize(samples, recorder.errors[name], seconds)
+        scenarios[name]["status"] = dict(recorder.statuses[name])
+    every = [s for samples in recorder.samples.values() for s in samples]
+    return {
+        "format": RESULTS_FORMAT,
+        "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "backend": backend,
+        "target": target,
+        "config": config,
+        "data": data,
+        "scenarios": scenarios,
+        "total": summarize(every, sum(recorder.errors.values()), seconds),
+    }
+
+
+def print_results(doc: dict, baseline: dict | None = None) -> None:
+    print(f"backend={doc['backend']} target={doc['target']} commit={doc['git_commit']}")
+    header = (
+        f"{'scenario':<10} {'requests':>8} {'errors':>6} {'rps':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    if baseline:
+        header += f" {'rps vs base':>12} {'p95 vs base':>12}"
+    print(header)
+    base_rows = {**baseline["scenarios"], "total": baseline["total"]} if baseline else {}
+    rows = [*doc["scenarios"].items(), ("total", doc["total"])]
+    for name, s in rows:
+        if not s["requests"]:
+            continue
+        line = (
+            f"{name:<10} {s['requests']:>8} {s['errors']:>6} {s['rps']:>8.1f} "
+            f"{s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f}"
+        )
+        base = base_rows.get(name)
+        if base and base["requests"]:
+            rps_change = s["rps"] / base["rps"] - 1
+            p95_change = s["p95_ms"] / base["p95_ms"] - 1
+            line += f" {rps_change:>+12.0%} {p95_change:>+12.0%}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="test a running server instead of the app in-process")
+    parser.add_argument(
+        "--url", help="sync SQLAlchemy URL for the in-process run (wiped and re-seeded)"
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--mix", type=parse_mix, default="default")
+    parser.add_argument("--out", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to compare against")
+    args = parser.parse_args()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    config = {
+        "users": args.users,
+        "seed": args.seed,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "mix": args.mix,
+    }
+
+    async def drive(client: httpx.AsyncClient) -> tuple[Recorder, float]:
+        return await run_load(
+            client, args.users, args.concurrency, args.duration, args.warmup, args.mix, args.seed
+        )
+
+    if args.base_url:
+
+        async def remote() -> tuple[Recorder, float]:
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(
+                base_url=args.base_url, limits=limits, timeout=30
+            ) as client:
+                return await drive(client)
+
+        recorder, seconds = asyncio.run(remote())
+        doc = results_document(recorder, seconds, "remote", args.base_url, config, None)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = args.url or f"sqlite:///{Path(tmp) / 'load.sqlite3'}"
+            # must be set before the app (and its engines) are imported
+            os.environ["DATABASE_URL"] = url
+            os.environ["LOGIN_MAX_ATTEMPTS"] = "1000000000"
+            from sqlalchemy.engine import make_url
+
+            from app.core.password_pool import password_pool
+            from app.db import session as db_session
+            from app.main import app
+            from benchmarks.datagen import generate
+
+            logging.getLogger().setLevel(logging.WARNING)
+            profile = generate(url, args.users, args.seed)
+
+            async def local() -> tuple[Recorder, float]:
+                password_pool.start()
+                try:
+                    transport = httpx.ASGITransport(app=app)
+                    async with httpx.AsyncClient(
+                        transport=transport, base_url="http://loadtest"
+                    ) as client:
+                        return await drive(client)
+                finally:
+                    await db_session.async_engine.dispose()
+                    password_pool.shutdown()
+
+            recorder, seconds = asyncio.run(local())
+            parsed = make_url(url)
+            target = (
+                parsed.render_as_string(hide_password=True) if args.url else "temporary sqlite file"
+            )
+            doc = results_document(
+                recorder, seconds, parsed.get_backend_name(), target, config, asdict(profile)
+            )
+
+    print_results(doc, baseline)
+    if args.out:
+        args.out.write_text(json.dumps(doc, indent=2) + "\n")
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,4 +2,5 @@
 set -e
 
 alembic -c alembic.ini upgrade head
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# WEB_CONCURRENCY sets the number of worker processes (default 1)
+exec python -m app.serve --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import os
 
 # ensure testing environment is set before any application code is imported
@@ -5,12 +6,15 @@ os.environ.setdefault("ENV", "test")
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
 from app.db import session as db_session
 from app.db.base import Base
+from app.db.instrumentation import instrument_engine
+from app.db.pool import configure_engine
 
 
 def _create_test_engine():
@@ -31,6 +35,26 @@ def _create_test_engine():
     return create_engine(url, **kwargs)
 
 
+def _create_test_async_engine():
+    url = settings.async_database_url
+    if url == "sqlite+aiosqlite:///:memory:":
+        return create_async_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+
+    kwargs = {}
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    return create_async_engine(url, **kwargs)
+
+
+async def _run_on_async_engine(engine, fn):
+    async with engine.begin() as conn:
+        await conn.run_sync(fn)
+
+
 @pytest.fixture(autouse=True, scope="session")
 def configure_environment():
     # make sure testing env is set before settings are evaluated elsewhere
@@ -44,6 +68,7 @@ def configure_environment():
 def prepare_database(tmp_path, monkeypatch):
     # override the module-level engine and SessionLocal used by application
     test_engine = _create_test_engine()
+    configure_engine(test_engine)
     TestSession = sessionmaker(autocommit=False, autoflush=False, bind=test_engine, expire_on_commit=False)
 
     monkeypatch.setattr(db_session, "engine", test_engine)
@@ -53,7 +78,28 @@ def prepare_database(tmp_path, monkeypatch):
     import app.core.deps as deps_module
     monkeypatch.setattr(deps_module, "SessionLocal", TestSession)
 
+    # handlers run on the async engine; with an in-memory database it is a
+    # separate database from the sync one, so the schema is created on both
+    test_async_engine = _create_test_async_engine()
+    configure_engine(test_async_engine.sync_engine)
+    TestAsyncSession = async_sessionmaker(bind=test_async_engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(db_session, "async_engine", test_async_engine)
+    monkeypatch.setattr(db_session, "AsyncSessionLocal", TestAsyncSession)
+    monkeypatch.setattr(deps_module, "AsyncSessionLocal", TestAsyncSession)
+    # per-request statement metrics come from events on the engine
+    instrument_engine(test_async_engine.sync_engine, "primary")
+
+    # user ids are reused once the database is recreated; start every test
+    # with an empty principal cache
+    from app.core.principal_cache import principal_cache
+    principal_cache.clear()
+    from app.db.replica import read_router
+    read_router.clear()
+
     # create tables
     Base.metadata.create_all(test_engine)
+    asyncio.run(_run_on_async_engine(test_async_engine, Base.metadata.create_all))
     yield
+    asyncio.run(_run_on_async_engine(test_async_engine, Base.metadata.drop_all))
+    asyncio.run(test_async_engine.dispose())
     Base.metadata.drop_all(test_engine)
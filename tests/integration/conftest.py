@@ -0,0 +1,29 @@
+import uuid
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def register_and_login() -> Callable[..., dict]:
+    """Register a fresh user and return the ``Authorization`` header of a login.
+
+    Called as ``register_and_login(client)``, or with ``email=`` for tests
+    that need to know the address.
+    """
+
+    def register_and_login(client: TestClient, email: str | None = None) -> dict:
+        email = email or f"user-{uuid.uuid4().hex[:8]}@example.com"
+        pwd = "password123"
+        r = client.post("/auth/register", json={"email": email, "password": pwd})
+        assert r.status_code == 201
+        r = client.post(
+            "/auth/login",
+            data={"username": email, "password": pwd},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert r.status_code == 200
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    return register_and_login
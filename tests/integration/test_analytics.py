@@ -0,0 +1,196 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+
+from app.api.analytics import analytics_cache
+from app.db import session as db_session
+from app.main import app
+from app.models.followup import FollowUp
+
+# a Wednesday, so week buckets start two days earlier
+END = date(2026, 3, 18)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    analytics_cache.clear()
+    yield
+    analytics_cache.clear()
+
+
+def seed(client: TestClient, headers: dict) -> list[dict]:
+    company = client.post("/companies/", json={"name": f"Stats {uuid.uuid4().hex[:6]}"}, headers=headers).json()
+    items = [
+        # this week (Mon 16 Mar): 4 applications, one interview, one offer
+        ("applied", END),
+        ("interview", END - timedelta(days=1)),
+        ("offer", END - timedelta(days=2)),
+        ("rejected", END - timedelta(days=2)),
+        # two weeks earlier: 2 applications, one offer
+        ("applied", END - timedelta(days=14)),
+        ("offer", END - timedelta(days=15)),
+        # outside the range
+        ("offer", END - timedelta(days=60)),
+    ]
+    apps = client.post(
+        "/applications/bulk",
+        json=[
+            {"position": f"Role {i}", "company_id": company["id"], "status": status, "applied_at": day.isoformat()}
+            for i, (status, day) in enumerate(items)
+        ],
+        headers=headers,
+    ).json()["created"]
+    client.post(
+        "/followups/bulk",
+        json=[{"application_id": apps[0]["id"], "note": f"call {n}"} for n in range(3)],
+        headers=headers,
+    )
+    return apps
+
+
+async def set_followup_dates(when: datetime) -> None:
+    async with db_session.async_engine.begin() as conn:
+        await conn.execute(update(FollowUp).values(created_at=when))
+
+
+def analytics(client: TestClient, headers: dict, **params):
+    r = client.get("/applications/analytics", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return r
+
+
+def test_weekly_funnel_and_activity(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, register_and_login(client))  # someone else's data
+    seed(client, headers)
+    asyncio.run(set_followup_dates(datetime(2026, 3, 17, 9, 30)))
+
+    body = analytics(client, headers, start=(END - timedelta(days=20)).isoformat(), end=END.isoformat()).json()
+    assert body["bucket"] == "week"
+    buckets = body["buckets"]
+    assert [b["start"] for b in buckets] == ["2026-02-23", "2026-03-02", "2026-03-09", "2026-03-16"]
+
+    assert [b["applied"] for b in buckets] == [0, 2, 0, 4]
+    assert [b["interviews"] for b in buckets] == [0, 1, 0, 2]
+    assert [b["offers"] for b in buckets] == [0, 1, 0, 1]
+    # every follow-up is moved to Tue 17 Mar; only this user's count
+    assert [b["followups"] for b in buckets] == [0, 0, 0, 3]
+
+    assert buckets[0]["interview_rate"] is None and buckets[0]["interview_rate_to_date"] is None
+    assert buckets[1]["offer_rate"] == 0.5
+    assert buckets[3]["interview_rate"] == 0.5
+    assert buckets[3]["offer_rate"] == 0.25
+    # empty weeks carry the rate since start forward
+    assert buckets[2]["interview_rate_to_date"] == 0.5
+    assert buckets[3]["interview_rate_to_date"] == pytest.approx(3 / 6)
+    assert buckets[3]["offer_rate_to_date"] == pytest.approx(2 / 6)
+
+
+def test_day_and_month_buckets(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, headers)
+
+    days = analytics(client, headers, bucket="day", start="2026-03-16", end=END.isoformat()).json()["buckets"]
+    assert [(b["start"], b["applied"]) for b in days] == [
+        ("2026-03-16", 2),
+        ("2026-03-17", 1),
+        ("2026-03-18", 1),
+    ]
+    months = analytics(client, headers, bucket="month", start="2026-01-01", end=END.isoformat()).json()["buckets"]
+    assert [(b["start"], b["applied"]) for b in months] == [
+        ("2026-01-01", 1),
+        ("2026-02-01", 0),
+        ("2026-03-01", 6),
+    ]
+
+
+def test_invalid_ranges_are_rejected(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    r = client.get("/applications/analytics", params={"start": "2026-03-02", "end": "2026-03-01"}, headers=headers)
+    assert r.status_code == 422
+    r = client.get(
+        "/applications/analytics",
+        params={"bucket": "day", "start": "2000-01-01", "end": "2026-01-01"},
+        headers=headers,
+    )
+    assert r.status_code == 422
+    r = client.get("/applications/analytics", params={"bucket": "year"}, headers=headers)
+    assert r.status_code == 422
+    # too many buckets is rejected without listing them
+    r = client.get(
+        "/applications/analytics",
+        params={"bucket": "day", "start": "0001-01-01", "end": "9999-12-31"},
+        headers=headers,
+    )
+    assert r.status_code == 422
+    # the bucket after the range must be representable
+    for params in (
+        {"bucket": "month", "start": "9999-12-01", "end": "9999-12-31"},
+        {"bucket": "day", "start": "9999-12-30", "end": "9999-12-31"},
+    ):
+        assert client.get("/applications/analytics", params=params, headers=headers).status_code == 422
+
+
+def test_default_start_is_clamped_to_the_first_date(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    body = analytics(client, headers, bucket="day", end="0001-01-05").json()
+    assert body["start"] == "0001-01-01"
+    assert len(body["buckets"]) == 5
+    body = analytics(client, headers, bucket="month", start="9999-10-15", end="9999-11-30").json()
+    assert [b["start"] for b in body["buckets"]] == ["9999-10-01", "9999-11-01"]
+
+
+def test_results_are_cached_until_the_next_write(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    apps = seed(client, headers)
+    params = {"start": "2026-03-01", "end": END.isoformat()}
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    first = analytics(client, headers, **params)
+    sync_engine = db_session.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        second = analytics(client, headers, **params)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    assert second.content == first.content
+    # only the user's data version was read
+    assert not any("applications" in s or "followups" in s for s in statements)
+
+    client.patch(f"/applications/{apps[0]['id']}", json={"status": "offer"}, headers=headers)
+    third = analytics(client, headers, **params).json()
+    assert third["buckets"][-1]["offers"] == 2
+    assert analytics(client, headers, **params, bucket="day").json()["bucket"] == "day"
+
+    # the ETag still answers a revalidation with 304
+    r = client.get(
+        "/applications/analytics",
+        params=params,
+        headers={**headers, "If-None-Match": analytics(client, headers, **params).headers["ETag"]},
+    )
+    assert r.status_code == 304
+
+
+def test_etag_names_the_resolved_range(register_and_login):
+    # without end the range follows today, so yesterday's ETag must not match
+    client = TestClient(app)
+    headers = register_and_login(client)
+    first = analytics(client, headers, end=END.isoformat()).headers["ETag"]
+    second = analytics(client, headers, end=(END + timedelta(days=1)).isoformat()).headers["ETag"]
+    assert first != second
+    today = analytics(client, headers).headers["ETag"]
+    assert date.today().isoformat() in today
+    r = client.get("/applications/analytics", headers={**headers, "If-None-Match": today})
+    assert r.status_code == 304
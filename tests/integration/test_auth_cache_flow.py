@@ -0,0 +1,90 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+from app.core.principal_cache import principal_cache
+from app.db import session as db_session
+from app.main import app
+from app.models.user import User
+
+
+async def _update_user(email: str, **values) -> None:
+    async with db_session.AsyncSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.email == email))
+        for attr, val in values.items():
+            setattr(user, attr, val)
+        await db.commit()
+
+
+def test_cache_hit_skips_users_lookup(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    assert client.get("/companies/", headers=headers).status_code == 200
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = db_session.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/companies/", headers=headers).status_code == 200
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    # the lookup by the token's email is skipped (the ETag still reads the
+    # user's data version by id)
+    assert not any("users.email =" in s for s in statements)
+
+
+def test_deactivation_and_password_change_invalidate(register_and_login):
+    client = TestClient(app)
+    email = f"pc-{uuid.uuid4().hex[:8]}@example.com"
+    headers = register_and_login(client, email=email)
+    assert client.get("/companies/", headers=headers).status_code == 200
+    assert len(principal_cache) == 1
+
+    asyncio.run(_update_user(email, is_active=False))
+    assert len(principal_cache) == 0
+    assert client.get("/companies/", headers=headers).status_code == 403
+
+    asyncio.run(_update_user(email, is_active=True))
+    assert client.get("/companies/", headers=headers).status_code == 200
+    asyncio.run(_update_user(email, hashed_password="changed"))
+    assert len(principal_cache) == 0
+
+
+def test_invalidation_waits_for_the_commit(register_and_login):
+    client = TestClient(app)
+    email = f"pc-{uuid.uuid4().hex[:8]}@example.com"
+    headers = register_and_login(client, email=email)
+    client.get("/companies/", headers=headers)
+    assert len(principal_cache) == 1
+
+    async def deactivate(commit: bool) -> int:
+        async with db_session.AsyncSessionLocal() as db:
+            user = await db.scalar(select(User).where(User.email == email))
+            user.is_active = False
+            await db.flush()
+            # until the commit, other requests still read the active row and
+            # may cache it; dropping the entries now would not stick
+            cached_after_flush = len(principal_cache)
+            await (db.commit() if commit else db.rollback())
+            return cached_after_flush
+
+    assert asyncio.run(deactivate(commit=False)) == 1
+    assert len(principal_cache) == 1
+    assert asyncio.run(deactivate(commit=True)) == 1
+    assert len(principal_cache) == 0
+
+
+def test_cache_counters_exported(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    client.get("/companies/", headers=headers)
+    client.get("/companies/", headers=headers)
+    text = client.get("/metrics").text
+    assert "auth_principal_cache_hits_total" in text
+    assert "auth_principal_cache_misses_total" in text
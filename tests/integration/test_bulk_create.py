@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db import counters
+from app.db import session as db_session
+from app.main import app
+
+
+async def _drifted() -> list[int]:
+    async with db_session.AsyncSessionLocal() as db:
+        return await db.run_sync(counters.check)
+
+
+def test_bulk_create_reports_per_item_errors(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    other = register_and_login(client)
+    suffix = uuid.uuid4().hex[:6]
+    foreign = client.post("/companies/", json={"name": f"Theirs {suffix}"}, headers=other).json()["id"]
+
+    r = client.post(
+        "/companies/bulk",
+        json=[
+            {"name": f"A {suffix}"},
+            {"name": f"B {suffix}", "website": "https://b.example.com"},
+            {"name": f"A {suffix}"},
+            {"name": f"Theirs {suffix}"},
+        ],
+        headers=headers,
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert [c["name"] for c in body["created"]] == [f"A {suffix}", f"B {suffix}"]
+    assert [e["index"] for e in body["errors"]] == [2, 3]
+    company_ids = [c["id"] for c in body["created"]]
+
+    r = client.post(
+        "/applications/bulk",
+        json=[
+            {"position": "One", "company_id": company_ids[0]},
+            {"position": "Two", "company_id": foreign},
+            {"position": "Three", "company_id": company_ids[1], "status": "offer"},
+        ],
+        headers=headers,
+    )
+    body = r.json()
+    assert [a["position"] for a in body["created"]] == ["One", "Three"]
+    assert body["errors"] == [{"index": 1, "detail": "Company not found"}]
+    app_ids = [a["id"] for a in body["created"]]
+
+    r = client.post(
+        "/followups/bulk",
+        json=[
+            {"application_id": app_ids[0], "note": "first"},
+            {"application_id": 10**9, "note": "missing"},
+            {"application_id": app_ids[1], "note": "second"},
+        ],
+        headers=headers,
+    )
+    body = r.json()
+    assert [f["note"] for f in body["created"]] == ["first", "second"]
+    assert body["errors"] == [{"index": 1, "detail": "Application not found"}]
+
+    summary = client.get("/applications/dashboard/summary", headers=headers).json()
+    assert summary["counts_by_status"] == {"applied": 1, "offer": 1}
+    assert [f["note"] for f in summary["recent_followups"]] == ["second", "first"]
+    assert asyncio.run(_drifted()) == []
+
+
+def test_bulk_insert_is_batched(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    company_id = client.post(
+        "/companies/", json={"name": f"Batch {uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()["id"]
+
+    inserts = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO APPLICATIONS"):
+            inserts.append(statement)
+
+    engine = db_session.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        r = client.post(
+            "/applications/bulk",
+            json=[{"position": f"P{i}", "company_id": company_id} for i in range(50)],
+            headers=headers,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert r.status_code == 200
+    assert len(r.json()["created"]) == 50
+    # insertmanyvalues packs the whole batch into one multi-row statement
+    assert len(inserts) == 1
+
+
+def test_bulk_rejects_empty_and_oversized_batches(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    assert client.post("/companies/bulk", json=[], headers=headers).status_code == 422
+    too_many = [{"name": f"X{i}"} for i in range(1001)]
+    assert client.post("/companies/bulk", json=too_many, headers=headers).status_code == 422
@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db import counters
+from app.db import session as db_session
+from app.main import app
+
+
+def seed_company(client: TestClient, headers: dict, applications: int, notes: int) -> tuple[dict, list[dict]]:
+    company = client.post(
+        "/companies/", json={"name": f"Cascade {uuid.uuid4().hex[:8]}"}, headers=headers
+    ).json()
+    apps = client.post(
+        "/applications/bulk",
+        json=[
+            {"position": f"Engineer {i}", "company_id": company["id"], "status": ("applied", "offer")[i % 2]}
+            for i in range(applications)
+        ],
+        headers=headers,
+    ).json()["created"]
+    if notes:
+        client.post(
+            "/followups/bulk",
+            json=[{"application_id": a["id"], "note": f"recruiter call {n}"} for a in apps for n in range(notes)],
+            headers=headers,
+        )
+    return company, apps
+
+
+async def _drifted() -> list[int]:
+    async with db_session.AsyncSessionLocal() as db:
+        return await db.run_sync(counters.check)
+
+
+def count_statements(client: TestClient, path: str, headers: dict) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.delete(path, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert r.status_code == 204, r.text
+    return len(statements)
+
+
+def test_company_delete_removes_applications_and_followups(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    doomed, doomed_apps = seed_company(client, headers, applications=3, notes=2)
+    kept, kept_apps = seed_company(client, headers, applications=2, notes=1)
+
+    # another user cannot delete it
+    assert client.delete(f"/companies/{doomed['id']}", headers=register_and_login(client)).status_code == 404
+    assert client.delete(f"/companies/{doomed['id']}", headers=headers).status_code == 204
+    assert client.delete(f"/companies/{doomed['id']}", headers=headers).status_code == 404
+
+    assert [c["id"] for c in client.get("/companies/", headers=headers).json()] == [kept["id"]]
+    remaining = client.get("/applications/?order_by=id", headers=headers).json()
+    assert [a["id"] for a in remaining] == [a["id"] for a in kept_apps]
+    for a in kept_apps:
+        assert len(client.get(f"/followups/?application_id={a['id']}", headers=headers).json()) == 1
+    for a in doomed_apps:
+        assert client.get(f"/followups/?application_id={a['id']}", headers=headers).status_code == 404
+
+    summary = client.get("/applications/dashboard/summary", headers=headers).json()
+    assert summary["counts_by_status"] == {"applied": 1, "offer": 1}
+    assert asyncio.run(_drifted()) == []
+    # the search index drops the cascaded rows too
+    hits = client.get("/search/", params={"q": "recruiter", "limit": 100}, headers=headers).json()
+    assert {h["application_id"] for h in hits} == {a["id"] for a in kept_apps}
+
+
+def test_application_delete_removes_followups(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    _, apps = seed_company(client, headers, applications=2, notes=3)
+
+    assert client.delete(f"/applications/{apps[0]['id']}", headers=register_and_login(client)).status_code == 404
+    assert client.delete(f"/applications/{apps[0]['id']}", headers=headers).status_code == 204
+    assert client.delete(f"/applications/{apps[0]['id']}", headers=headers).status_code == 404
+
+    assert client.get(f"/followups/?application_id={apps[0]['id']}", headers=headers).status_code == 404
+    assert len(client.get(f"/followups/?application_id={apps[1]['id']}", headers=headers).json()) == 3
+    assert asyncio.run(_drifted()) == []
+
+
+def test_delete_statement_count_does_not_grow_with_children(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+
+    counts = {}
+    for children in (1, 20):
+        company, apps = seed_company(client, headers, applications=children, notes=children)
+        counts[children] = (
+            count_statements(client, f"/applications/{apps[0]['id']}", headers),
+            count_statements(client, f"/companies/{company['id']}", headers),
+        )
+    assert counts[1] == counts[20]
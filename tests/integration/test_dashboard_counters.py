@@ -0,0 +1,121 @@
+import asyncio
+import random
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, select
+
+from app.db import counters
+from app.db import session as db_session
+from app.main import app
+from app.models.application import Application
+from app.models.dashboard_counters import DashboardCounters
+from app.models.followup import FollowUp
+
+
+async def _drifted() -> list[int]:
+    async with db_session.AsyncSessionLocal() as db:
+        return await db.run_sync(counters.check)
+
+
+async def _live_summary(owner_id: int) -> dict:
+    # the dashboard as it was computed before the counters table existed
+    async with db_session.AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(Application.status, func.count(Application.id))
+            .where(Application.owner_id == owner_id)
+            .group_by(Application.status)
+        )
+        recent = await db.scalars(
+            select(FollowUp.id)
+            .where(FollowUp.owner_id == owner_id)
+            .order_by(FollowUp.created_at.desc(), FollowUp.id.desc())
+            .limit(5)
+        )
+        return {"counts_by_status": dict(rows.all()), "recent_ids": list(recent)}
+
+
+async def _owner_id_of(application_id: int) -> int:
+    async with db_session.AsyncSessionLocal() as db:
+        return await db.scalar(select(Application.owner_id).where(Application.id == application_id))
+
+
+def test_counters_stay_consistent_under_random_writes(register_and_login):
+    rng = random.Random(7)
+    client = TestClient(app)
+    users = [register_and_login(client) for _ in range(2)]
+    statuses = ["applied", "interview", "offer", "rejected"]
+    state = {i: {"companies": [], "apps": [], "followups": []} for i in range(len(users))}
+
+    for step in range(120):
+        i = rng.randrange(len(users))
+        headers, s = users[i], state[i]
+        op = rng.choice(["company", "app", "app", "patch", "followup", "followup", "del_followup", "del_app", "del_company"])
+        if op == "company" or not s["companies"]:
+            r = client.post("/companies/", json={"name": f"Co {uuid.uuid4().hex[:8]}"}, headers=headers)
+            s["companies"].append(r.json()["id"])
+        elif op == "app" or not s["apps"]:
+            r = client.post(
+                "/applications/",
+                json={"position": "Dev", "company_id": rng.choice(s["companies"]), "status": rng.choice(statuses)},
+                headers=headers,
+            )
+            s["apps"].append((r.json()["id"], r.json()["company_id"]))
+        elif op == "patch":
+            app_id, _ = rng.choice(s["apps"])
+            client.patch(f"/applications/{app_id}", json={"status": rng.choice(statuses)}, headers=headers)
+        elif op == "followup":
+            app_id, _ = rng.choice(s["apps"])
+            r = client.post("/followups/", json={"application_id": app_id, "note": f"n{step}"}, headers=headers)
+            s["followups"].append((r.json()["id"], app_id))
+        elif op == "del_followup" and s["followups"]:
+            fu_id, _ = s["followups"].pop(rng.randrange(len(s["followups"])))
+            assert client.delete(f"/followups/{fu_id}", headers=headers).status_code == 204
+        elif op == "del_app":
+            app_id, _ = s["apps"].pop(rng.randrange(len(s["apps"])))
+            s["followups"] = [f for f in s["followups"] if f[1] != app_id]
+            assert client.delete(f"/applications/{app_id}", headers=headers).status_code == 204
+        elif op == "del_company":
+            company_id = s["companies"].pop(rng.randrange(len(s["companies"])))
+            gone = {a for a, c in s["apps"] if c == company_id}
+            s["apps"] = [a for a in s["apps"] if a[1] != company_id]
+            s["followups"] = [f for f in s["followups"] if f[1] not in gone]
+            assert client.delete(f"/companies/{company_id}", headers=headers).status_code == 204
+
+        if step % 10 == 0:
+            assert asyncio.run(_drifted()) == []
+
+    assert asyncio.run(_drifted()) == []
+    for i, headers in enumerate(users):
+        if not state[i]["apps"]:
+            continue
+        owner_id = asyncio.run(_owner_id_of(state[i]["apps"][0][0]))
+        summary = client.get("/applications/dashboard/summary", headers=headers).json()
+        live = asyncio.run(_live_summary(owner_id))
+        assert summary["counts_by_status"] == live["counts_by_status"]
+        assert [f["id"] for f in summary["recent_followups"]] == live["recent_ids"]
+
+
+async def _drop_counter_rows() -> None:
+    async with db_session.AsyncSessionLocal() as db:
+        await db.execute(delete(DashboardCounters))
+        await db.commit()
+
+
+def test_missing_row_is_rebuilt_on_write(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    company_id = client.post("/companies/", json={"name": "Gone Co"}, headers=headers).json()["id"]
+    client.post("/applications/", json={"position": "A", "company_id": company_id}, headers=headers)
+    asyncio.run(_drop_counter_rows())
+
+    # without a row the dashboard falls back to counting live
+    summary = client.get("/applications/dashboard/summary", headers=headers).json()
+    assert summary["counts_by_status"] == {"applied": 1}
+
+    client.post(
+        "/applications/", json={"position": "B", "company_id": company_id, "status": "offer"}, headers=headers
+    )
+    assert asyncio.run(_drifted()) == []
+    summary = client.get("/applications/dashboard/summary", headers=headers).json()
+    assert summary["counts_by_status"] == {"applied": 1, "offer": 1}
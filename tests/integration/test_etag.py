@@ -0,0 +1,105 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api.etag import etag_matches
+from app.db import session as db_session
+from app.main import app
+
+
+def revalidate(client: TestClient, path: str, headers: dict, etag: str):
+    return client.get(path, headers={**headers, "If-None-Match": etag})
+
+
+def test_unchanged_collections_answer_304_without_querying(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    client.post("/companies/", json={"name": f"ETag {uuid.uuid4().hex[:8]}"}, headers=headers)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = db_session.async_engine.sync_engine
+    for path in ("/companies/", "/applications/", "/applications/dashboard/summary"):
+        r = client.get(path, headers=headers)
+        assert r.status_code == 200
+        etag = r.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+        assert r.headers["cache-control"] == "private, no-cache"
+
+        statements.clear()
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            r = revalidate(client, path, headers, etag)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+        assert r.status_code == 304
+        assert r.content == b""
+        assert r.headers["etag"] == etag
+        # only the data version was read
+        assert len(statements) == 1
+        assert "data_version" in statements[0]
+
+
+def test_every_write_changes_the_etag(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+
+    def etag() -> str:
+        return client.get("/companies/", headers=headers).headers["etag"]
+
+    seen = [etag()]
+
+    def changed() -> None:
+        seen.append(etag())
+        assert seen[-1] not in seen[:-1]
+        # and the old ETag no longer matches
+        assert revalidate(client, "/applications/", headers, seen[-2]).status_code == 200
+
+    company = client.post("/companies/", json={"name": f"W {uuid.uuid4().hex[:8]}"}, headers=headers).json()
+    changed()
+    client.post("/companies/bulk", json=[{"name": f"W {uuid.uuid4().hex[:8]}"}], headers=headers)
+    changed()
+    application = client.post(
+        "/applications/", json={"position": "Dev", "company_id": company["id"]}, headers=headers
+    ).json()
+    changed()
+    client.post("/applications/bulk", json=[{"position": "Ops", "company_id": company["id"]}], headers=headers)
+    changed()
+    client.patch(f"/applications/{application['id']}", json={"status": "offer"}, headers=headers)
+    changed()
+    followup = client.post(
+        "/followups/", json={"application_id": application["id"], "note": "call"}, headers=headers
+    ).json()
+    changed()
+    client.post("/followups/bulk", json=[{"application_id": application["id"], "note": "mail"}], headers=headers)
+    changed()
+    client.delete(f"/followups/{followup['id']}", headers=headers)
+    changed()
+    client.delete(f"/applications/{application['id']}", headers=headers)
+    changed()
+    client.delete(f"/companies/{company['id']}", headers=headers)
+    changed()
+
+    # failed writes leave it alone
+    assert client.delete(f"/companies/{company['id']}", headers=headers).status_code == 404
+    assert etag() == seen[-1]
+
+
+def test_etags_are_per_user(register_and_login):
+    client = TestClient(app)
+    first = client.get("/companies/", headers=register_and_login(client)).headers["etag"]
+    other = register_and_login(client)
+    # both users are at version 0, but one's ETag means nothing for the other
+    assert revalidate(client, "/companies/", other, first).status_code == 200
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('"1-2"', '"1-2"')
+    assert etag_matches('W/"1-2"', '"1-2"')
+    assert etag_matches('"1-1", "1-2"', '"1-2"')
+    assert etag_matches("*", '"1-2"')
+    assert not etag_matches('"1-1"', '"1-2"')
+    assert not etag_matches(None, '"1-2"')
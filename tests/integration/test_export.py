@@ -0,0 +1,178 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+
+from app.core.security import create_access_token
+from app.db import session as db_session
+from app.main import app
+from app.models.company import Company
+from app.models.user import User
+
+EXPORT_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", 1_000_000))
+# growth allowed while streaming EXPORT_ROWS rows; buffering the whole export
+# would take several hundred MB
+RSS_CEILING_MB = 64
+
+
+def seed(client: TestClient, headers: dict) -> tuple[str, list[int]]:
+    name = f"Co {uuid.uuid4().hex[:6]}"
+    company_id = client.post("/companies/", json={"name": name}, headers=headers).json()["id"]
+    app_ids = []
+    for i, status in enumerate(["applied", "offer", "applied"]):
+        r = client.post(
+            "/applications/",
+            json={"position": f"Role, \"{i}\"", "company_id": company_id, "status": status},
+            headers=headers,
+        )
+        app_ids.append(r.json()["id"])
+        client.post("/followups/", json={"application_id": r.json()["id"], "note": f"note {i}"}, headers=headers)
+    return name, app_ids
+
+
+def test_export_ndjson_and_csv(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, register_and_login(client))
+    company_name, app_ids = seed(client, headers)
+
+    r = client.get("/applications/export", params={"include_company": True}, headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["id"] for row in rows] == app_ids
+    assert rows[0] == {
+        "id": app_ids[0],
+        "position": 'Role, "0"',
+        "status": "applied",
+        "applied_at": None,
+        "company_id": rows[0]["company_id"],
+        "company_name": company_name,
+    }
+
+    r = client.get("/applications/export", params={"format": "csv", "status": "applied"}, headers=headers)
+    assert r.headers["content-type"].startswith("text/csv")
+    assert 'filename="applications.csv"' in r.headers["content-disposition"]
+    parsed = list(csv.reader(io.StringIO(r.text)))
+    assert parsed[0] == ["id", "position", "status", "applied_at", "company_id"]
+    assert [row[:3] for row in parsed[1:]] == [
+        [str(app_ids[0]), 'Role, "0"', "applied"],
+        [str(app_ids[2]), 'Role, "2"', "applied"],
+    ]
+
+    r = client.get("/followups/export", params={"include_company": True}, headers=headers)
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["note"] for row in rows] == ["note 0", "note 1", "note 2"]
+    assert {row["company_name"] for row in rows} == {company_name}
+    assert rows[0]["created_at"]
+
+    r = client.get(
+        "/followups/export", params={"format": "csv", "application_id": app_ids[1]}, headers=headers
+    )
+    parsed = list(csv.reader(io.StringIO(r.text)))
+    assert parsed[0] == ["id", "application_id", "note", "created_at"]
+    assert [row[2] for row in parsed[1:]] == ["note 1"]
+
+    # nothing to export: NDJSON is empty, CSV is just the header
+    empty = register_and_login(client)
+    assert client.get("/followups/export", headers=empty).content == b""
+    r = client.get("/followups/export", params={"format": "csv"}, headers=empty)
+    assert r.text.splitlines() == ["id,application_id,note,created_at"]
+
+    assert client.get("/applications/export", params={"format": "xml"}, headers=headers).status_code == 422
+
+
+async def _seed_bulk(rows: int) -> str:
+    async with db_session.async_engine.begin() as conn:
+        user_id = (
+            await conn.execute(
+                insert(User).returning(User.id), [{"email": "bulk@example.com", "hashed_password": "x"}]
+            )
+        ).scalar_one()
+        company_id = (
+            await conn.execute(
+                insert(Company).returning(Company.id), [{"name": "Bulk Co", "owner_id": user_id}]
+            )
+        ).scalar_one()
+        await conn.execute(
+            text(
+                "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows) "
+                "INSERT INTO applications (position, status, applied_at, company_id, owner_id) "
+                "SELECT 'Role ' || n, 'applied', '2024-01-01', :company_id, :owner_id FROM seq"
+            ),
+            {"rows": rows, "company_id": company_id, "owner_id": user_id},
+        )
+    return create_access_token("bulk@example.com")
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+async def _stream(path: str, query: str, token: str) -> tuple[int, int, float]:
+    """Drive the ASGI app directly and return (lines, bytes, peak RSS in MB).
+
+    The test clients buffer the whole response body, which would defeat the
+    point of the measurement.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"test"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    stats = {"lines": 0, "bytes": 0, "peak": _rss_mb()}
+    requested, done = False, asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # the client stays connected until the body is complete
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            stats["lines"] += body.count(b"\n")
+            stats["bytes"] += len(body)
+            stats["peak"] = max(stats["peak"], _rss_mb())
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    return stats["lines"], stats["bytes"], stats["peak"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads RSS from /proc")
+def test_export_memory_is_flat():
+    token = asyncio.run(_seed_bulk(EXPORT_ROWS))
+    # warm up imports and caches so they don't count against the ceiling
+    asyncio.run(_stream("/applications/export", "format=csv&include_company=true&status=offer", token))
+
+    for query in ("format=ndjson&include_company=true", "format=csv"):
+        baseline = _rss_mb()
+        lines, size, peak = asyncio.run(_stream("/applications/export", query, token))
+        assert lines == EXPORT_ROWS + (1 if "csv" in query else 0)
+        assert size > 20 * 2**20
+        assert peak - baseline < RSS_CEILING_MB, f"{query}: RSS grew {peak - baseline:.0f} MB"
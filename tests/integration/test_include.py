@@ -0,0 +1,104 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db import session as db_session
+from app.main import app
+
+
+def seed(client: TestClient, headers: dict, applications: int) -> list[dict]:
+    companies = client.post(
+        "/companies/bulk", json=[{"name": f"Inc {uuid.uuid4().hex[:8]}"} for _ in range(3)], headers=headers
+    ).json()["created"]
+    apps = client.post(
+        "/applications/bulk",
+        json=[
+            {"position": f"Role {i}", "company_id": companies[i % 3]["id"], "applied_at": "2024-01-01"}
+            for i in range(applications)
+        ],
+        headers=headers,
+    ).json()["created"]
+    # every other application gets two notes
+    client.post(
+        "/followups/bulk",
+        json=[
+            {"application_id": a["id"], "note": f"note {n} for {a['id']}"}
+            for a in apps[::2]
+            for n in range(2)
+        ],
+        headers=headers,
+    )
+    return companies
+
+
+def count_statements(client: TestClient, path: str, headers: dict) -> tuple[int, list]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.get(path, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert r.status_code == 200, r.text
+    return len(statements), r.json()
+
+
+def test_include_adds_related_data(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    companies = {c["id"]: c for c in seed(client, headers, 4)}
+
+    items = client.get(
+        "/applications/?order_by=id&include=company,followups,latest_followup", headers=headers
+    ).json()
+    assert len(items) == 4
+    for i, item in enumerate(items):
+        assert item["company"] == companies[item["company_id"]]
+        if i % 2 == 0:
+            assert [f["note"] for f in item["followups"]] == [f"note {n} for {item['id']}" for n in (1, 0)]
+            assert item["latest_followup"] == item["followups"][0]
+        else:
+            assert item["followups"] == []
+            assert item["latest_followup"] is None
+
+    # only what was asked for is added
+    latest_only = client.get("/applications/?order_by=id&include=latest_followup", headers=headers).json()
+    assert [item.get("latest_followup") for item in latest_only] == [item["latest_followup"] for item in items]
+    assert all("followups" not in item and "company" not in item for item in latest_only)
+    plain = client.get("/applications/?order_by=id", headers=headers).json()
+    assert set(plain[0]) == {"id", "position", "status", "applied_at", "company_id"}
+
+
+def test_unknown_include_is_rejected(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    r = client.get("/applications/?include=company,owner", headers=headers)
+    assert r.status_code == 422
+    assert "owner" in r.json()["detail"]
+
+
+def test_statement_count_does_not_grow_with_page_size(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, headers, 40)
+
+    for include in ("company", "followups", "latest_followup", "company,followups,latest_followup"):
+        counts = {}
+        for limit in (2, 10, 40):
+            # a fresh ETag read each time: the If-None-Match path is not taken
+            count, items = count_statements(client, f"/applications/?limit={limit}&include={include}", headers)
+            assert len(items) == limit
+            counts[limit] = count
+        assert len(set(counts.values())) == 1, (include, counts)
+
+    plain, _ = count_statements(client, "/applications/?limit=40", headers)
+    everything, _ = count_statements(
+        client, "/applications/?limit=40&include=company,followups,latest_followup", headers
+    )
+    # one query per relation; latest_followup comes with the follow-ups
+    assert everything == plain + 2
@@ -0,0 +1,61 @@
+import re
+import uuid
+
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.main import app
+
+
+def scrape(client: TestClient) -> dict:
+    samples = {}
+    for family in text_string_to_metric_families(client.get("/metrics").text):
+        for sample in family.samples:
+            samples[(sample.name, tuple(sorted(sample.labels.items())))] = sample.value
+    return samples
+
+
+def value(samples: dict, name: str, **labels) -> float:
+    return samples.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+def test_metrics_are_labeled_by_route_template(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    company_id = client.post("/companies/", json={"name": f"Co {uuid.uuid4().hex[:6]}"}, headers=headers).json()["id"]
+    app_ids = [
+        client.post("/applications/", json={"position": f"P{i}", "company_id": company_id}, headers=headers).json()["id"]
+        for i in range(3)
+    ]
+    before = scrape(client)
+    for app_id in app_ids:
+        assert client.patch(f"/applications/{app_id}", json={"status": "offer"}, headers=headers).status_code == 200
+    client.get("/applications/", headers=headers)
+    client.get(f"/no-such-path/{uuid.uuid4().hex}")
+    after = scrape(client)
+
+    template = "/applications/{application_id}"
+    counted = value(after, "app_requests_total", method="PATCH", endpoint=template, http_status="200")
+    assert counted - value(before, "app_requests_total", method="PATCH", endpoint=template, http_status="200") == 3
+    # no series per concrete id or per unknown path
+    endpoints = {dict(labels).get("endpoint") for _, labels in after}
+    assert not any(re.search(r"/applications/\d", e or "") for e in endpoints)
+    assert not any((e or "").startswith("/no-such-path") for e in endpoints)
+    assert value(after, "app_requests_total", method="GET", endpoint="unmatched", http_status="404") >= 1
+
+    latency = "app_request_duration_seconds_count"
+    assert value(after, latency, method="PATCH", endpoint=template) - value(
+        before, latency, method="PATCH", endpoint=template
+    ) == 3
+
+    # the list request ran at least the user lookup or the list query
+    stmts = "app_db_statements_per_request"
+    labels = {"method": "GET", "endpoint": "/applications/"}
+    assert value(after, stmts + "_count", **labels) - value(before, stmts + "_count", **labels) == 1
+    assert value(after, stmts + "_sum", **labels) - value(before, stmts + "_sum", **labels) >= 1
+    assert value(after, "app_db_seconds_per_request_sum", **labels) > value(
+        before, "app_db_seconds_per_request_sum", **labels
+    )
+
+    assert ("app_db_pool_checked_out", (("engine", "primary"),)) in after
+    assert ("app_db_pool_overflow", (("engine", "primary"),)) in after
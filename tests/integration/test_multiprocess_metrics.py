@@ -0,0 +1,118 @@
+"""Two real worker processes behind ``app.serve`` share one metrics view."""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs fork-safe sockets and signals")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def worker_pids(directory: Path) -> set[int]:
+    return {int(p.stem.rsplit("_", 1)[1]) for p in directory.glob("counter_*.db")}
+
+
+def health_total(client: httpx.Client) -> float:
+    text = client.get("/metrics").text
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if (
+                sample.name == "app_requests_total"
+                and sample.labels.get("endpoint") == "/health"
+                and sample.labels.get("http_status") == "200"
+            ):
+                return sample.value
+    return 0.0
+
+
+def wait_until(predicate, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.1)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.fixture
+def server(tmp_path):
+    port = free_port()
+    metrics_dir = tmp_path / "prometheus"
+    env = {
+        **os.environ,
+        "ENV": "local",
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'mp.sqlite3'}",
+        "PROMETHEUS_MULTIPROC_DIR": str(metrics_dir),
+        "PASSWORD_HASH_WORKERS": "0",
+    }
+    log = open(tmp_path / "serve.log", "wb")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--port", str(port), "--workers", "2"],
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    # a fresh connection per request so the kernel spreads them over workers
+    client = httpx.Client(
+        base_url=f"http://127.0.0.1:{port}", limits=httpx.Limits(max_keepalive_connections=0), timeout=10
+    )
+    try:
+        yield proc, client, metrics_dir
+    finally:
+        client.close()
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log.close()
+
+
+def test_two_workers_aggregate_and_survive_a_worker_death(server):
+    proc, client, metrics_dir = server
+    served = 0
+
+    def healthy() -> bool:
+        nonlocal served
+        try:
+            ok = client.get("/health").status_code == 200
+        except httpx.TransportError:
+            return False
+        served += ok
+        return ok
+
+    wait_until(healthy)
+    # keep going until both workers have answered something
+    wait_until(lambda: healthy() and len(worker_pids(metrics_dir)) == 2)
+    for _ in range(20):
+        assert healthy()
+
+    # whichever worker answers the scrape, it reports the total of both
+    for _ in range(6):
+        assert health_total(client) == served
+
+    victim = min(worker_pids(metrics_dir))
+    assert (metrics_dir / f"gauge_livesum_{victim}.db").exists()
+    os.kill(victim, signal.SIGKILL)
+    # the launcher drops the dead worker's live gauges and starts a new one
+    wait_until(lambda: not (metrics_dir / f"gauge_livesum_{victim}.db").exists())
+    wait_until(lambda: healthy() and len(worker_pids(metrics_dir) - {victim}) == 2)
+
+    assert proc.poll() is None
+    # the dead worker's requests still count towards the total; a worker
+    # counts a request just after sending its response, so let it catch up
+    wait_until(lambda: health_total(client) == served, timeout=5)
+    for _ in range(4):
+        assert health_total(client) == served
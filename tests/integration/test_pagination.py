@@ -0,0 +1,72 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture
+def seeded(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    r = client.post("/companies/", json={"name": f"Co {uuid.uuid4().hex[:6]}"}, headers=headers)
+    company_id = r.json()["id"]
+    statuses = ["applied", "interview", "offer", "rejected"]
+    today = date.today()
+    for i in range(13):
+        # repeated dates and some NULLs so ties and the NULL block are exercised
+        applied_at = None if i % 4 == 0 else (today - timedelta(days=i % 3)).isoformat()
+        r = client.post(
+            "/applications/",
+            json={
+                "position": f"Role {i}",
+                "company_id": company_id,
+                "status": statuses[i % len(statuses)],
+                "applied_at": applied_at,
+            },
+            headers=headers,
+        )
+        assert r.status_code == 201
+    return client, headers
+
+
+@pytest.mark.parametrize("order_by", ["applied_at", "status", "id"])
+@pytest.mark.parametrize("desc", [False, True])
+def test_cursor_walk_matches_full_listing(seeded, order_by, desc):
+    client, headers = seeded
+    params = {"order_by": order_by, "desc": str(desc).lower()}
+    r = client.get("/applications/", params={**params, "limit": 100}, headers=headers)
+    expected = [a["id"] for a in r.json()]
+    assert len(expected) == 13
+    assert "X-Next-Cursor" not in r.headers
+
+    seen = []
+    cursor = None
+    while True:
+        page_params = {**params, "limit": 4}
+        if cursor:
+            page_params["cursor"] = cursor
+        r = client.get("/applications/", params=page_params, headers=headers)
+        assert r.status_code == 200
+        seen.extend(a["id"] for a in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == expected
+
+
+def test_cursor_rejects_mismatch_and_garbage(seeded):
+    client, headers = seeded
+    r = client.get("/applications/", params={"limit": 2, "order_by": "id"}, headers=headers)
+    cursor = r.headers["X-Next-Cursor"]
+
+    r = client.get("/applications/", params={"cursor": cursor, "order_by": "status"}, headers=headers)
+    assert r.status_code == 400
+    r = client.get("/applications/", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert r.status_code == 400
+    r = client.get(
+        "/applications/", params={"cursor": cursor, "order_by": "id", "offset": 2}, headers=headers
+    )
+    assert r.status_code == 400
@@ -0,0 +1,249 @@
+"""Query-plan regression suite.
+
+Every SELECT the routers issue is captured while exercising the API and then
+EXPLAINed on the same database. A plan that scans a whole table or sorts rows
+outside an index fails the test, so a new query shape (or a dropped index)
+shows up here before it shows up in production latency.
+
+Runs against whatever ``DATABASE_URL`` the suite uses: SQLite by default, or
+PostgreSQL when pointed at one. PostgreSQL happily seq-scans tiny tables, so
+sequential scans and sorts are disabled in the planner first; if one still
+appears there is no index path at all.
+"""
+import asyncio
+import json
+import re
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def allow_private_targets(monkeypatch):
+    # the webhooks registered here point at example.com, which needs no lookup then
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", True)
+
+
+def seed(client: TestClient, headers: dict) -> tuple[int, int]:
+    r = client.post("/companies/", json={"name": f"Co {uuid.uuid4().hex[:6]}"}, headers=headers)
+    company_id = r.json()["id"]
+    statuses = ["applied", "interview", "offer", "rejected"]
+    app_id = None
+    for i in range(8):
+        applied_at = None if i % 3 == 0 else (date.today() - timedelta(days=i)).isoformat()
+        r = client.post(
+            "/applications/",
+            json={
+                "position": f"Role {i}",
+                "company_id": company_id,
+                "status": statuses[i % 4],
+                "applied_at": applied_at,
+            },
+            headers=headers,
+        )
+        app_id = r.json()["id"]
+        client.post("/followups/", json={"application_id": app_id, "note": f"note {i}"}, headers=headers)
+    return company_id, app_id
+
+
+def exercise_routes(client: TestClient, register_and_login) -> None:
+    headers = register_and_login(client)
+    # a second user so owner filters have something to exclude
+    seed(client, register_and_login(client))
+    # write handlers also read the user's webhook endpoints for the outbox
+    hook_id = client.post("/webhooks/", json={"url": "https://example.com/hook"}, headers=headers).json()["id"]
+    company_id, app_id = seed(client, headers)
+
+    client.get("/companies/", headers=headers)
+    for order_by in ("applied_at", "status", "id"):
+        for desc in ("false", "true"):
+            params = {"order_by": order_by, "desc": desc, "limit": 3}
+            r = client.get("/applications/", params=params, headers=headers)
+            client.get(
+                "/applications/",
+                params={**params, "cursor": r.headers["X-Next-Cursor"]},
+                headers=headers,
+            )
+            client.get("/applications/", params={**params, "status": "interview"}, headers=headers)
+            client.get("/applications/", params={**params, "company_id": company_id}, headers=headers)
+    client.get("/applications/dashboard/summary", headers=headers)
+    client.get("/followups/", params={"application_id": app_id}, headers=headers)
+    client.get("/followups/due", headers=headers)
+    client.get("/webhooks/", headers=headers)
+    client.get(f"/webhooks/{hook_id}/dead-letters", headers=headers)
+    for include_company in (False, True):
+        params = {"include_company": include_company}
+        client.get("/applications/export", params=params, headers=headers)
+        client.get("/applications/export", params={**params, "status": "offer"}, headers=headers)
+        client.get("/followups/export", params=params, headers=headers)
+        client.get("/followups/export", params={**params, "application_id": app_id}, headers=headers)
+    client.patch(f"/applications/{app_id}", json={"status": "offer"}, headers=headers)
+    client.delete(f"/applications/{app_id}", headers=headers)
+    client.delete(f"/companies/{company_id}", headers=headers)
+
+
+def capture_selects(fn) -> list[tuple[str, object]]:
+    statements: list[tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if re.match(r"\s*SELECT\b", statement, re.I) and re.search(r"\bFROM\b", statement, re.I):
+            statements.append((statement, parameters))
+
+    sync_engine = db_session.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+    # de-duplicate on statement text; parameters don't change the plan shape
+    return list({sql: (sql, params) for sql, params in statements}.values())
+
+
+def _walk_pg_plan(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_pg_plan(child)
+
+
+async def explain_all(statements) -> dict[str, list[str]]:
+    problems: dict[str, list[str]] = {}
+    async with db_session.async_engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            await conn.exec_driver_sql("SET enable_sort = off")
+        for sql, params in statements:
+            if dialect == "sqlite":
+                rows = (await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params)).all()
+                details = [row[3] for row in rows]
+                bad = [d for d in details if d.startswith("SCAN ") or "TEMP B-TREE" in d]
+            else:
+                raw = (await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql, params)).scalar()
+                plan = raw if isinstance(raw, list) else json.loads(raw)
+                bad = [
+                    f"{n['Node Type']} {n.get('Relation Name', '')}".strip()
+                    for n in _walk_pg_plan(plan[0]["Plan"])
+                    if n["Node Type"] in ("Seq Scan", "Sort")
+                ]
+            if bad:
+                problems[sql] = bad
+    return problems
+
+
+def test_router_queries_use_indexes(register_and_login):
+    client = TestClient(app)
+    statements = capture_selects(lambda: exercise_routes(client, register_and_login))
+    # sanity check that the capture actually saw the router queries
+    assert any(re.search(r"FROM applications\b", sql) for sql, _ in statements)
+    assert any(re.search(r"FROM followups\b", sql) for sql, _ in statements)
+
+    problems = asyncio.run(explain_all(statements))
+    assert not problems, "queries without an index path:\n" + "\n\n".join(
+        f"{sql}\n  -> {', '.join(bad)}" for sql, bad in problems.items()
+    )
+
+
+def test_analytics_queries_read_the_owner_date_indexes(register_and_login):
+    # grouping by a computed bucket needs a temporary b-tree on SQLite (and a
+    # sort or hash on PostgreSQL); what must not happen is reading every
+    # user's rows, so only table scans count here
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, register_and_login(client))
+    seed(client, headers)
+
+    def run():
+        for bucket in ("day", "week", "month"):
+            client.get("/applications/analytics", params={"bucket": bucket}, headers=headers)
+
+    statements = [
+        (sql, params)
+        for sql, params in capture_selects(run)
+        if re.search(r"FROM (applications|followups)\b", sql)
+    ]
+    assert len(statements) == 6
+    problems = asyncio.run(explain_all(statements))
+    scans = {
+        sql: [d for d in bad if re.match(r"(SCAN|Seq Scan) (applications|followups)\b", d)]
+        for sql, bad in problems.items()
+    }
+    assert not any(scans.values()), scans
+
+
+def test_reminder_claim_reads_the_pending_index(register_and_login):
+    from datetime import UTC, datetime
+
+    from app.core.reminders import ReminderScheduler
+
+    client = TestClient(app)
+    headers = register_and_login(client)
+    _, app_id = seed(client, headers)
+    due_at = datetime.now(UTC).isoformat()
+    client.post("/followups/", json={"application_id": app_id, "note": "ping", "due_at": due_at}, headers=headers)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("UPDATE followups"):
+            statements.append((statement, parameters))
+
+    sync_engine = db_session.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        assert asyncio.run(ReminderScheduler(60, 5, 100, 300).claim()) == 1
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+    assert len(statements) == 1
+    problems = asyncio.run(explain_all(statements))
+    # the UPDATE itself looks rows up by primary key; only the candidate
+    # scan must stay on the partial index
+    scans = [d for bad in problems.values() for d in bad if re.match(r"(SCAN|Seq Scan) followups\b", d)]
+    assert not scans, problems
+
+
+def test_outbox_claim_walks_the_pending_index_in_order(register_and_login):
+    # the claim takes the oldest events, so it walks ids in order and stops
+    # after a batch; it must do so on the partial index (skipping dead
+    # letters) and without sorting
+    from app.core.webhooks import WebhookDispatcher
+
+    client = TestClient(app)
+    headers = register_and_login(client)
+    client.post("/webhooks/", json={"url": "https://example.com/hook"}, headers=headers)
+    seed(client, headers)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("UPDATE webhook_outbox"):
+            statements.append((statement, parameters))
+
+    async def claim():
+        dispatcher = WebhookDispatcher(100, 8, 5, 60, 3, 10, 60, 1)
+        try:
+            return await dispatcher.claim()
+        finally:
+            await dispatcher.aclose()
+
+    sync_engine = db_session.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        deliveries, _ = asyncio.run(claim())
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+    assert deliveries and len(statements) == 1
+    problems = asyncio.run(explain_all(statements))
+    bad = [
+        d
+        for details in problems.values()
+        for d in details
+        if "TEMP B-TREE" in d
+        or d.startswith(("Sort", "Seq Scan webhook_outbox"))
+        or (d.startswith("SCAN webhook_outbox") and "ix_webhook_outbox_pending" not in d)
+    ]
+    assert not bad, problems
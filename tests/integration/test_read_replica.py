@@ -0,0 +1,94 @@
+import asyncio
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.core.deps as deps_module
+from app.core.config import settings
+from app.db.base import Base
+from app.db.replica import read_router
+from app.main import app
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """A primary and a replica SQLite file; ``replicate()`` copies one to the other."""
+    primary_path, replica_path = tmp_path / "primary.sqlite3", tmp_path / "replica.sqlite3"
+    primary = create_async_engine(f"sqlite+aiosqlite:///{primary_path}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{replica_path}")
+
+    async def create_schema():
+        async with primary.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_schema())
+
+    def replicate():
+        with sqlite3.connect(primary_path) as src, sqlite3.connect(replica_path) as dst:
+            src.backup(dst)
+
+    replicate()
+    primary_sessions = async_sessionmaker(primary, expire_on_commit=False)
+    replica_sessions = async_sessionmaker(replica, expire_on_commit=False)
+    monkeypatch.setattr(deps_module, "AsyncSessionLocal", primary_sessions)
+    monkeypatch.setattr(deps_module, "ReadAsyncSessionLocal", replica_sessions)
+    yield replicate
+    asyncio.run(primary.dispose())
+    asyncio.run(replica.dispose())
+
+
+def company_names(client: TestClient, headers: dict) -> list[str]:
+    r = client.get("/companies/", headers=headers)
+    assert r.status_code == 200
+    return [c["name"] for c in r.json()]
+
+
+def test_reads_go_to_replica_except_right_after_a_write(databases, monkeypatch, register_and_login):
+    replicate = databases
+    client = TestClient(app)
+    headers = register_and_login(client)
+    replicate()
+
+    r = client.post("/companies/", json={"name": "Acme"}, headers=headers)
+    assert r.status_code == 201
+    # the replica hasn't caught up, but the writer reads their own write
+    assert company_names(client, headers) == ["Acme"]
+    assert client.get("/applications/dashboard/summary", headers=headers).status_code == 200
+
+    # once the window has passed, reads come from the (still stale) replica
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.0)
+    assert company_names(client, headers) == []
+    replicate()
+    assert company_names(client, headers) == ["Acme"]
+
+
+def test_window_is_per_user(databases, register_and_login):
+    replicate = databases
+    client = TestClient(app)
+    writer, reader = register_and_login(client), register_and_login(client)
+    replicate()
+
+    client.post("/companies/", json={"name": "Writer Co"}, headers=writer)
+    client.post("/companies/", json={"name": "Reader Co"}, headers=reader)
+    read_router.clear()
+    client.post("/companies/", json={"name": "Writer Co 2"}, headers=writer)
+    # only the writer's reads are pinned to the primary
+    assert sorted(company_names(client, writer)) == ["Writer Co", "Writer Co 2"]
+    assert company_names(client, reader) == []
+
+
+def test_unreachable_replica_falls_back_to_primary(databases, tmp_path, monkeypatch, register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    client.post("/companies/", json={"name": "Acme"}, headers=headers)
+    read_router.clear()
+
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.sqlite3'}")
+    monkeypatch.setattr(deps_module, "ReadAsyncSessionLocal", async_sessionmaker(broken))
+    assert company_names(client, headers) == ["Acme"]
+    assert read_router.replica_down
+    # and it is not retried on every request
+    assert read_router.route(0) == "replica_down"
+    asyncio.run(broken.dispose())
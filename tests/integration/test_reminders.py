@@ -0,0 +1,175 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.reminders import ReminderScheduler
+from app.db import session as db_session
+from app.main import app
+from app.models.followup import FollowUp
+
+NOW = datetime.now(UTC).replace(microsecond=0)
+
+
+def seed(client: TestClient, headers: dict, offsets_minutes: list[float | None]) -> list[dict]:
+    company = client.post("/companies/", json={"name": f"Remind {uuid.uuid4().hex[:6]}"}, headers=headers).json()
+    app_id = client.post(
+        "/applications/", json={"position": "Engineer", "company_id": company["id"]}, headers=headers
+    ).json()["id"]
+    items = []
+    for i, offset in enumerate(offsets_minutes):
+        item = {"application_id": app_id, "note": f"follow up {i}"}
+        if offset is not None:
+            item["due_at"] = (NOW + timedelta(minutes=offset)).isoformat()
+        items.append(item)
+    r = client.post("/followups/bulk", json=items, headers=headers)
+    assert r.status_code == 200 and not r.json()["errors"]
+    return r.json()["created"]
+
+
+def scheduler(**overrides) -> ReminderScheduler:
+    options = {"window": 60, "poll_interval": 5, "batch_size": 100, "claim_seconds": 300} | overrides
+    return ReminderScheduler(**options)
+
+
+async def reminded() -> dict[int, datetime | None]:
+    async with db_session.AsyncSessionLocal() as db:
+        rows = await db.execute(select(FollowUp.id, FollowUp.reminded_at).where(FollowUp.due_at.is_not(None)))
+        return dict(rows.all())
+
+
+def test_due_lists_reminders_in_due_order(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, register_and_login(client), [-5])
+    created = seed(client, headers, [-3, None, -60 * 24 * 10, -30, 90])
+    assert created[0]["due_at"] is not None and created[1]["due_at"] is None
+
+    r = client.get("/followups/due", headers=headers)
+    assert r.status_code == 200
+    # the last week up to now; the plain note and the 10-day-old one are out
+    assert [f["id"] for f in r.json()] == [created[3]["id"], created[0]["id"]]
+    assert all(f["reminded_at"] is None for f in r.json())
+
+    later = (NOW + timedelta(hours=2)).isoformat()
+    r = client.get("/followups/due", params={"before": later, "limit": 2}, headers=headers)
+    assert [f["id"] for f in r.json()] == [created[3]["id"], created[0]["id"]]
+    r = client.get("/followups/due", params={"after": NOW.isoformat(), "before": later}, headers=headers)
+    assert [f["id"] for f in r.json()] == [created[4]["id"]]
+
+
+def test_due_range_near_the_first_date_does_not_overflow(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    r = client.get("/followups/due", params={"before": "0001-01-02T00:00:00"}, headers=headers)
+    assert r.status_code == 200 and r.json() == []
+    # a local time that has no UTC equivalent
+    r = client.get("/followups/due", params={"after": "0001-01-01T00:00:00+05:00"}, headers=headers)
+    assert r.status_code == 422
+
+
+def test_naive_due_at_is_taken_as_utc(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    company = client.post("/companies/", json={"name": "Naive"}, headers=headers).json()
+    app_id = client.post(
+        "/applications/", json={"position": "Engineer", "company_id": company["id"]}, headers=headers
+    ).json()["id"]
+    naive = (NOW - timedelta(minutes=1)).replace(tzinfo=None).isoformat()
+    offset = (NOW - timedelta(minutes=1)).astimezone(UTC).isoformat()
+    for due_at in (naive, offset):
+        r = client.post(
+            "/followups/", json={"application_id": app_id, "note": "ping", "due_at": due_at}, headers=headers
+        )
+        assert r.status_code == 201
+    r = client.get("/followups/due", headers=headers)
+    assert len({f["due_at"] for f in r.json()}) == 1
+
+
+def test_workers_claim_disjoint_windows_and_fire_once(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    created = seed(client, headers, [-2, -1, 0.5, 0.9, 30, None])
+    due_soon = {f["id"] for f in created[:4]}
+    fired: list[int] = []
+
+    async def record(batch):
+        fired.extend(r.id for r in batch)
+
+    async def run():
+        a, b = scheduler(), scheduler()
+        for s in (a, b):
+            s.add_handler(record)
+        claimed = await asyncio.gather(a.claim(NOW), b.claim(NOW))
+        # nothing beyond the 60 s window, and no reminder in both queues
+        assert sum(claimed) == 4
+        assert {e[1] for e in a._heap} | {e[1] for e in b._heap} == due_soon
+        assert not {e[1] for e in a._heap} & {e[1] for e in b._heap}
+        assert await a.claim(NOW) == 0
+
+        later = NOW + timedelta(minutes=1)
+        assert await a.fire_due(later) + await b.fire_due(later) == 4
+        assert len(a) == len(b) == 0
+        return await reminded()
+
+    state = asyncio.run(run())
+    assert sorted(fired) == sorted(due_soon)
+    assert {i for i, at in state.items() if at is not None} == due_soon
+
+
+def test_failed_handlers_leave_reminders_for_another_worker(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    created = seed(client, headers, [-1])
+
+    async def broken(batch):
+        raise RuntimeError("downstream unavailable")
+
+    async def run():
+        a = scheduler()
+        a.add_handler(broken)
+        assert await a.claim(NOW) == 1
+        assert await a.fire_due(NOW) == 0
+        assert (await reminded())[created[0]["id"]] is None
+
+        b = scheduler()
+        # still claimed by a until the claim runs out
+        assert await b.claim(NOW) == 0
+        assert await b.claim(NOW + timedelta(seconds=301)) == 1
+        assert await b.fire_due(NOW + timedelta(seconds=301)) == 1
+
+    asyncio.run(run())
+
+
+def test_release_hands_claims_back(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, headers, [0.5, 0.7])
+
+    async def run():
+        a, b = scheduler(), scheduler()
+        assert await a.claim(NOW) == 2
+        assert await a.release() == 2
+        assert len(a) == 0
+        assert await b.claim(NOW) == 2
+
+    asyncio.run(run())
+
+
+def test_firing_changes_the_etag(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    seed(client, headers, [-1])
+    before = client.get("/applications/?include=followups", headers=headers)
+
+    async def run():
+        s = scheduler()
+        await s.claim(NOW)
+        await s.fire_due(NOW)
+
+    asyncio.run(run())
+    after = client.get("/applications/?include=followups", headers=headers)
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.json()[0]["followups"][0]["reminded_at"] is not None
@@ -0,0 +1,108 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def search(client: TestClient, headers: dict, q: str, **params) -> list[dict]:
+    r = client.get("/search/", params={"q": q, **params}, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def hits(client: TestClient, headers: dict, q: str) -> set[tuple[str, int]]:
+    return {(h["kind"], h["id"]) for h in search(client, headers, q)}
+
+
+def test_search_finds_positions_companies_and_notes(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    company = client.post(
+        "/companies/", json={"name": f"Backend Labs {uuid.uuid4().hex[:6]}"}, headers=headers
+    ).json()
+    application = client.post(
+        "/applications/", json={"position": "Senior Backend Engineer", "company_id": company["id"]}, headers=headers
+    ).json()
+    note = client.post(
+        "/followups/",
+        json={"application_id": application["id"], "note": "Recruiter Dana asked about the backend team"},
+        headers=headers,
+    ).json()
+
+    results = search(client, headers, "backend")
+    assert {(h["kind"], h["id"]) for h in results} == {
+        ("company", company["id"]),
+        ("application", application["id"]),
+        ("followup", note["id"]),
+    }
+    by_kind = {h["kind"]: h for h in results}
+    assert by_kind["followup"]["application_id"] == application["id"]
+    assert by_kind["company"]["application_id"] is None
+    assert [h["rank"] for h in results] == sorted((h["rank"] for h in results), reverse=True)
+
+    # every word must match, in any case, and stems match
+    assert hits(client, headers, "RECRUITERS dana") == {("followup", note["id"])}
+    assert hits(client, headers, "dana frontend") == set()
+    # operators and punctuation are just ignored
+    assert hits(client, headers, 'dana" * (') == {("followup", note["id"])}
+    assert search(client, headers, "?!") == []
+
+
+def test_search_is_scoped_to_the_current_user(register_and_login):
+    client = TestClient(app)
+    owner, other = register_and_login(client), register_and_login(client)
+    company = client.post("/companies/", json={"name": f"Zephyr {uuid.uuid4().hex[:6]}"}, headers=owner).json()
+    assert hits(client, owner, "zephyr") == {("company", company["id"])}
+    assert hits(client, other, "zephyr") == set()
+
+
+def test_index_follows_updates_and_deletes(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    company = client.post("/companies/", json={"name": f"Index {uuid.uuid4().hex[:6]}"}, headers=headers).json()
+    application = client.post(
+        "/applications/", json={"position": "Platform Engineer", "company_id": company["id"]}, headers=headers
+    ).json()
+    note = client.post(
+        "/followups/", json={"application_id": application["id"], "note": "onsite loop booked"}, headers=headers
+    ).json()
+
+    client.patch(f"/applications/{application['id']}", json={"position": "Data Engineer"}, headers=headers)
+    assert hits(client, headers, "platform") == set()
+    assert hits(client, headers, "data") == {("application", application["id"])}
+
+    client.delete(f"/followups/{note['id']}", headers=headers)
+    assert hits(client, headers, "onsite") == set()
+
+
+def test_search_pages_by_cursor(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    company = client.post("/companies/", json={"name": f"Paging {uuid.uuid4().hex[:6]}"}, headers=headers).json()
+    application = client.post(
+        "/applications/", json={"position": "Recruiter liaison", "company_id": company["id"]}, headers=headers
+    ).json()
+    notes = [
+        # different lengths give different ranks, repeats give ties
+        {"application_id": application["id"], "note": "recruiter " + "call " * (i % 4)}
+        for i in range(11)
+    ]
+    assert client.post("/followups/bulk", json=notes, headers=headers).status_code == 200
+
+    everything = search(client, headers, "recruiter", limit=100)
+    assert len(everything) == 12
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+        r = client.get("/search/", params={"q": "recruiter", **params}, headers=headers)
+        assert r.status_code == 200
+        seen.extend(r.json())
+        cursor = r.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert [(h["kind"], h["id"]) for h in seen] == [(h["kind"], h["id"]) for h in everything]
+
+    r = client.get("/search/", params={"q": "recruiter", "cursor": "bm90LWEtY3Vyc29y"}, headers=headers)
+    assert r.status_code == 400
@@ -0,0 +1,360 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import uuid
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.webhooks import WebhookDispatcher
+from app.db import session as db_session
+from app.main import app
+from app.models.webhook import OutboxEvent, WebhookEndpoint
+
+NOW = datetime.now(UTC)
+
+
+class StubReceiver(ThreadingHTTPServer):
+    """Local HTTP server that records POSTs and answers with ``status[path]``."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.received: list[tuple[str, dict, bytes]] = []
+        self.status: dict[str, int] = {}
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+    def events(self, path: str) -> list[dict]:
+        return [json.loads(body) for p, _, body in self.received if p == path]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((self.path, dict(self.headers), body))
+        self.send_response(self.server.status.get(self.path, 204))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def allow_private_targets(monkeypatch):
+    # the stub receiver listens on localhost, and example.com needs no lookup
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", True)
+
+
+@pytest.fixture
+def receiver():
+    server = StubReceiver()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def create_application(client: TestClient, headers: dict, **fields) -> dict:
+    company = client.post("/companies/", json={"name": f"Hook {uuid.uuid4().hex[:6]}"}, headers=headers).json()
+    body = {"position": "Engineer", "company_id": company["id"]} | fields
+    r = client.post("/applications/", json=body, headers=headers)
+    assert r.status_code == 201
+    return r.json()
+
+
+def dispatcher(**overrides) -> WebhookDispatcher:
+    options = {
+        "batch_size": 100,
+        "concurrency": 8,
+        "timeout": 5,
+        "claim_seconds": 60,
+        "max_attempts": 3,
+        "backoff_base": 10,
+        "backoff_max": 60,
+        "poll_interval": 1,
+    } | overrides
+    return WebhookDispatcher(**options)
+
+
+def drain(d: WebhookDispatcher, now: datetime | None = None) -> int:
+    async def run():
+        try:
+            return await d.run_once(now)
+        finally:
+            await d.aclose()
+
+    return asyncio.run(run())
+
+
+async def outbox_rows() -> list[OutboxEvent]:
+    async with db_session.AsyncSessionLocal() as db:
+        return list((await db.scalars(select(OutboxEvent).order_by(OutboxEvent.id))).all())
+
+
+async def endpoint_row(endpoint_id: int) -> WebhookEndpoint:
+    async with db_session.AsyncSessionLocal() as db:
+        return await db.get(WebhookEndpoint, endpoint_id)
+
+
+def test_webhook_endpoints_crud_and_limit(monkeypatch, register_and_login):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_ENDPOINTS", 2)
+    client = TestClient(app)
+    headers = register_and_login(client)
+
+    r = client.post("/webhooks/", json={"url": "ftp://example.com/hook"}, headers=headers)
+    assert r.status_code == 422
+    r = client.post("/webhooks/", json={"url": "https://example.com/hook"}, headers=headers)
+    assert r.status_code == 201
+    created = r.json()
+    assert len(created["secret"]) == 64 and created["failures"] == 0
+    assert client.post("/webhooks/", json={"url": "https://example.com/b"}, headers=headers).status_code == 201
+    assert client.post("/webhooks/", json={"url": "https://example.com/c"}, headers=headers).status_code == 409
+
+    listed = client.get("/webhooks/", headers=headers).json()
+    assert [w["url"] for w in listed] == ["https://example.com/hook", "https://example.com/b"]
+    # the secret is only shown once
+    assert "secret" not in listed[0]
+
+    other = register_and_login(client)
+    assert client.delete(f"/webhooks/{created['id']}", headers=other).status_code == 404
+    assert client.delete(f"/webhooks/{created['id']}", headers=headers).status_code == 204
+    assert len(client.get("/webhooks/", headers=headers).json()) == 1
+
+
+def test_writes_queue_events_in_their_transaction(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    # nothing is queued for users without endpoints
+    create_application(client, headers)
+    assert asyncio.run(outbox_rows()) == []
+
+    client.post("/webhooks/", json={"url": "https://example.com/a"}, headers=headers)
+    client.post("/webhooks/", json={"url": "https://example.com/b"}, headers=headers)
+    app_ = create_application(client, headers)
+    assert client.patch(f"/applications/{app_['id']}", json={"status": "interview"}, headers=headers).status_code == 200
+    # a failed write queues nothing
+    assert client.patch("/applications/999999", json={"status": "offer"}, headers=headers).status_code == 404
+    # an update that changes nothing is not an event
+    client.patch(f"/applications/{app_['id']}", json={"status": "interview"}, headers=headers)
+    assert client.delete(f"/applications/{app_['id']}", headers=headers).status_code == 204
+
+    rows = asyncio.run(outbox_rows())
+    events = [r.event for r in rows]
+    assert events == ["application.created"] * 2 + ["application.updated"] * 2 + ["application.deleted"] * 2
+    updated = json.loads(rows[2].payload)
+    assert updated["id"] == app_["id"] and updated["status"] == "interview"
+    assert updated["changes"] == {"status": ["applied", "interview"]}
+    assert json.loads(rows[4].payload)["status"] == "interview"
+
+
+def test_bulk_create_queues_one_event_per_application_and_company_delete_one_in_all(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    client.post("/webhooks/", json={"url": "https://example.com/a"}, headers=headers)
+    company = client.post("/companies/", json={"name": f"Bulk {uuid.uuid4().hex[:6]}"}, headers=headers).json()
+    items = [{"position": f"Role {i}", "company_id": company["id"]} for i in range(3)]
+    created = client.post("/applications/bulk", json=items, headers=headers).json()["created"]
+
+    assert client.delete(f"/companies/{company['id']}", headers=headers).status_code == 204
+    rows = asyncio.run(outbox_rows())
+    assert [r.event for r in rows] == ["application.created"] * 3 + ["company.deleted"]
+    deleted = json.loads(rows[3].payload)
+    assert deleted["id"] == company["id"] and deleted["name"] == company["name"]
+    assert deleted["application_ids"] == [a["id"] for a in created]
+
+
+def test_worker_delivers_signed_events_and_clears_the_outbox(receiver, register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    secret = client.post("/webhooks/", json={"url": receiver.url("/hook")}, headers=headers).json()["secret"]
+    app_ = create_application(client, headers, position="Backend")
+    client.patch(f"/applications/{app_['id']}", json={"status": "offer"}, headers=headers)
+
+    assert drain(dispatcher()) == 2
+    assert asyncio.run(outbox_rows()) == []
+    events = sorted(receiver.events("/hook"), key=lambda e: e["id"])
+    assert [e["event"] for e in events] == ["application.created", "application.updated"]
+    assert events[0]["data"]["position"] == "Backend"
+    assert events[1]["data"]["changes"] == {"status": ["applied", "offer"]}
+
+    _, sent_headers, body = receiver.received[0]
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    assert sent_headers["X-Webhook-Signature"] == expected
+    assert sent_headers["X-Webhook-Event"] == json.loads(body)["event"]
+
+
+def test_failing_endpoint_backs_off_without_holding_up_others(receiver, register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    good = client.post("/webhooks/", json={"url": receiver.url("/good")}, headers=headers).json()
+    bad = client.post("/webhooks/", json={"url": receiver.url("/bad")}, headers=headers).json()
+    receiver.status["/bad"] = 500
+    for _ in range(3):
+        create_application(client, headers)
+
+    assert drain(dispatcher(concurrency=1), NOW) == 6
+    assert len(receiver.events("/good")) == 3
+    # the first failure stops the rest of the batch for that endpoint
+    assert len(receiver.events("/bad")) == 1
+    rows = asyncio.run(outbox_rows())
+    assert len(rows) == 3 and {r.endpoint_id for r in rows} == {bad["id"]}
+    assert [r.attempts for r in rows] == [1, 0, 0]
+    assert rows[0].last_error == "HTTP 500"
+    assert all(r.claimed_until is None for r in rows)
+
+    endpoint = asyncio.run(endpoint_row(bad["id"]))
+    assert endpoint.failures == 1
+    # backoff_base 10 s, jittered down to no less than half
+    retry_at = endpoint.retry_at.replace(tzinfo=UTC)
+    assert NOW + timedelta(seconds=5) <= retry_at <= NOW + timedelta(seconds=10)
+    assert drain(dispatcher(), NOW + timedelta(seconds=4)) == 0
+
+    receiver.status["/bad"] = 200
+    assert drain(dispatcher(), NOW + timedelta(seconds=11)) == 3
+    assert asyncio.run(outbox_rows()) == []
+    endpoint = asyncio.run(endpoint_row(bad["id"]))
+    assert endpoint.failures == 0 and endpoint.retry_at is None
+    assert asyncio.run(endpoint_row(good["id"])).failures == 0
+
+
+def test_events_become_dead_letters_and_can_be_redelivered(receiver, register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    hook = client.post("/webhooks/", json={"url": receiver.url("/down")}, headers=headers).json()
+    receiver.status["/down"] = 503
+    create_application(client, headers)
+
+    at = NOW
+    for _ in range(3):
+        assert drain(dispatcher(), at) == 1
+        at += timedelta(minutes=5)
+    assert drain(dispatcher(), at) == 0
+
+    dead = client.get(f"/webhooks/{hook['id']}/dead-letters", headers=headers).json()
+    assert len(dead) == 1
+    assert dead[0]["event"] == "application.created" and dead[0]["attempts"] == 3
+    assert dead[0]["last_error"] == "HTTP 503"
+    other = register_and_login(client)
+    assert client.get(f"/webhooks/{hook['id']}/dead-letters", headers=other).status_code == 404
+
+    receiver.status["/down"] = 204
+    r = client.post(f"/webhooks/{hook['id']}/dead-letters/redeliver", headers=headers)
+    assert r.json() == {"requeued": 1}
+    assert drain(dispatcher()) == 1
+    assert asyncio.run(outbox_rows()) == []
+    assert len(receiver.events("/down")) == 4
+
+
+def test_unreachable_endpoint_counts_as_a_failure(register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    # nothing listens on port 9 (discard) of localhost here
+    client.post("/webhooks/", json={"url": "http://127.0.0.1:9/hook"}, headers=headers)
+    create_application(client, headers)
+
+    assert drain(dispatcher(timeout=1)) == 1
+    (row,) = asyncio.run(outbox_rows())
+    assert row.attempts == 1 and row.last_error.startswith("ConnectError")
+
+
+def test_workers_claim_disjoint_batches(receiver, register_and_login):
+    client = TestClient(app)
+    headers = register_and_login(client)
+    client.post("/webhooks/", json={"url": receiver.url("/hook")}, headers=headers)
+    for _ in range(5):
+        create_application(client, headers)
+
+    async def run():
+        a, b = dispatcher(batch_size=3), dispatcher(batch_size=3)
+        (first, _), (second, _) = await asyncio.gather(a.claim(NOW), b.claim(NOW))
+        await a.aclose()
+        await b.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(first) + len(second) == 5
+    assert not {d.id for d in first} & {d.id for d in second}
+
+    async def pending() -> int:
+        async with db_session.AsyncSessionLocal() as db:
+            return await db.scalar(select(func.count()).where(OutboxEvent.claimed_until.is_(None)))
+
+    assert asyncio.run(pending()) == 0
+
+
+def test_private_targets_are_refused(monkeypatch, receiver, register_and_login):
+    from app.core.config import settings
+
+    client = TestClient(app)
+    headers = register_and_login(client)
+    # registered while allowed, then the check is turned on
+    client.post("/webhooks/", json={"url": receiver.url("/hook")}, headers=headers)
+    create_application(client, headers)
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", False)
+
+    for url in (
+        "http://127.0.0.1/hook",
+        "http://localhost:8000/hook",
+        "http://10.1.2.3/hook",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://[::1]/hook",
+        "http://[::ffff:192.168.0.1]/hook",
+    ):
+        r = client.post("/webhooks/", json={"url": url}, headers=headers)
+        assert r.status_code == 422, url
+
+    assert drain(dispatcher()) == 1
+    assert receiver.received == []
+    (row,) = asyncio.run(outbox_rows())
+    assert row.attempts == 1 and "non-public address" in row.last_error
+
+
+def test_delivery_connects_to_the_checked_address(monkeypatch, receiver, register_and_login):
+    from app.core import webhook_targets
+    from app.core.config import settings
+
+    client = TestClient(app)
+    headers = register_and_login(client)
+    client.post("/webhooks/", json={"url": receiver.url("/pinned")}, headers=headers)
+    create_application(client, headers)
+    # pretend loopback is public so the checked path is taken
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", False)
+    monkeypatch.setattr(webhook_targets, "is_allowed", lambda address: True)
+
+    assert drain(dispatcher()) == 1
+    assert asyncio.run(outbox_rows()) == []
+    path, sent_headers, _ = receiver.received[0]
+    assert path == "/pinned" and sent_headers["Host"] == f"127.0.0.1:{receiver.server_port}"
+
+
+def test_endpoints_never_share_a_connection_pool(receiver, register_and_login):
+    # two host names on one address must not share pooled connections: the
+    # requests go to the address, so the pool can't tell them apart
+    client = TestClient(app)
+    headers = register_and_login(client)
+    for path in ("/a", "/b"):
+        client.post("/webhooks/", json={"url": receiver.url(path)}, headers=headers)
+    create_application(client, headers)
+
+    async def run():
+        d = dispatcher()
+        try:
+            deliveries, endpoints = await d.claim()
+            await d.deliver(deliveries, endpoints)
+            return {id(d._client(e)) for e in endpoints.values()}
+        finally:
+            await d.aclose()
+
+    assert len(asyncio.run(run())) == 2
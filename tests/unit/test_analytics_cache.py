@@ -0,0 +1,61 @@
+from datetime import date
+
+from app.api.analytics import MAX_ENTRIES_PER_USER, AnalyticsCache, period_start, periods
+
+
+def test_periods_cover_the_range_by_bucket():
+    # Wed 18 Mar 2026 back to Sat 28 Feb
+    assert period_start(date(2026, 3, 18), "week") == date(2026, 3, 16)
+    assert periods(date(2026, 2, 28), date(2026, 3, 18), "week") == [
+        date(2026, 2, 23),
+        date(2026, 3, 2),
+        date(2026, 3, 9),
+        date(2026, 3, 16),
+    ]
+    assert periods(date(2025, 11, 30), date(2026, 2, 1), "month") == [
+        date(2025, 11, 1),
+        date(2025, 12, 1),
+        date(2026, 1, 1),
+        date(2026, 2, 1),
+    ]
+    assert periods(date(2026, 3, 1), date(2026, 3, 3), "day") == [
+        date(2026, 3, 1),
+        date(2026, 3, 2),
+        date(2026, 3, 3),
+    ]
+
+
+def test_cache_entries_belong_to_one_version():
+    cache = AnalyticsCache(max_users=10)
+    cache.put(1, '"1-5"', "week", b"w5")
+    cache.put(1, '"1-5"', "month", b"m5")
+    assert cache.get(1, '"1-5"', "week") == b"w5"
+    assert cache.get(1, '"1-6"', "week") is None
+
+    # a newer version replaces everything cached for the user
+    cache.put(1, '"1-6"', "week", b"w6")
+    assert cache.get(1, '"1-6"', "week") == b"w6"
+    assert cache.get(1, '"1-6"', "month") is None
+    assert cache.get(1, '"1-5"', "month") is None
+
+
+def test_cache_bounds_users_and_queries():
+    cache = AnalyticsCache(max_users=2)
+    cache.put(1, "v", "q", b"1")
+    cache.put(2, "v", "q", b"2")
+    assert cache.get(1, "v", "q") == b"1"  # user 1 is now most recently used
+    cache.put(3, "v", "q", b"3")
+    assert cache.get(2, "v", "q") is None
+    assert len(cache) == 2
+
+    for n in range(MAX_ENTRIES_PER_USER + 1):
+        cache.put(1, "v", n, b"x")
+    assert cache.get(1, "v", 0) is None
+    assert cache.get(1, "v", MAX_ENTRIES_PER_USER) == b"x"
+
+
+def test_disabled_cache_stores_nothing():
+    cache = AnalyticsCache(max_users=0)
+    cache.put(1, "v", "q", b"1")
+    assert cache.get(1, "v", "q") is None
+    assert len(cache) == 0
@@ -0,0 +1,14 @@
+from app.core.config import Settings
+
+
+def test_async_database_url_sqlite():
+    s = Settings(DATABASE_URL="sqlite:///./db.sqlite3")
+    assert s.async_database_url == "sqlite+aiosqlite:///./db.sqlite3"
+
+
+def test_async_database_url_postgres():
+    s = Settings(DATABASE_URL="postgresql://u:p@db:5432/jobs")
+    assert s.async_database_url == "postgresql+psycopg://u:p@db:5432/jobs"
+    # psycopg 3 URLs are already usable by create_async_engine
+    s = Settings(DATABASE_URL="postgresql+psycopg://u:p@db:5432/jobs")
+    assert s.async_database_url == "postgresql+psycopg://u:p@db:5432/jobs"
@@ -0,0 +1,59 @@
+import threading
+
+from sqlalchemy import create_engine, text
+
+from app.db.instrumentation import (
+    POOL_WAIT,
+    DbStats,
+    TimedQueuePool,
+    db_stats_var,
+    instrument_engine,
+    pool_options,
+)
+
+
+def test_pool_options_keep_default_pool_for_memory_sqlite():
+    assert pool_options("sqlite:///:memory:", "primary", is_async=False) == {}
+    assert pool_options("sqlite+aiosqlite://", "primary", is_async=True) == {}
+    assert pool_options("sqlite:///./app.db", "primary", is_async=False)["poolclass"] is TimedQueuePool
+
+
+def test_statements_are_counted_for_the_current_request(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.sqlite3'}", poolclass=TimedQueuePool)
+    instrument_engine(engine, "stats_test")
+    stats = DbStats()
+    token = db_stats_var.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    finally:
+        db_stats_var.reset(token)
+    assert stats.statements == 2
+    assert stats.seconds > 0
+
+    # outside a request nothing is collected
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert stats.statements == 2
+    engine.dispose()
+
+
+def test_checkout_wait_is_observed(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'wait.sqlite3'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_logging_name="wait_test",
+    )
+    wait = POOL_WAIT.labels("wait_test")
+    held = engine.connect()
+    released = threading.Timer(0.2, held.close)
+    released.start()
+    with engine.connect():
+        pass
+    released.join()
+    # the second checkout blocked until the first connection was returned
+    assert wait._sum.get() >= 0.15
+    engine.dispose()
@@ -0,0 +1,130 @@
+import asyncio
+import io
+import json
+import logging
+import threading
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.logging import JsonFormatter, QueuedHandler, request_id_var
+from app.db.instrumentation import TimedAsyncAdaptedQueuePool, TimedQueuePool
+from app.db.pool import configure_engine, engine_options, prewarm
+
+
+def test_engine_options(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "idle")
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "DB_PREPARE_THRESHOLD", -1)
+
+    pg = engine_options("postgresql+psycopg://u:p@db/app", "primary", is_async=True)
+    assert pg["poolclass"] is TimedAsyncAdaptedQueuePool
+    assert pg["pool_size"] == 7
+    assert pg["pool_pre_ping"] is False
+    assert pg["connect_args"] == {"options": "-c statement_timeout=5000", "prepare_threshold": None}
+
+    sqlite = engine_options("sqlite:///./app.db", "primary_sync", is_async=False)
+    assert sqlite["poolclass"] is TimedQueuePool
+    assert "connect_args" not in sqlite
+
+    # in-memory SQLite keeps its single-connection pool, so no sizing
+    memory = engine_options("sqlite:///:memory:", "primary", is_async=False)
+    assert memory == {"pool_pre_ping": False}
+
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "always")
+    assert engine_options("sqlite:///./app.db", "primary", is_async=False)["pool_pre_ping"] is True
+
+
+def test_idle_connection_that_fails_ping_is_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "idle")
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_IDLE_SECONDS", 0.0)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'ping.sqlite3'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    configure_engine(engine)
+
+    with engine.connect() as conn:
+        dead = conn.connection.dbapi_connection
+    # the server went away while the connection sat in the pool
+    dead.close()
+
+    with engine.connect() as conn:
+        assert conn.connection.dbapi_connection is not dead
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    engine.dispose()
+
+
+def test_slow_checkout_is_logged_with_request_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_CHECKOUT_MS", 50)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'slow.sqlite3'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_logging_name="slow_test",
+    )
+    stream = io.StringIO()
+    handler = QueuedHandler(stream, max_queue=100, batch_size=10)
+    handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger("app.db.pool")
+    logger.addHandler(handler)
+
+    with engine.connect():
+        pass  # an uncontended checkout is not logged
+    held = engine.connect()
+    released = threading.Timer(0.2, held.close)
+    released.start()
+    token = request_id_var.set("rid-slow")
+    try:
+        with engine.connect():
+            pass
+    finally:
+        request_id_var.reset(token)
+        released.join()
+        logger.removeHandler(handler)
+    handler.flush()
+    handler.close()
+    engine.dispose()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["level"] == "WARNING"
+    assert lines[0]["request_id"] == "rid-slow"
+    assert "slow_test" in lines[0]["message"]
+    assert "Pool size: 1" in lines[0]["message"]
+
+
+def test_prewarm_fills_the_pool(tmp_path):
+    async def run():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'warm.sqlite3'}",
+            poolclass=TimedAsyncAdaptedQueuePool,
+            pool_size=3,
+        )
+        opened = await prewarm(engine, 3)
+        idle = engine.pool.checkedin()
+        await engine.dispose()
+        return opened, idle
+
+    assert asyncio.run(run()) == (3, 3)
+
+
+def test_prewarm_failure_is_logged_not_raised(tmp_path, caplog):
+    async def run():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'warm.sqlite3'}",
+            poolclass=TimedAsyncAdaptedQueuePool,
+            pool_size=2,
+        )
+        opened = await prewarm(engine, 2)
+        await engine.dispose()
+        return opened
+
+    with caplog.at_level(logging.WARNING, logger="app.db.pool"):
+        assert asyncio.run(run()) == 0
+    assert "opened 0 of 2" in caplog.text
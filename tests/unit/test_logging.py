@@ -1,6 +1,11 @@
-from fastapi.testclient import TestClient
+import io
 import json
+import logging
+import threading
+
+from fastapi.testclient import TestClient
 
+from app.core.logging import JsonFormatter, QueuedHandler, RateLimitFilter, request_id_var
 from app.main import app
 
 client = TestClient(app)
@@ -15,4 +20,106 @@ def test_request_id_header_and_json_log(caplog, capsys):
     rid = r.headers["X-Request-ID"]
 
     # we don't assert on the log contents here; header presence is enough
-    pass
\ No newline at end of file
+    pass
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_queued_handler_writes_json_with_caller_request_id():
+    stream = io.StringIO()
+    handler = QueuedHandler(stream, max_queue=100, batch_size=10)
+    handler.setFormatter(JsonFormatter())
+    logger = _logger("test.queued", handler)
+
+    token = request_id_var.set("rid-1")
+    try:
+        for i in range(25):
+            logger.info("line %d", i)
+    finally:
+        request_id_var.reset(token)
+    handler.flush()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == [f"line {i}" for i in range(25)]
+    # formatted on the writer thread, but the id is the caller's
+    assert {line["request_id"] for line in lines} == {"rid-1"}
+    handler.close()
+
+
+def test_queued_handler_renders_messages_and_tracebacks_at_the_call():
+    stream = BlockedStream()
+    handler = QueuedHandler(stream, max_queue=100, batch_size=10)
+    handler.setFormatter(JsonFormatter())
+    logger = _logger("test.snapshot", handler)
+
+    items = ["a"]
+    logger.info("items %s", items)
+    # changed before the writer gets to it
+    items.append("b")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    stream.release.set()
+    handler.flush()
+
+    first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert first["message"] == "items ['a']"
+    assert second["message"] == "failed"
+    assert "ValueError: boom" in second["exc_info"]
+    handler.close()
+
+
+class BlockedStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait()
+        return super().write(s)
+
+
+def test_queued_handler_drops_instead_of_blocking_when_full():
+    stream = BlockedStream()
+    handler = QueuedHandler(stream, max_queue=5, batch_size=1)
+    handler.setFormatter(JsonFormatter())
+    logger = _logger("test.dropping", handler)
+
+    try:
+        for i in range(50):
+            logger.info("line %d", i)
+    finally:
+        stream.release.set()
+    # the queue holds five records (plus at most one already taken by the
+    # writer); everything else was dropped without blocking
+    assert handler.dropped in (44, 45)
+    handler.flush()
+    assert len(stream.getvalue().splitlines()) == 50 - handler.dropped
+    handler.close()
+
+
+def test_rate_limit_filter_caps_chatty_logger_but_not_warnings():
+    stream = io.StringIO()
+    handler = QueuedHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(RateLimitFilter({"test.chatty": 2.0}))
+    chatty = _logger("test.chatty.child", handler)
+    other = _logger("test.quiet", handler)
+
+    for _ in range(100):
+        chatty.info("ping")
+        other.info("pong")
+    chatty.warning("still shown")
+    handler.flush()
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert messages.count("ping") <= 3
+    assert messages.count("pong") == 100
+    assert "still shown" in messages
+    handler.close()
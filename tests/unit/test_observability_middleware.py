@@ -0,0 +1,85 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.logging import request_id_var
+from app.middleware.observability import REQUEST_COUNT, ObservabilityMiddleware
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ObservabilityMiddleware)
+
+    @app.get("/rid")
+    async def rid():
+        return {"request_id": request_id_var.get()}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for i in range(3):
+                yield f"chunk{i}\n".encode()
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_request_id_is_propagated_or_generated():
+    client = TestClient(build_app())
+    r = client.get("/rid", headers={"X-Request-Id": "abc-123"})
+    assert r.headers["X-Request-Id"] == "abc-123"
+    assert r.json() == {"request_id": "abc-123"}
+
+    r = client.get("/rid")
+    assert r.headers["X-Request-Id"] == r.json()["request_id"]
+    assert len(r.json()["request_id"]) == 36
+    # the contextvar does not leak out of the request
+    assert request_id_var.get() is None
+
+
+def test_requests_are_counted_including_errors():
+    client = TestClient(build_app(), raise_server_exceptions=False)
+    before = REQUEST_COUNT.labels("GET", "/boom", 500)._value.get()
+    assert client.get("/boom").status_code == 500
+    assert REQUEST_COUNT.labels("GET", "/boom", 500)._value.get() == before + 1
+
+
+def test_streaming_body_is_passed_through_chunk_by_chunk():
+    app = build_app()
+    messages = []
+
+    async def run():
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/stream",
+            "raw_path": b"/stream",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "client": ("127.0.0.1", 1234),
+            "server": ("test", 80),
+        }
+
+        async def receive():
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+    start, *bodies = messages
+    assert (b"x-request-id", start["headers"][-1][1]) in start["headers"]
+    assert [m["body"] for m in bodies if m["body"]] == [b"chunk0\n", b"chunk1\n", b"chunk2\n"]
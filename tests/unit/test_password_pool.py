@@ -0,0 +1,32 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import security
+from app.core.password_pool import PasswordPool, PasswordPoolBusy
+
+
+def test_process_pool_hash_and_verify():
+    pool = PasswordPool(workers=1, max_pending=4)
+    try:
+        hashed = asyncio.run(pool.run("hash", security.hash_password, "s3cret-pass"))
+        assert asyncio.run(pool.run("verify", security.verify_password, "s3cret-pass", hashed))
+        assert not asyncio.run(pool.run("verify", security.verify_password, "wrong", hashed))
+    finally:
+        pool.shutdown()
+
+
+def test_rejects_when_queue_is_full():
+    pool = PasswordPool(workers=0, max_pending=1)
+
+    async def main():
+        slow = asyncio.create_task(pool.run("hash", time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordPoolBusy):
+            await pool.run("hash", time.sleep, 0)
+        await slow
+        # capacity is released once the slow job finishes
+        await pool.run("hash", time.sleep, 0)
+
+    asyncio.run(main())
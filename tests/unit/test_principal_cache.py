@@ -0,0 +1,45 @@
+import time
+
+from app.core.principal_cache import CACHE_EVICTIONS, Principal, PrincipalCache
+
+
+def test_hit_miss_and_lru_eviction():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    before = CACHE_EVICTIONS.labels("size")._value.get()
+    cache.put("t1", Principal(1, "a@x.com", True))
+    cache.put("t2", Principal(2, "b@x.com", True))
+    assert cache.get("t1").id == 1  # t1 is now most recently used
+    cache.put("t3", Principal(3, "c@x.com", True))
+
+    assert cache.get("t2") is None
+    assert cache.get("t1").id == 1
+    assert cache.get("t3").id == 3
+    assert len(cache) == 2
+    assert CACHE_EVICTIONS.labels("size")._value.get() == before + 1
+
+
+def test_entries_expire_with_ttl_or_token():
+    cache = PrincipalCache(max_size=10, ttl_seconds=0.05)
+    cache.put("t1", Principal(1, "a@x.com", True))
+    # a token that expires before the TTL caps the entry lifetime
+    cache.put("t2", Principal(2, "b@x.com", True), token_exp=time.time() - 1)
+    assert cache.get("t1") is not None
+    assert cache.get("t2") is None
+    time.sleep(0.06)
+    assert cache.get("t1") is None
+
+
+def test_invalidate_user_drops_all_tokens():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("t1", Principal(1, "a@x.com", True))
+    cache.put("t1b", Principal(1, "a@x.com", True))
+    cache.put("t2", Principal(2, "b@x.com", True))
+    assert cache.invalidate_user(1) == 2
+    assert cache.get("t1") is None and cache.get("t1b") is None
+    assert cache.get("t2") is not None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = PrincipalCache(max_size=0, ttl_seconds=60)
+    cache.put("t1", Principal(1, "a@x.com", True))
+    assert cache.get("t1") is None
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+from app.core.rate_limit import MemoryRateLimiter, SqliteRateLimiter
+
+
+def test_limit_within_one_window():
+    limiter = MemoryRateLimiter(limit=3, window_seconds=60)
+    t = 6000.0
+    assert [limiter.hit("a", t + i) for i in range(5)] == [True, True, True, False, False]
+    # other keys are independent
+    assert limiter.hit("b", t)
+
+
+def test_sliding_window_weights_previous_window():
+    limiter = MemoryRateLimiter(limit=4, window_seconds=60)
+    start = 6000.0  # window boundary
+    for i in range(4):
+        assert limiter.hit("a", start + 50 + i)
+    # just after the boundary almost the whole previous window still counts
+    assert not limiter.hit("a", start + 61)
+    # halfway through the next window half of it (2 hits) still counts
+    assert limiter.hit("a", start + 90)
+    assert limiter.hit("a", start + 91)
+    assert not limiter.hit("a", start + 92)
+    # two windows later everything has expired
+    assert limiter.hit("a", start + 180)
+
+
+def test_idle_keys_are_evicted_and_size_is_capped():
+    limiter = MemoryRateLimiter(limit=5, window_seconds=60, max_keys=3)
+    for i in range(3):
+        limiter.hit(f"k{i}", 6000.0)
+    assert len(limiter) == 3
+    # with every key still live, a new key goes to the overflow counter
+    # instead of evicting one
+    assert limiter.hit("k3", 6001.0)
+    assert len(limiter) == 3
+    assert limiter.hit("k0", 6002.0)
+    # two windows later the old keys are idle and dropped on the next hit
+    limiter.hit("fresh", 6000.0 + 180)
+    assert len(limiter) == 1
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "throttle.sqlite3")
+    # separate instances stand in for separate worker processes
+    a = SqliteRateLimiter(limit=4, window_seconds=60, path=path)
+    b = SqliteRateLimiter(limit=4, window_seconds=60, path=path)
+    t = 6000.0
+    results = [(a if i % 2 else b).hit("user@x.com", t + i) for i in range(6)]
+    assert results == [True, True, True, True, False, False]
+    assert len(a) == 1
+    a.reset()
+    assert b.hit("user@x.com", t + 7)
+
+
+def test_flooding_new_keys_cannot_reset_a_live_counter_or_lock_out_others():
+    limiter = MemoryRateLimiter(limit=2, window_seconds=60, max_keys=10)
+    t = 6000.0
+    assert limiter.hit("victim", t) and limiter.hit("victim", t)
+    flood = [limiter.hit(f"junk{i}", t + 1) for i in range(100)]
+    assert not limiter.hit("victim", t + 2)
+    # the overflow counter still lets new usernames in, within its own limit
+    assert all(flood)
+    assert limiter.hit("newcomer", t + 3)
+    for i in range(200):
+        limiter.hit(f"more{i}", t + 4)
+    assert not limiter.hit("late", t + 5)
+
+
+def test_sqlite_hits_run_off_the_event_loop(tmp_path, monkeypatch):
+    limiter = SqliteRateLimiter(limit=2, window_seconds=60, path=str(tmp_path / "throttle.sqlite3"))
+    hit, threads = limiter.hit, []
+
+    def recording_hit(key, now=None):
+        threads.append(threading.get_ident())
+        return hit(key, now)
+
+    monkeypatch.setattr(limiter, "hit", recording_hit)
+
+    async def run():
+        return threading.get_ident(), [await limiter.hit_async("user@x.com", 6000.0 + i) for i in range(3)]
+
+    loop_thread, results = asyncio.run(run())
+    assert results == [True, True, False]
+    assert len(threads) == 3 and loop_thread not in threads
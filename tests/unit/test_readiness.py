@@ -0,0 +1,113 @@
+import asyncio
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.readiness import ReadinessMonitor, pool_usage, readiness
+from app.db import session as db_session
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_status():
+    readiness.reset()
+    yield
+    readiness.reset()
+
+
+def count_statements() -> list:
+    statements = []
+    event.listen(
+        db_session.async_engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_livez_does_no_io(monkeypatch, tmp_path):
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.sqlite3'}")
+    monkeypatch.setattr(db_session, "async_engine", broken)
+    r = client.get("/livez")
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok"}
+
+
+def test_readyz_serves_cached_status():
+    statements = count_statements()
+    r = client.get("/readyz")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "ready"
+    assert body["database"]["ok"] is True
+    assert body["database"]["error"] is None
+    assert "primary" in body["pools"]
+    assert len(statements) == 1
+
+    for _ in range(5):
+        assert client.get("/readyz").status_code == 200
+    # within the interval the probes hit the cache
+    assert len(statements) == 1
+
+
+def test_readyz_reports_outage_and_logs_only_changes(monkeypatch, tmp_path, caplog):
+    working = db_session.async_engine
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.sqlite3'}")
+    monkeypatch.setattr(readiness, "interval", 0.0)
+    caplog.set_level(logging.INFO, logger="app.readiness")
+
+    assert client.get("/readyz").status_code == 200
+    monkeypatch.setattr(db_session, "async_engine", broken)
+    for _ in range(3):
+        r = client.get("/readyz")
+        assert r.status_code == 503
+        assert r.json()["status"] == "unavailable"
+        assert "OperationalError" in r.json()["database"]["error"]
+    monkeypatch.setattr(db_session, "async_engine", working)
+    assert client.get("/readyz").status_code == 200
+
+    logged = [rec for rec in caplog.records if rec.name == "app.readiness"]
+    assert [(rec.levelname, rec.getMessage()[:20]) for rec in logged] == [
+        ("INFO", "database reachable ("),
+        ("WARNING", "database unavailable"),
+        ("INFO", "database reachable ("),
+    ]
+    asyncio.run(broken.dispose())
+
+
+def test_background_task_refreshes_status():
+    async def run() -> tuple[float, float]:
+        monitor = ReadinessMonitor(interval=0.05, timeout=1.0)
+        await monitor.start()
+        first = monitor.status.checked_at
+        await asyncio.sleep(0.3)
+        # served from the cache that the task keeps fresh
+        latest = (await monitor.current()).checked_at
+        await monitor.stop()
+        return first, latest
+
+    first, latest = asyncio.run(run())
+    assert latest > first
+
+
+def test_pool_usage_reports_saturation(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.sqlite3'}",
+        pool_size=1,
+        max_overflow=1,
+    )
+
+    async def run() -> dict:
+        async with engine.connect():
+            usage = pool_usage(engine)
+        await engine.dispose()
+        return usage
+
+    assert asyncio.run(run()) == {"size": 1, "max_overflow": 1, "checked_out": 1, "saturation": 0.5}
+    # the tests' single-connection pool has no capacity to report
+    assert pool_usage(db_session.async_engine) is None
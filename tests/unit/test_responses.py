@@ -0,0 +1,54 @@
+from datetime import date, datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+
+from app.api.responses import JSONBytesResponse, RowSerializer
+from app.db.base import Base
+from app.models.application import Application
+from app.models.company import Company
+from app.models.followup import FollowUp
+from app.models.user import User
+from app.schemas.application import ApplicationOut
+from app.schemas.company import CompanyOut
+from app.schemas.followup import FollowUpOut
+
+
+def test_row_serializer_matches_response_model_output():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User).values(id=1, email="rows@example.com", hashed_password="x", is_active=True))
+        conn.execute(
+            insert(Company),
+            [
+                {"id": 1, "name": "Acme", "owner_id": 1},
+                {"id": 2, "name": "Blip", "website": "https://blip.io/", "owner_id": 1},
+            ],
+        )
+        conn.execute(
+            insert(Application),
+            [
+                {"position": "Dev", "status": "offer", "applied_at": date(2024, 5, 1), "company_id": 1, "owner_id": 1},
+                {"position": "Ops", "status": "applied", "applied_at": None, "company_id": 2, "owner_id": 1},
+            ],
+        )
+        conn.execute(
+            insert(FollowUp),
+            [{"application_id": 1, "owner_id": 1, "note": 'say "hi" ✓', "created_at": datetime(2024, 5, 2, 9, 30)}],
+        )
+
+        for model, entity in ((ApplicationOut, Application), (CompanyOut, Company), (FollowUpOut, FollowUp)):
+            serializer = RowSerializer(model)
+            rows = conn.execute(select(*serializer.columns(entity)).order_by(entity.id)).all()
+            # the full rows validated through the schema, as response_model does
+            full = conn.execute(select(entity.__table__).order_by(entity.id)).mappings().all()
+            adapter = TypeAdapter(list[model])
+            expected = adapter.dump_json(adapter.validate_python([dict(row) for row in full]))
+            assert serializer.dump_json(rows) == expected
+    engine.dispose()
+
+
+def test_json_bytes_response_passes_bytes_through():
+    assert JSONBytesResponse(b'[{"id":1}]').body == b'[{"id":1}]'
+    assert JSONBytesResponse({"status": "ok"}).body == b'{"status":"ok"}'
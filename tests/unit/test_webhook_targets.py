@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.webhook_targets import ForbiddenTarget, is_allowed, pinned, resolve
+
+
+@pytest.mark.parametrize(
+    "address",
+    ["127.0.0.1", "10.0.0.1", "172.16.5.4", "192.168.1.1", "169.254.169.254", "100.64.0.1", "0.0.0.0",
+     "224.0.0.1", "::1", "fe80::1", "fd00::1", "::ffff:127.0.0.1", "::ffff:169.254.169.254"],
+)
+def test_non_public_addresses_are_refused(address):
+    assert not is_allowed(address)
+
+
+@pytest.mark.parametrize("address", ["93.184.216.34", "8.8.8.8", "2606:4700::1111", "::ffff:8.8.8.8"])
+def test_public_addresses_are_allowed(address):
+    assert is_allowed(address)
+
+
+def test_resolve_checks_every_address(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", False)
+    assert asyncio.run(resolve("https://8.8.8.8/hook")) == "8.8.8.8"
+    with pytest.raises(ForbiddenTarget):
+        asyncio.run(resolve("http://127.0.0.1:8000/hook"))
+    with pytest.raises(ForbiddenTarget):
+        asyncio.run(resolve("http://host.invalid/hook"))
+
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", True)
+    assert asyncio.run(resolve("http://127.0.0.1:8000/hook")) is None
+
+
+def test_pinned_keeps_the_host_name():
+    url, headers, extensions = pinned("https://hooks.example.com:8443/in?x=1", "93.184.216.34")
+    assert url == "https://93.184.216.34:8443/in?x=1"
+    assert headers == {"Host": "hooks.example.com:8443"}
+    assert extensions == {"sni_hostname": "hooks.example.com"}
+
+    url, headers, extensions = pinned("http://hooks.example.com/in", "2606:4700::1111")
+    assert url == "http://[2606:4700::1111]/in"
+    assert headers == {"Host": "hooks.example.com"} and extensions == {}
+
+    assert pinned("http://localhost/in", None) == ("http://localhost/in", {}, {})